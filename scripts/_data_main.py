@@ -1,21 +1,26 @@
+import sys
 import subprocess
 
+# 하위 스크립트 출력은 그대로 흘려보냄 (단계별 진행상황 / 계측 결과 확인용)
 def run_script(script_name):
-    print(f"===> 실행 중: {script_name}")
-    result = subprocess.run(["python", script_name], capture_output=True, text=True)
+    print(f"===> 실행 중: {script_name}", flush=True)
+    result = subprocess.run([sys.executable, script_name])
 
     if result.returncode == 0:
         print(f"====> 완료: {script_name}")
     else:
-        print(f"⚠️ 오류 발생: {script_name}")
-        print(result.stderr)
+        print(f"⚠️ 오류 발생: {script_name} (종료 코드 {result.returncode})")
+    return result.returncode
 
 if __name__ == "__main__":
     script_paths = [
         # "scripts/fetch_source_data.py",
         # "scripts/fetch_taas_accident_data.py",
-        "scripts/prepare_datasets.py"
+        "scripts/run_pipeline.py"
     ]
 
+    # 앞 단계가 실패하면 이후 단계는 실행하지 않고 같은 종료 코드로 종료
     for script in script_paths:
-        run_script(script)
+        code = run_script(script)
+        if code != 0:
+            sys.exit(code)
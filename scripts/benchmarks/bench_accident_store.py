@@ -0,0 +1,78 @@
+# 사고 데이터 메모리/질의 벤치마크: pandas 그대로 읽기 vs 압축 저장소(ACCIDENT_STORE)
+# - 메모리: pandas deep memory_usage vs 저장소 배열 크기
+# - 질의: 고령 운전자(65세 이상) 사고의 시군구 × 차종별 건수 / 횡단보도 인접 비율, 결과가 pandas groupby와 같은지 확인
+# 실행: python scripts/benchmarks/bench_accident_store.py --path ./data/processed/accident_data_all
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import utils.ACCIDENT_STORE as AS
+import utils.STORAGE as ST
+
+GROUP_COLUMNS = ["sigungu", "wrngdo_vhcle_asort_dc"]
+VALUE_COLUMNS = ["near_crosswalk", "traffic_volume"]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+# 숫자는 float32 오차 범위, 문자열은 값 그대로 비교
+def same_values(original, decoded):
+    if pd.api.types.is_numeric_dtype(original):
+        return np.allclose(original.to_numpy(dtype="float64", na_value=np.nan),
+                           decoded.to_numpy(dtype="float64", na_value=np.nan), rtol=1e-6, equal_nan=True)
+    return original.astype(object).equals(decoded.astype(object))
+
+
+def pandas_query(df, by, values):
+    elderly = df[df["acdnt_age_1_code"] >= 65]
+    grouped = elderly.groupby(by, observed=True)
+    result = grouped[values].mean()
+    result.insert(0, "count", grouped.size())
+    return result.reset_index().sort_values(by).reset_index(drop=True)
+
+
+def store_query(store, by, values):
+    return store.groupby(by, values, rows=store.between("acdnt_age_1_code", 65))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="./data/processed/accident_data_all")
+    args = parser.parse_args()
+
+    df, pandas_s = timed(ST.read_table, args.path)
+    store, store_s = timed(AS.AccidentStore.load, args.path)
+    pandas_mb = df.memory_usage(deep=True).sum() / 1e6
+    store_mb = store.nbytes / 1e6
+    print(f"==> {args.path}: {len(df):,}행 × {df.shape[1]}열")
+    print(f"    pandas   | 읽기 {pandas_s:.2f}s | 메모리 {pandas_mb:,.1f} MB")
+    print(f"    저장소    | 읽기 {store_s:.2f}s | 메모리 {store_mb:,.1f} MB ({store_mb / pandas_mb:.0%})")
+
+    by = [c for c in GROUP_COLUMNS if c in df]
+    values = [c for c in VALUE_COLUMNS if c in df]
+    expected, pandas_q = timed(pandas_query, df, by, values)
+    result, store_q = timed(store_query, store, by, values)
+    print(f"    질의 (고령 사고 {'×'.join(by)}별 건수/평균) | pandas {pandas_q * 1000:.1f} ms | 저장소 {store_q * 1000:.1f} ms")
+
+    same = (
+        len(expected) == len(result)
+        and (expected[by].astype(object).to_numpy() == result[by].to_numpy()).all()
+        and np.array_equal(expected["count"].to_numpy(), result["count"].to_numpy())
+        and np.allclose(expected[values].to_numpy(dtype="float64"), result[values].to_numpy(), rtol=1e-6, equal_nan=True)
+    )
+    print("✅ 질의 결과 동일" if same else "❌ 질의 결과가 pandas와 다릅니다.")
+
+    decoded = store.to_frame()
+    mismatched = [c for c in df.columns if not same_values(df[c], decoded[c])]
+    print("✅ 복원한 값 동일 (float32 오차 범위)" if not mismatched else f"❌ 복원 값이 다른 컬럼: {mismatched}")
+    if not same or mismatched:
+        sys.exit(1)
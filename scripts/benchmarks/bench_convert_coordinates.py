@@ -0,0 +1,58 @@
+# 좌표 변환 벤치마크: 기존 행 단위(apply) 방식 vs 배열 일괄 변환
+# 실행: python scripts/benchmarks/bench_convert_coordinates.py [행 수 ...]
+import sys
+import os
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+
+import utils.GEO_UTILS as GU
+
+
+# 기존 구현 (행 단위 apply + try/except) - 비교 기준
+def convert_coordinates_per_row(df, x_col, y_col, lat_col, lng_col, epsg_from=5186, epsg_to=4326):
+    transformer = Transformer.from_crs(f"epsg:{epsg_from}", f"epsg:{epsg_to}", always_xy=True)
+    def transform_row(row):
+        try:
+            lng, lat = transformer.transform(row[x_col], row[y_col])
+            return pd.Series({lat_col: lat, lng_col: lng})
+        except:
+            return pd.Series({lat_col: None, lng_col: None})
+    return df.apply(transform_row, axis=1)
+
+
+# 서울 범위의 EPSG:5186 좌표 생성 (일부는 결측)
+def make_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "X좌표": rng.uniform(180_000, 220_000, n),
+        "Y좌표": rng.uniform(540_000, 570_000, n),
+    })
+    df.loc[rng.random(n) < 0.01, "X좌표"] = np.nan
+    return df
+
+
+def bench(func, df):
+    start = time.perf_counter()
+    result = func(df, "X좌표", "Y좌표", "위도", "경도")
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(n) for n in sys.argv[1:]] or [10_000, 100_000]
+
+    for n in sizes:
+        df = make_points(n)
+        fast, t_fast = bench(GU.convert_coordinates, df)
+        print(f"==> {n:>10,}행 | 일괄 변환: {n / t_fast:>14,.0f} rows/s ({t_fast:.3f}s)")
+
+        # 행 단위 방식은 너무 느리므로 최대 10만 행까지만 측정
+        if n <= 100_000:
+            slow, t_slow = bench(convert_coordinates_per_row, df)
+            slow = slow.astype(float)
+            same = np.allclose(fast.values, slow.values, equal_nan=True)
+            print(f"    {'':>10}    | 행 단위 변환: {n / t_slow:>12,.0f} rows/s ({t_slow:.3f}s) "
+                  f"| x{t_slow / t_fast:.1f} | 결과 일치: {same}")
@@ -0,0 +1,80 @@
+# 특성 행렬 생성 벤치마크: pandas 방식(get_dummies + fillna) vs FEATURES.build_features
+# - 행 수를 늘려가며 생성 시간 / 초당 행 수 비교 (선형 증가 확인), dense / sparse 모두
+# - 가장 작은 배율에서 pandas 결과와 값이 같은지 확인
+# - 파일 캐시: 첫 로드(생성 + 저장) vs 두 번째 로드(캐시) 시간
+# 실행: python scripts/benchmarks/bench_features.py [--rows 10000 100000 1000000]
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import utils.ACCIDENT_STORE as AS
+import utils.FEATURES as FT
+import utils.STORAGE as ST
+import synthetic_data as SD
+
+
+# 노트북에서 하던 방식: 컬럼마다 pandas 연산
+def pandas_features(df, spec=FT.FEATURE_SPEC):
+    out = pd.DataFrame(index=df.index)
+    for col in spec["numeric"] + spec["impute"]:
+        values = df[col].astype("float64")
+        out[col] = values.fillna(values.median())
+        if col in spec["impute"]:
+            out[f"{col}_missing"] = values.isna().astype(float)
+    for col in spec["flags"]:
+        out[col] = (df[col] == 1).astype(float)
+    for col in spec["ordinal"]:
+        categories = sorted(df[col].dropna().unique())
+        out[col] = pd.Categorical(df[col], categories=categories).codes + 1
+    dummies = pd.get_dummies(df[spec["onehot"]].astype(object), prefix_sep="=", dtype=float)
+    return pd.concat([out, dummies.sort_index(axis=1, key=lambda c: c.str.split("=").str[0].map(spec["onehot"].index))],
+                     axis=1).astype("float32")
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print("==> 특성 행렬 생성 (저장소 인코딩 시간 제외 / 포함)")
+    for i, n in enumerate(args.rows):
+        df = SD.make_enriched_accidents(n)
+        store, encode_s = timed(AS.AccidentStore.from_frame, df)
+        dense, dense_s = timed(FT.build_features, store)
+        sparse, sparse_s = timed(FT.build_features, store, sparse=True)
+        expected, pandas_s = timed(pandas_features, df)
+        print(f"    {n:>10,}행 × {dense.shape[1]}열 | pandas {pandas_s:.3f}s | dense {dense_s:.3f}s "
+              f"({n / dense_s:,.0f}행/s) | sparse {sparse_s:.3f}s | +인코딩 {encode_s:.3f}s")
+
+        if i == 0:
+            same_names = list(expected.columns) == dense.names
+            same_values = np.allclose(expected.to_numpy(), dense.X) and np.allclose(dense.X, sparse.X.toarray())
+            if not (same_names and same_values):
+                print("❌ pandas 결과와 다릅니다.")
+                sys.exit(1)
+            print("✅ pandas 결과와 동일 (컬럼 이름 / 값, dense = sparse)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = ST.write_table(SD.make_enriched_accidents(args.rows[-1]), os.path.join(tmp, "accident_data_filtered"))
+        cache_dir = os.path.join(tmp, "features")
+        first, first_s = timed(FT.load_feature_matrix, path, cache_dir=cache_dir)
+        cached, cached_s = timed(FT.load_feature_matrix, path, cache_dir=cache_dir)
+        same = np.array_equal(np.asarray(first.X), np.asarray(cached.X))
+        print(f"==> 파일 로드 {args.rows[-1]:,}행 | 생성 + 저장 {first_s:.2f}s | 캐시 {cached_s * 1000:.1f} ms "
+              f"{'✅' if same else '❌'}")
+
+        cells = FT.grid_cells(cached.lat, cached.lng)
+        (groups, means, counts), agg_s = timed(FT.aggregate, cached, cells)
+        print(f"==> 격자({FT.GRID_M}m) 집계: {len(groups):,}칸, {agg_s:.3f}s")
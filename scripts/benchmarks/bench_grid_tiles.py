@@ -0,0 +1,99 @@
+# 격자 칸 집계 / 화면 범위 조회 벤치마크
+# - 집계 생성 시간 (해상도 전체), 해상도별 칸 수
+# - 해상도별 칸 건수 합계 = 좌표가 있는 사고 수, 고령 + 비고령 = 나이가 있는 사고 수 확인
+# - 화면 범위 조회: 사고 행 전체를 pandas로 범위 필터 + groupby vs GridTiles.query (줌 레벨별)
+#   조회 결과가 pandas로 직접 집계한 칸과 같은지 확인
+# 실행: python scripts/benchmarks/bench_grid_tiles.py [--rows 1000000] [--repeat 50]
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import utils.ACCIDENT_STORE as AS
+import utils.GEO_UTILS as GU
+import utils.GRID_TILES as GT
+import utils.STORAGE as ST
+import synthetic_data as SD
+
+# 광화문 중심 화면 (줌 → 대략 보이는 범위)
+CENTER = (37.5717, 126.9768)
+ZOOMS = [11, 13, 15, 17]
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def viewport(zoom, width_px=1280, height_px=800):
+    m_per_px = GT.WEB_MERCATOR_M_PER_PX * np.cos(np.radians(CENTER[0])) / 2 ** zoom
+    half_lat = height_px / 2 * m_per_px / 111_320
+    half_lng = width_px / 2 * m_per_px / (111_320 * np.cos(np.radians(CENTER[0])))
+    return CENTER[0] - half_lat, CENTER[1] - half_lng, CENTER[0] + half_lat, CENTER[1] + half_lng
+
+
+# 대시보드에서 하던 방식: 사고 행 전체를 범위 필터 후 칸별 건수
+def pandas_viewport(df, x, y, bbox, cell_m):
+    min_lat, min_lng, max_lat, max_lng = bbox
+    inside = df["lat"].between(min_lat, max_lat) & df["lng"].between(min_lng, max_lng)
+    cells = pd.DataFrame({"cell_x": np.floor(x[inside] / cell_m).astype("int64"),
+                          "cell_y": np.floor(y[inside] / cell_m).astype("int64")})
+    return cells.groupby(["cell_x", "cell_y"]).size()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    df = SD.make_enriched_accidents(args.rows)
+    store = AS.AccidentStore.from_frame(df)
+    tables, build_s = timed(GT.aggregate_cells, store)
+    print(f"==> 격자 집계 {args.rows:,}행 | {build_s:.2f}s ({args.rows / build_s:,.0f}행/s)")
+    print("    " + " | ".join(f"{size}m {len(table):,}칸" for size, table in tables.items()))
+
+    located = int((store.valid("lat") & store.valid("lng")).sum())
+    aged = store.valid("acdnt_age_1_code") & store.valid("lat") & store.valid("lng")
+    totals_ok = all(
+        table["count"].sum() == located and (table["elderly"] + table["non_elderly"]).sum() == aged.sum()
+        for table in tables.values()
+    )
+    print("✅ 해상도별 건수 합계 일치" if totals_ok else "❌ 해상도별 건수 합계가 다릅니다.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size, table in tables.items():
+            ST.write_table(table, GT.grid_path(size, tmp))
+        grid, load_s = timed(GT.GridTiles.load, tmp)
+    print(f"==> 집계 파일 로드 {load_s * 1000:.1f} ms")
+
+    # 칸 배정은 집계와 같은 float32 좌표 기준
+    lat = store.arrays["lat"].astype("float64")
+    lng = store.arrays["lng"].astype("float64")
+    x, y = GU.project_xy(lat, lng, epsg_to=GT.GRID_EPSG)
+    df["lat"], df["lng"] = lat, lng
+
+    same = totals_ok
+    for zoom in ZOOMS:
+        bbox = viewport(zoom)
+        cell_m = grid.size_for_zoom(zoom, CENTER[0])
+        expected, pandas_s = timed(pandas_viewport, df, x, y, bbox, cell_m)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            cells = grid.query(*bbox, zoom=zoom)
+        query_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+        # 조회 결과는 범위에 걸친 칸 전체 → pandas 결과(범위 안의 사고가 있는 칸)를 모두 포함하고 건수가 같아야 함
+        found = cells.set_index(["cell_x", "cell_y"])["count"]
+        ok = expected.index.isin(found.index).all() and (found.reindex(expected.index) >= expected).all()
+        same &= bool(ok)
+        print(f"    줌 {zoom:>2} ({cell_m}m) | {len(cells):>6,}칸 | pandas {pandas_s * 1000:8.1f} ms | "
+              f"격자 조회 {query_ms:6.2f} ms {'✅' if ok else '❌'}")
+    if not same:
+        sys.exit(1)
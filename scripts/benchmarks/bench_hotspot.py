@@ -0,0 +1,66 @@
+# hotspot 군집화 벤치마크: 기존 방식(대상별 haversine DBSCAN + merge) vs 공유 이웃 그래프 방식
+# 실행: python scripts/benchmarks/bench_hotspot.py [--base-rows 20000] [--scales 1 10 100]
+# 배율을 키울 때는 면적도 같이 넓혀 서울과 비슷한 밀도를 유지 (전국 단위 확장 가정)
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+import utils.GEO_UTILS as GU
+import synthetic_data as SD
+
+
+# 기존 구현: 대상별로 haversine DBSCAN 후 acdnt_no로 merge
+def hotspot_legacy(df_all, id_col="acdnt_no"):
+    for prefix, cohort in GU.HOTSPOT_COHORTS.items():
+        mask = pd.Series(True, index=df_all.index)
+        if cohort["min_age"] is not None:
+            mask &= df_all["acdnt_age_1_code"] >= cohort["min_age"]
+        if cohort["max_age"] is not None:
+            mask &= df_all["acdnt_age_1_code"] < cohort["max_age"]
+        result = GU.cluster_and_mark(df_all[mask].copy(), eps_m=cohort["eps_m"], min_samples=cohort["min_samples"])
+        result = result[[id_col, "is_hotspot", "hotspot_center_lat", "hotspot_center_lng"]]
+        result.columns = [id_col] + GU.hotspot_columns(prefix)
+        df_all = df_all.merge(result, on=id_col, how="left")
+    return df_all
+
+
+def hotspot_graph(df_all):
+    columns = GU.compute_hotspot_columns(df_all)
+    return pd.concat([df_all, pd.DataFrame(columns, index=df_all.index)], axis=1)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-rows", type=int, default=20_000)
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--legacy-max-rows", type=int, default=500_000,
+                        help="이 행 수를 넘으면 기존 방식은 측정하지 않음")
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        # 기존 방식(haversine DBSCAN)은 좌표 결측을 처리하지 못하므로 좌표가 있는 사고만 사용
+        df = SD.make_accidents(args.base_rows * scale, seed=0, scale=scale)
+        df = df[df["lat"].notna()].reset_index(drop=True)
+        n = len(df)
+        fast, t_fast = timed(hotspot_graph, df)
+        print(f"==> x{scale:<4} {n:>10,}행 | 공유 그래프: {t_fast:8.2f}s ({n / t_fast:,.0f} rows/s)")
+
+        if n <= args.legacy_max_rows:
+            slow, t_slow = timed(hotspot_legacy, df)
+            agree = {
+                prefix: np.mean(np.isclose(fast[f"{prefix}_hotspot"], slow[f"{prefix}_hotspot"], equal_nan=True))
+                for prefix in GU.HOTSPOT_COHORTS
+            }
+            agree_text = ", ".join(f"{k} {v:.4%}" for k, v in agree.items())
+            print(f"    {'':>16} | 기존 방식:   {t_slow:8.2f}s | x{t_slow / t_fast:.1f} | hotspot 일치율: {agree_text}")
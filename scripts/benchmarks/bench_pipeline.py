@@ -0,0 +1,204 @@
+# GEO_UTILS / prepare_datasets 주요 경로 벤치마크 (synthetic_data의 합성 데이터)
+# - 행 수별로 합성 사고 / 기준 레이어 / 도로망을 만들어 임시 작업 디렉토리에 저장한 뒤 단계별로 측정
+#   convert_coordinates / mark_zone_proximity_common / process_traffic_volume_combined / compute_hotspot_columns
+#   / load_reference_layers / run_all_processing_steps / assign_hotspot_columns
+#   (뒤의 세 단계는 작업 디렉토리에서 실제 파일 입출력 포함)
+# - 측정값: 소요시간 / CPU 시간 / 최대 메모리 / 단계 중 늘어난 메모리 (PROFILING.measure), 초당 행 수
+#   + 결과 요약값(digest: 결과 컬럼 값의 해시, 실수는 소수 6자리 반올림)
+# - 결과는 --output CSV에 누적 (실행 id / git commit 포함)
+# - --baseline: 이전 결과 파일에서 같은 (단계, 행 수, seed, 레이어 배율)의 마지막 기록과 비교
+#   digest가 다르면(결과가 바뀌었으면) 종료 코드 1
+# 실행: python scripts/benchmarks/bench_pipeline.py --rows 10000 100000 1000000
+#       python scripts/benchmarks/bench_pipeline.py --rows 100000 --baseline ./data/reports/benchmarks/bench_pipeline.csv
+# 메모리: 1백만 행 기준 run_all_processing_steps / compute_hotspot_columns 각각 최대 약 3GB (1천만 행은 그 10배 이상 필요)
+import io
+import os
+import sys
+import time
+import hashlib
+import argparse
+import tempfile
+import contextlib
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import prepare_datasets as PD
+import utils.GEO_UTILS as GU
+import utils.PROFILING as PF
+import utils.STORAGE as ST
+import synthetic_data as SD
+
+OUTPUT_PATH = "./data/reports/benchmarks/bench_pipeline.csv"
+KEY_COLUMNS = ["case", "rows", "seed", "layer_scale"]
+FLOAT_DECIMALS = 6
+
+
+# 결과 값 해시 (컬럼 이름 / 행 순서 / 값, 실수는 반올림해 미세한 연산 순서 차이는 무시)
+def digest(df):
+    df = df.reset_index(drop=True)
+    floats = df.select_dtypes("floating").columns
+    df[floats] = df[floats].round(FLOAT_DECIMALS)
+    h = hashlib.sha1(",".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+class Suite:
+    def __init__(self, args):
+        self.args = args
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.commit = PF.git_commit()
+        self.results = []
+
+    # 단계 1개 측정: frame(fn 결과)의 digest 기록 (frame은 측정 시간에서 제외)
+    def run(self, case, n, fn, *args, frame=None, **kwargs):
+        quiet = io.StringIO() if not self.args.verbose else None
+        rss_before = PF.rss_mb()
+        with contextlib.redirect_stdout(quiet) if quiet else contextlib.nullcontext():
+            with PF.measure(case, rows=n) as record:
+                output = fn(*args, **kwargs)
+        PF.drain()
+
+        result = output if frame is None else frame(output)
+        row = {
+            "run_id": self.run_id, "git_commit": self.commit, "case": case, "rows": n,
+            "seed": self.args.seed, "layer_scale": self.args.layer_scale,
+            "wall_s": record["wall_s"], "cpu_s": record["cpu_s"], "peak_rss_mb": record["peak_rss_mb"],
+            "added_mb": record["peak_rss_mb"] - rss_before, "rows_per_s": n / record["wall_s"],
+            "digest": digest(result),
+        }
+        self.results.append(row)
+        print(f"    {case:<42} {row['wall_s']:8.3f}s | {row['rows_per_s']:>12,.0f}행/s | "
+              f"최대 {row['peak_rss_mb']:7.1f} MB (+{row['added_mb']:.1f}) | {row['digest']}")
+        return output
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        pd.DataFrame(self.results).to_csv(path, mode="a", header=not os.path.exists(path), index=False,
+                                          encoding="utf-8-sig")
+
+
+def spots_from_frame(traffic_df):
+    years, volume = PD.build_traffic_volume_matrix(traffic_df)
+    return {"index": GU.ProximityIndex.from_df(traffic_df, "lat", "lng"), "years": years, "volume": volume}
+
+
+# 행 수 n 한 배율의 전체 단계
+def bench_scale(suite, n, workspace):
+    args = suite.args
+    start = time.perf_counter()
+    accidents, layers = SD.write_workspace(workspace, n, [args.year], args.layer_scale, args.seed)
+    accident_df = accidents[args.year]
+    print(f"==> {n:,}행 (합성 데이터 생성 + 저장 {time.perf_counter() - start:.2f}s)")
+
+    # 1. 좌표 변환 (EPSG:5186 → 위경도)
+    x, y = GU.get_transformer(4326, 5186).transform(accident_df["lng"].to_numpy(), accident_df["lat"].to_numpy())
+    points = pd.DataFrame({"x_crdnt": x, "y_crdnt": y})
+    suite.run("convert_coordinates", n, GU.convert_coordinates, points, "x_crdnt", "y_crdnt", "lat", "lng")
+
+    # 2. 근접성 (횡단보도 10m / 어린이 보호구역 300m + 거리 / 개수)
+    crosswalk = layers["crosswalk"]
+    suite.run("mark_zone_proximity_common[crosswalk]", n, GU.mark_zone_proximity_common,
+              accident_df[["lat", "lng"]].copy(), crosswalk, zone_lat_col="위도", zone_lng_col="경도",
+              output_col="near_crosswalk", radius_m=10, buffer_m=10, frame=lambda df: df[["near_crosswalk"]])
+    zones = layers["protection_zone"]
+    zones = zones[zones["구분"] == "어린이"]
+    suite.run("mark_zone_proximity_common[child_zone]", n, GU.mark_zone_proximity_common,
+              accident_df[["lat", "lng"]].copy(), zones, zone_lat_col="위도", zone_lng_col="경도",
+              output_col="near_child_zone", radius_m=300, buffer_m=100,
+              distance_col="child_zone_m", count_col="child_zone_count",
+              frame=lambda df: df[["near_child_zone", "child_zone_m", "child_zone_count"]])
+
+    # 3. 교통량 (최근접 1곳 / 4곳 역거리 가중)
+    spots = spots_from_frame(layers["traffic_spot"])
+    traffic_input = accident_df[["acdnt_year", "lat", "lng"]]
+    suite.run("process_traffic_volume_combined[k=1]", n, PD.process_traffic_volume_combined,
+              traffic_input.copy(), args.year, spots=spots, frame=lambda df: df[["traffic_volume"]])
+    suite.run("process_traffic_volume_combined[k=4]", n, PD.process_traffic_volume_combined,
+              traffic_input.copy(), args.year, k=4, spots=spots, frame=lambda df: df[["traffic_volume"]])
+
+    # 4. hotspot 군집 (파이프라인과 같은 공유 이웃 그래프, 이웃 쌍을 모두 만들므로 큰 배율은 생략)
+    hotspot = n <= args.hotspot_max_rows
+    if hotspot:
+        suite.run("compute_hotspot_columns", n, GU.compute_hotspot_columns,
+                  accident_df[["lat", "lng", "acdnt_age_1_code"]], frame=pd.DataFrame)
+    else:
+        print(f"    {'compute_hotspot_columns':<42} 생략 (--hotspot-max-rows {args.hotspot_max_rows:,})")
+
+    # 5. 기준 레이어 로드(공간 인덱스 캐시 생성) + 연도 전체 처리 (원본 읽기 → 보강 → 저장)
+    #    작업 디렉토리 기준 상대 경로로 실행
+    cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        layer_points = sum(len(df) for name, df in layers.items() if name != "traffic_spot")
+        ref_layers = suite.run("load_reference_layers", layer_points, PD.load_reference_layers,
+                               frame=lambda out: pd.DataFrame({k: [len(v["index"])] for k, v in out.items()}))
+        output_path = os.path.join(PD.PROCESSED_DIR, f"accident_data_{args.year}")
+        suite.run("run_all_processing_steps", n, PD.run_all_processing_steps, args.year, ref_layers,
+                  frame=lambda _: ST.read_table(output_path))
+
+        # 6. 보강된 사고에 hotspot 컬럼 추가 + accident_data_all 저장 (병합 후 단계와 같은 경로)
+        if hotspot:
+            hotspot_cols = [c for prefix in GU.HOTSPOT_COHORTS for c in GU.hotspot_columns(prefix)]
+            all_path = os.path.join(PD.PROCESSED_DIR, "accident_data_all")
+            suite.run("assign_hotspot_columns", n, GU.assign_hotspot_columns, ST.read_table(output_path),
+                      frame=lambda _: ST.read_table(all_path, columns=hotspot_cols))
+    finally:
+        os.chdir(cwd)
+
+
+# 기준 결과의 마지막 기록과 비교 (속도 비율 / digest 일치)
+def compare(results, base):
+    base = base.groupby(KEY_COLUMNS, as_index=False).last()
+    merged = pd.DataFrame(results).merge(base[KEY_COLUMNS + ["wall_s", "digest", "run_id"]], on=KEY_COLUMNS,
+                                         how="left", suffixes=("", "_base"))
+    print(f"\n==> 기준 결과와 비교 (기준 실행 {', '.join(base['run_id'].unique())})")
+    changed = []
+    for row in merged.itertuples():
+        if pd.isna(row.digest_base):
+            print(f"    {row.case:<42} {row.rows:>10,}행 | 기준 없음")
+            continue
+        same = row.digest == row.digest_base
+        if not same:
+            changed.append(f"{row.case}({row.rows:,})")
+        print(f"    {row.case:<42} {row.rows:>10,}행 | {row.wall_s_base:8.3f}s → {row.wall_s:8.3f}s "
+              f"(x{row.wall_s_base / row.wall_s:.2f}) | 결과 {'✅ 동일' if same else '❌ 다름'}")
+    return changed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 데이터로 전처리 주요 경로 측정")
+    parser.add_argument("--rows", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--year", type=int, default=2023)
+    parser.add_argument("--layer-scale", type=float, default=1.0, help="기준 레이어 개수 배율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--hotspot-max-rows", type=int, default=1_000_000,
+                        help="이 행 수를 넘으면 hotspot 단계는 측정하지 않음")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="결과 CSV (누적 저장)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 CSV")
+    parser.add_argument("--verbose", action="store_true", help="측정 대상 함수의 출력 표시")
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    # 같은 파일을 기준으로 쓰는 경우가 많으므로 이번 실행 결과를 추가하기 전에 읽어 둠
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        baseline = pd.read_csv(args.baseline, encoding="utf-8-sig", dtype={"digest": str})
+    elif args.baseline:
+        print(f"⚠️ 기준 결과 파일이 없습니다: {args.baseline}")
+
+    suite = Suite(args)
+    for n in args.rows:
+        with tempfile.TemporaryDirectory() as workspace:
+            bench_scale(suite, n, workspace)
+
+    suite.save(output_path)
+    print(f"\n==> 결과 저장: {output_path} (실행 {suite.run_id})")
+
+    if baseline is not None:
+        changed = compare(suite.results, baseline)
+        if changed:
+            print(f"❌ 결과가 달라진 단계: {', '.join(changed)}")
+            sys.exit(1)
+        print("✅ 모든 단계 결과 동일")
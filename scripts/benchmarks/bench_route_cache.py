@@ -0,0 +1,64 @@
+# 경로 위험도 캐시 벤치마크: 같은 경로 집합을 캐시 없이(cold) / 캐시 적중(warm)으로 점수 계산해 지연시간 비교
+# - 사고 데이터 파일이 바뀐 직후 요청 지연시간: 위험도 표는 백그라운드에서 다시 만들고 요청은 기존 표로 처리
+# 실행: python scripts/benchmarks/bench_route_cache.py --routes 2000 \
+#           --roads /tmp/seoul/data/shp/서울시_도로망.shp --accidents /tmp/seoul/data/raw/all_accident_info_2023
+#       (합성 데이터: python scripts/benchmarks/synthetic_data.py --out /tmp/seoul --rows 100000 --years 2023)
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import utils.ROAD_RISK as RR
+from synthetic_data import make_route
+
+
+def timed_pass(index, routes):
+    latencies, results = [], []
+    for route in routes:
+        start = time.perf_counter()
+        results.append(index.score(route))
+        latencies.append(time.perf_counter() - start)
+    return np.asarray(latencies) * 1000, results
+
+
+def summary(label, ms):
+    p50, p99 = np.percentile(ms, [50, 99])
+    print(f"    {label:<5} | 평균 {ms.mean():.3f} | p50 {p50:.3f} | p99 {p99:.3f} ms")
+    return ms.mean()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--routes", type=int, default=2000)
+    parser.add_argument("--points", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--roads", default=RR.ROAD_PATH)
+    parser.add_argument("--accidents", default=RR.ACCIDENT_PATH)
+    args = parser.parse_args()
+
+    index = RR.RoadRiskIndex.build(args.roads, args.accidents)
+    rng = np.random.default_rng(args.seed)
+    routes = [make_route(rng, args.points) for _ in range(args.routes)]
+
+    print(f"==> 경로 {args.routes}개, 경로당 꼭짓점 {args.points}개")
+    cold_ms, cold = timed_pass(index, routes)
+    warm_ms, warm = timed_pass(index, routes)
+    cold_mean = summary("cold", cold_ms)
+    warm_mean = summary("warm", warm_ms)
+    print(f"    warm/cold 평균 비율 {warm_mean / cold_mean:.1%}")
+    if cold != warm:
+        print("❌ 캐시 적중 결과가 캐시 없이 계산한 결과와 다릅니다.")
+        sys.exit(1)
+    print(f"✅ 결과 동일, 캐시 통계: {index.cache_stats()}")
+
+    # 위험도 표 다시 만들기(파일 변경 시와 같은 경로)를 시작하고 바로 요청 → 요청은 기다리지 않고 기존 표로 처리
+    start = time.perf_counter()
+    index.refresh(force=True)
+    reload_ms, _ = timed_pass(index, routes)
+    summary("갱신 중", reload_ms)
+    index.rebuild_thread.join()
+    print(f"    위험도 표 다시 생성 {time.perf_counter() - start:.2f}s (다시 생성 {index.reloads}회), "
+          f"그동안 요청 최대 지연 {reload_ms.max():.3f} ms")
@@ -0,0 +1,84 @@
+# 경로 위험도 API 부하 테스트: 동시 연결별 keep-alive로 요청을 보내고 지연시간 분위수 출력
+# 실행: python scripts/benchmarks/load_test_route_api.py --url http://127.0.0.1:8000 --concurrency 8 --requests 4000
+#       (--batch N: /score/batch에 N개 경로씩 전송)
+# 경로는 synthetic_data.make_route (서버는 webapi/main.py 상단의 합성 데이터 실행 방법 참고)
+# 측정 (합성 도로망 60,868구간 / 사고 10만 건, CPU 1코어에서 서버와 부하 클라이언트를 함께 실행, 요청 4000건):
+#   동시 1: p99 4.6ms | 동시 2: 8.8ms | 동시 4: 16.5ms | 동시 8: 35.3ms (목표 20ms 초과)
+#   서버는 스레드 1개 프로세스(GIL)라 동시 요청은 차례로 처리됨 → 코어당 동시 4 이하에서 목표 충족
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+
+import numpy as np
+
+from synthetic_data import make_route
+
+TARGET_P99_MS = 20
+
+
+def worker(url, bodies, latencies, errors):
+    # 본문은 bytes로 넘겨야 http.client가 헤더와 한 번에 전송함 (Nagle/delayed ACK 지연 방지)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for path, body in bodies:
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status != 200:
+                errors.append(resp.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--batch", type=int, default=1, help="요청당 경로 수 (1이면 /score)")
+    parser.add_argument("--points", type=int, default=20, help="경로당 꼭짓점 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    rng = np.random.default_rng(args.seed)
+    bodies = []
+    for _ in range(args.requests):
+        if args.batch == 1:
+            bodies.append(("/score", json.dumps({"path": make_route(rng, args.points)}).encode("utf-8")))
+        else:
+            routes = [{"path": make_route(rng, args.points)} for _ in range(args.batch)]
+            bodies.append(("/score/batch", json.dumps({"routes": routes}).encode("utf-8")))
+
+    latencies, errors = [], []
+    threads = [threading.Thread(target=worker, args=(url, bodies[i::args.concurrency], latencies, errors))
+               for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if not latencies:
+        print(f"⚠️ 성공한 요청이 없습니다 (오류 {len(errors)}건)")
+        sys.exit(1)
+    ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    print(f"==> 요청 {len(ms)}건 (오류 {len(errors)}건), 동시 {args.concurrency}, 요청당 경로 {args.batch}개, "
+          f"{len(ms) / elapsed:,.0f} req/s ({len(ms) * args.batch / elapsed:,.0f} routes/s)")
+    print(f"    지연시간 ms | p50 {p50:.2f} | p95 {p95:.2f} | p99 {p99:.2f} | max {ms.max():.2f}")
+    if args.batch == 1 and p99 > TARGET_P99_MS:
+        print(f"⚠️ p99 {p99:.2f}ms가 목표({TARGET_P99_MS}ms)를 넘었습니다.")
@@ -0,0 +1,259 @@
+# 벤치마크용 합성 데이터 (서울 범위, 벤치마크 / 부하 테스트는 모두 이 모듈의 데이터를 사용)
+# - 사고: 원본(TAAS) 컬럼 구성 그대로, 절반은 사고 다발 지점 주변에 밀집 / 나머지는 전역에 흩어짐, 1%는 좌표 없음
+#   도로명(route_nm)은 대부분 속도 테이블의 도로명, 일부는 속도 테이블에 없는 도로명
+#   make_enriched_accidents(): 전처리 후 컬럼(차로수 / 속도 / 교통량 / 근접 플래그 / hotspot)까지 포함
+# - 기준 레이어: 횡단보도 / 신호등 / 보호구역(어린이·노인·장애인) / 교통량 지점, 연도별 속도 CSV
+#   (실제 서울 데이터와 비슷한 개수, layer_scale로 배율 조정)
+# - 도로망: 격자형 도로를 교차점 사이 구간(링크)으로 나눈 LineString (EPSG:5179, LINK_ID / ROAD_NAME)
+#   도로명은 속도 테이블 / 사고 route_nm과 같은 목록, 기본 150m 간격이면 약 6만 구간 (서울 도로망과 비슷한 규모)
+# - write_workspace(): prepare_datasets와 같은 상대 경로(data/raw, data/external, data/shp)로 저장
+#   → 해당 디렉토리에서 prepare_datasets.py / run_pipeline.py를 그대로 실행할 수 있음
+# 실행: python scripts/benchmarks/synthetic_data.py --out /tmp/seoul_synthetic --rows 100000 [--road-spacing 150]
+import sys
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+import shapely
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import prepare_datasets as PD
+import utils.CONSTANTS as CONST
+import utils.GEO_UTILS as GU
+import utils.ROAD_NETWORK as RN
+import utils.STORAGE as ST
+
+SEOUL_LAT = (37.45, 37.68)
+SEOUL_LNG = (126.85, 127.15)
+
+# 실제 서울 데이터 기준 대략적인 개수
+LAYER_SIZES = {"crosswalk": 40_000, "traffic_light": 30_000, "protection_zone": 1_800, "traffic_spot": 150}
+ZONE_SHARES = {"어린이": 0.7, "노인": 0.2, "장애인": 0.1}
+ROAD_STEMS = ["강남", "테헤란", "세종", "을지", "퇴계", "율곡", "성산", "양화", "마포", "도산", "언주", "봉은사",
+              "올림픽", "동일", "망우", "왕산", "천호", "도봉", "시흥", "남부순환", "노량진", "한남", "동호", "청계천"]
+ROAD_COUNT = 400
+UNKNOWN_ROAD_SHARE = 0.2
+TRAFFIC_YEARS = [2021, 2022, 2023]
+ROAD_SPACING_M = 150
+
+CATEGORY_VALUES = {
+    "acdnt_hdc": ["사망사고", "중상사고", "경상사고", "부상신고사고"],
+    "lrg_violt_1_dc": ["안전운전불이행", "신호위반", "안전거리미확보", "중앙선침범", "보행자보호의무위반", "기타"],
+    "road_stle_dc": ["교차로안", "교차로부근", "단일로", "횡단보도상", "기타"],
+    "wrngdo_vhcle_asort_dc": ["승용", "화물", "승합", "이륜", "자전거", "개인형이동수단(PM)"],
+    "rdse_sttus_dc": ["건조", "젖음/습기", "서리/결빙", "적설"],
+    "road_div": ["특별광역시도", "시도", "군도", "기타"],
+}
+
+
+# 범위(위도, 경도): scale배로 넓히면 면적도 scale배 (밀도 유지, 전국 단위 확장 가정)
+def _bounds(scale=1):
+    side = np.sqrt(scale)
+    return ((SEOUL_LAT[0], SEOUL_LAT[0] + (SEOUL_LAT[1] - SEOUL_LAT[0]) * side),
+            (SEOUL_LNG[0], SEOUL_LNG[0] + (SEOUL_LNG[1] - SEOUL_LNG[0]) * side))
+
+
+def _uniform_points(rng, n, scale=1):
+    lat_range, lng_range = _bounds(scale)
+    return rng.uniform(*lat_range, n), rng.uniform(*lng_range, n)
+
+
+# 도로명 목록 (속도 CSV에는 일부 도로명이 "세종 대로"처럼 공백을 포함)
+def road_names(count=ROAD_COUNT):
+    names = [f"{stem}{kind}" for stem in ROAD_STEMS for kind in ("대로", "로")]
+    names += [f"{ROAD_STEMS[i % len(ROAD_STEMS)]}로{i // len(ROAD_STEMS) + 1}길" for i in range(count - len(names))]
+    return names[:count]
+
+
+def make_accidents(n, year=2023, seed=0, scale=1):
+    rng = np.random.default_rng([seed, year])
+    n_hot = n // 2
+    centers = np.column_stack(_uniform_points(rng, max(1, n // 150), scale))
+    hot = centers[rng.integers(0, len(centers), n_hot)] + rng.normal(0, 4e-4, (n_hot, 2))
+    coords = np.vstack((hot, np.column_stack(_uniform_points(rng, n - n_hot, scale))))[rng.permutation(n)]
+    coords[rng.random(n) < 0.01] = np.nan
+
+    roads = np.array(road_names(), dtype=object)
+    unknown = np.char.add(rng.choice(ROAD_STEMS, n).astype(str), "골목")
+    route_nm = np.where(rng.random(n) < UNKNOWN_ROAD_SHARE, unknown, roads[rng.integers(0, len(roads), n)])
+
+    df = pd.DataFrame({
+        "acdnt_no": year * 10_000_000_000 + np.arange(n),
+        "acdnt_year": year,
+        "lat": coords[:, 0],
+        "lng": coords[:, 1],
+        "route_nm": route_nm.astype(object),
+        "occrrnc_time_code": rng.integers(0, 24, n),
+        "acdnt_age_1_code": rng.integers(16, 95, n),
+        "sigungu": rng.choice(CONST.SEOUL_DISTRICTS, n).astype(object),
+        "legaldong_name": np.char.add("동", rng.integers(0, 400, n).astype(str)).astype(object),
+    })
+    for col, values in CATEGORY_VALUES.items():
+        df[col] = rng.choice(values, n).astype(object)
+    return df
+
+
+# 전처리(보강) 후 컬럼까지 포함한 사고 (특성 행렬 / 격자 집계 / 저장소 벤치마크 입력)
+def make_enriched_accidents(n, year=2023, seed=0):
+    df = make_accidents(n, year, seed)
+    rng = np.random.default_rng([seed, year, 4])
+    df["lanes"] = rng.choice([2.0, 4.0, 6.0, 8.0, np.nan], n)
+    df["lengths"] = rng.uniform(100, 10_000, n).round()
+    df["velocity"] = np.where(rng.random(n) < 0.2, np.nan, rng.uniform(10, 60, n).round(1))
+    df["traffic_volume"] = np.where(rng.random(n) < 0.3, np.nan, rng.uniform(1e3, 2e5, n).round())
+    for spec in PD.REFERENCE_LAYERS.values():
+        df[spec["output_col"]] = (rng.random(n) < 0.2).astype("int64")
+
+    # hotspot 여부는 대상 연령이 아니면 결측 (GEO_UTILS.compute_hotspot_columns와 같은 형식)
+    age = df["acdnt_age_1_code"].to_numpy()
+    for prefix, cohort in GU.HOTSPOT_COHORTS.items():
+        in_cohort = np.ones(n, dtype=bool)
+        if cohort["min_age"] is not None:
+            in_cohort &= age >= cohort["min_age"]
+        if cohort["max_age"] is not None:
+            in_cohort &= age < cohort["max_age"]
+        flag_col, lat_col, lng_col = GU.hotspot_columns(prefix)
+        flag = np.where(in_cohort, (rng.random(n) < 0.2).astype("float64"), np.nan)
+        df[flag_col] = flag
+        df[lat_col] = np.where(flag == 1, df["lat"], np.nan)
+        df[lng_col] = np.where(flag == 1, df["lng"], np.nan)
+    return df
+
+
+# 격자형 도로망 → GeoDataFrame (LINK_ID, ROAD_NAME, EPSG:5179 LineString)
+# 교차점 위치를 조금씩 흔들고, 동서 / 남북 도로마다 road_names()의 도로명을 돌아가며 붙임
+def make_road_network(spacing_m=ROAD_SPACING_M, seed=0, scale=1):
+    import geopandas as gpd
+
+    rng = np.random.default_rng([seed, 3])
+    lat_range, lng_range = _bounds(scale)
+    x, y = GU.project_xy(np.array(lat_range), np.array(lng_range), epsg_to=RN.ROAD_EPSG)
+    xs = np.arange(min(x), max(x) + spacing_m, spacing_m)
+    ys = np.arange(min(y), max(y) + spacing_m, spacing_m)
+    gx, gy = np.meshgrid(xs, ys)
+    nodes = np.stack((gx, gy), axis=-1) + rng.normal(0, spacing_m * 0.08, (len(ys), len(xs), 2))
+
+    # 교차점 (행, 열) → (행, 열 + 1) 동서 구간 / (행 + 1, 열) 남북 구간
+    east_west = np.stack((nodes[:, :-1], nodes[:, 1:]), axis=2).reshape(-1, 2, 2)
+    north_south = np.stack((nodes[:-1, :], nodes[1:, :]), axis=2).reshape(-1, 2, 2)
+    road = np.concatenate((np.repeat(np.arange(len(ys)), len(xs) - 1),
+                           len(ys) + np.tile(np.arange(len(xs)), len(ys) - 1)))
+    names = np.array(road_names(), dtype=object)
+    return gpd.GeoDataFrame({
+        RN.ROAD_ID_COL: [str(1_000_000_000 + i) for i in range(len(road))],
+        RN.ROAD_NAME_COL: names[road % len(names)],
+    }, geometry=shapely.linestrings(np.concatenate((east_west, north_south))), crs=f"EPSG:{RN.ROAD_EPSG}")
+
+
+# 서울 범위 안에서 임의 방향으로 꺾이는 경로 (약 step_m 간격 꼭짓점, 경로 위험도 API 부하 테스트용)
+def make_route(rng, points=20, step_m=150):
+    lat = rng.uniform(*SEOUL_LAT)
+    lng = rng.uniform(*SEOUL_LNG)
+    heading = rng.uniform(0, 2 * np.pi)
+    path = [[lat, lng]]
+    for _ in range(points - 1):
+        heading += rng.normal(0, 0.4)
+        lat += step_m * np.cos(heading) / 111_000
+        lng += step_m * np.sin(heading) / 88_000
+        path.append([round(lat, 6), round(lng, 6)])
+    return path
+
+
+# 도로망 shp 저장 (ROAD_NETWORK가 읽는 인코딩 그대로)
+def write_road_network(network, path=RN.ROAD_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    network.to_file(path, encoding=RN.ROAD_ENCODING)
+    return path
+
+
+# 기준 레이어 {"crosswalk", "traffic_light", "protection_zone", "traffic_spot"} → DataFrame (원본 파일 컬럼 구성)
+def make_reference_layers(layer_scale=1.0, seed=0):
+    rng = np.random.default_rng([seed, 1])
+    sizes = {name: max(1, int(size * layer_scale)) for name, size in LAYER_SIZES.items()}
+
+    layers = {}
+    for name, kind in (("crosswalk", "횡단보도"), ("traffic_light", "신호등")):
+        lat, lng = _uniform_points(rng, sizes[name])
+        missing = rng.random(len(lat)) < 0.01
+        layers[name] = pd.DataFrame({"구분": kind, "위도": np.where(missing, np.nan, lat),
+                                     "경도": np.where(missing, np.nan, lng)})
+
+    lat, lng = _uniform_points(rng, sizes["protection_zone"])
+    kinds = rng.choice(list(ZONE_SHARES), len(lat), p=list(ZONE_SHARES.values()))
+    layers["protection_zone"] = pd.DataFrame({"구분": kinds.astype(object), "위도": lat, "경도": lng})
+
+    n = sizes["traffic_spot"]
+    lat, lng = _uniform_points(rng, n)
+    spots = pd.DataFrame({"지점명": [f"지점{i}" for i in range(n)]})
+    base = rng.uniform(2e4, 2e5, n)
+    for year in TRAFFIC_YEARS:
+        volume = np.round(base * rng.uniform(0.9, 1.1, n))
+        spots[str(year)] = np.where(rng.random(n) < 0.05, np.nan, volume)
+    spots["지점번호"] = [f"A-{i + 1:02d}" for i in range(n)]
+    spots["lat"], spots["lng"] = lat, lng
+    layers["traffic_spot"] = spots
+    return layers
+
+
+# 연도별 속도 CSV 형식: 도로명이 있는 행 + 방향별 행(도로명 비어 있음), 일부 도로는 여러 구간으로 나뉨
+def make_velocity_table(year, seed=0):
+    rng = np.random.default_rng([seed, year, 2])
+    rows = []
+    for name in road_names():
+        label = name.replace("대로", " 대로") if rng.random() < 0.3 else name
+        for _ in range(1 + (rng.random() < 0.2)):
+            lanes = str(rng.integers(2, 5)) if rng.random() < 0.8 else f"{rng.integers(2, 4)}~{rng.integers(4, 7)}"
+            speeds = np.round(rng.uniform(15, 50, 4), 1)
+            rows.append([label, f"{rng.integers(300, 8000):,}", lanes, "양방향", *speeds])
+            for direction in ("EB", "WB"):
+                rows.append(["", "", "", direction, *np.round(speeds * rng.uniform(0.9, 1.1, 4), 1)])
+
+    bands = list(PD.VELOCITY_BANDS.values()) + [PD.VELOCITY_DEFAULT_BAND]
+    df = pd.DataFrame(rows, columns=["도로명", "연장", "차로수", "방향", *bands])
+    named = df["도로명"] != ""
+    df.insert(0, "연번", named.cumsum().where(named).astype("Int64"))
+    df[f"{year - 1} 년\n전일"] = np.round(df["전일"] * rng.uniform(0.95, 1.05, len(df)), 1)
+    df["전년대비"] = np.round(df["전일"] - df[f"{year - 1} 년\n전일"], 1)
+    return df
+
+
+# root 아래에 prepare_datasets 입력 파일 전체 저장 (사고는 연도별 rows건, road_spacing_m이 없으면 도로망 생략)
+def write_workspace(root, rows, years=(2021, 2022, 2023), layer_scale=1.0, seed=0, road_spacing_m=ROAD_SPACING_M):
+    def path(relative):
+        full = os.path.join(root, relative)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        return full
+
+    layers = make_reference_layers(layer_scale, seed)
+    layer_paths = {
+        "crosswalk": PD.REFERENCE_LAYERS["crosswalk"]["path"],
+        "traffic_light": PD.REFERENCE_LAYERS["traffic_light"]["path"],
+        "protection_zone": PD.REFERENCE_LAYERS[CONST.ZONE_COLUMNS["어린이"]]["path"],
+    }
+    for name, relative in layer_paths.items():
+        ST.write_table(layers[name], path(relative))
+    ST.write_table(layers["traffic_spot"], path(PD.TRAFFIC_PATH))
+    if road_spacing_m:
+        write_road_network(make_road_network(road_spacing_m, seed), path(RN.ROAD_PATH))
+
+    accidents = {}
+    for year in years:
+        make_velocity_table(year, seed).to_csv(path(PD.VELOCITY_PATH.format(year=year)), index=False)
+        accidents[year] = make_accidents(rows, year, seed)
+        ST.write_table(accidents[year], path(PD.ACCIDENT_PATH.format(year=year)))
+    return accidents, layers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서울 범위 합성 사고 / 기준 레이어 / 도로망 생성")
+    parser.add_argument("--out", required=True, help="작업 디렉토리 (data/raw, data/external, data/shp 생성)")
+    parser.add_argument("--rows", type=int, default=100_000, help="연도별 사고 건수")
+    parser.add_argument("--years", nargs="+", type=int, default=[2021, 2022, 2023])
+    parser.add_argument("--layer-scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--road-spacing", type=float, default=ROAD_SPACING_M, help="도로 간격 (m), 0이면 도로망 생략")
+    args = parser.parse_args()
+
+    write_workspace(args.out, args.rows, args.years, args.layer_scale, args.seed, args.road_spacing)
+    print(f"====> 합성 데이터 저장 완료: {args.out} (연도별 {args.rows:,}건, {', '.join(map(str, args.years))})")
@@ -0,0 +1,46 @@
+# 파이프라인 실행 보고서 비교 (성능 회귀 확인)
+# - 인자가 없으면 같은 스크립트의 가장 최근 실행 2개를 비교 (기준 = 이전 실행)
+# - 기준 대비 --threshold 이상 느려지고 --min-s 초 이상 차이 나는 단계가 있으면 종료 코드 1
+#
+# 실행: python scripts/compare_runs.py
+#       python scripts/compare_runs.py data/reports/pipeline/현재.json --baseline data/reports/pipeline/기준.json
+import sys
+import os
+import argparse
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+import pandas as pd
+
+import utils.PROFILING as PF
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파이프라인 실행 보고서 비교")
+    parser.add_argument("current", nargs="?", help="비교할 실행 보고서 (기본: 가장 최근)")
+    parser.add_argument("--baseline", help="기준 실행 보고서 (기본: current 직전 실행)")
+    parser.add_argument("--name", default="run_pipeline", help="보고서를 고를 스크립트 이름")
+    parser.add_argument("--report-dir", default=PF.REPORT_DIR)
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 소요시간 증가 비율")
+    parser.add_argument("--min-s", type=float, default=0.5, help="회귀로 볼 최소 소요시간 차이 (초)")
+    args = parser.parse_args()
+
+    paths = PF.list_reports(args.report_dir, args.name)
+    current = args.current or (paths[-1] if paths else None)
+    # 보고서 파일 이름(run_id)은 실행 시각 순
+    earlier = [p for p in paths if current and os.path.basename(p) < os.path.basename(current)]
+    baseline = args.baseline or (earlier[-1] if earlier else None)
+    if current is None or baseline is None:
+        print(f"⚠️ 비교할 실행 보고서가 2개 이상 필요합니다: {args.report_dir}")
+        sys.exit(0)
+
+    cur, base = PF.load_report(current), PF.load_report(baseline)
+    print(f"==> 기준 {base['run_id']} ({base.get('git_commit')}) → 현재 {cur['run_id']} ({cur.get('git_commit')})")
+    result = PF.compare_reports(cur, base, threshold=args.threshold, min_s=args.min_s)
+    with pd.option_context("display.width", 200):
+        print(result.round(2).to_string(index=False))
+
+    regressed = result[result["regression"]]
+    if len(regressed):
+        names = [r.stage if pd.isna(r.year) else f"{r.stage}({r.year})" for r in regressed.itertuples()]
+        print(f"❌ 느려진 단계: {', '.join(names)}")
+        sys.exit(1)
+    print("✅ 느려진 단계 없음")
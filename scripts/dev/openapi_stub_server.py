@@ -0,0 +1,116 @@
+# 서울 OpenAPI(SpotInfo) / UTIC 보호구역 로컬 대체 서버 (utils/OPENAPI.py 점검용)
+# - /{key}/xml/SpotInfo/{start}/{end}/: list_total_count + <row> XML, 요청 구간만 반환
+# - /guide/getSafeOpenJson.do: 시도별 고정 보호구역 JSON
+# - 모든 응답에 ETag를 붙이고 If-None-Match가 같으면 304 반환
+#
+# 실행: python scripts/dev/openapi_stub_server.py --port 8770 --spots 2500
+#       SEOUL_OPENAPI_URL=http://127.0.0.1:8770 UTIC_OPENAPI_URL=http://127.0.0.1:8770 \
+#       SEOUL_OPENAPI_KEY=test UTIC_API_KEY=test python scripts/fetch_source_data.py
+import sys
+import os
+import json
+import time
+import random
+import hashlib
+import argparse
+from urllib.parse import urlparse, parse_qs
+from xml.sax.saxutils import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+import utils.GEO_UTILS as GU
+
+
+def make_spots(total):
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(37.45, 37.68, total)
+    lng = rng.uniform(126.85, 127.15, total)
+    x, y = GU.get_transformer(4326, 5181).transform(lng, lat)
+    return [
+        {"spot_num": f"A-{i + 1:04d}", "spot_nm": f"지점{i + 1}", "grs80tm_x": f"{x[i]:.3f}", "grs80tm_y": f"{y[i]:.3f}"}
+        for i in range(total)
+    ]
+
+
+def make_zones(sido_code, count=300):
+    rng = np.random.default_rng(int(sido_code))
+    return [
+        {"FCLTY_TY": int(rng.integers(1, 5)), "X": round(float(rng.uniform(126.85, 127.15)), 6),
+         "Y": round(float(rng.uniform(37.45, 37.68)), 6)}
+        for _ in range(count)
+    ]
+
+
+def spot_page(spots, start, end):
+    if start > len(spots):
+        return ("<SpotInfo><list_total_count>0</list_total_count>"
+                "<RESULT><CODE>INFO-200</CODE><MESSAGE>해당하는 데이터가 없습니다.</MESSAGE></RESULT></SpotInfo>")
+    rows = "".join(
+        "<row>" + "".join(f"<{k}>{escape(v)}</{k}>" for k, v in spot.items()) + "</row>"
+        for spot in spots[start - 1:end]
+    )
+    return (f'<?xml version="1.0" encoding="UTF-8"?><SpotInfo><list_total_count>{len(spots)}</list_total_count>'
+            f"<RESULT><CODE>INFO-000</CODE><MESSAGE>정상 처리되었습니다</MESSAGE></RESULT>{rows}</SpotInfo>")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    settings = {"spots": [], "delay": 0.0, "fail_rate": 0.0}
+    stats = {"200": 0, "304": 0, "500": 0}
+
+    def _send(self, status, body, content_type):
+        payload = body.encode("utf-8")
+        etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.stats["304"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.stats[str(status)] = self.stats.get(str(status), 0) + 1
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        time.sleep(self.settings["delay"])
+        if random.random() < self.settings["fail_rate"]:
+            return self._send(500, "stub failure", "text/plain")
+
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if len(parts) == 5 and parts[1] == "xml" and parts[2] == "SpotInfo":
+            start, end = int(parts[3]), int(parts[4])
+            return self._send(200, spot_page(self.settings["spots"], start, end), "application/xml")
+        if url.path == "/guide/getSafeOpenJson.do":
+            query = parse_qs(url.query)
+            sido_code = query.get("sidoCd", ["11"])[0]
+            body = {"resultCode": "00", "resultMsg": "정상", "items": make_zones(sido_code)}
+            return self._send(200, json.dumps(body, ensure_ascii=False), "application/json")
+        self._send(404, "not found", "text/plain")
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAPI 로컬 대체 서버")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--spots", type=int, default=2500, help="SpotInfo 전체 건수")
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="HTTP 500을 돌려줄 확률")
+    args = parser.parse_args()
+
+    StubHandler.settings.update(spots=make_spots(args.spots), delay=args.delay, fail_rate=args.fail_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    print(f"==> OpenAPI 대체 서버 실행 중: http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"==> 응답 통계: {StubHandler.stats}")
@@ -0,0 +1,165 @@
+# TAAS 지도 화면 로컬 대체 서버 (크롤러 개발/점검용)
+# - initMap.do: 크롤러가 사용하는 조회 조건 폼(연도/시도/시군구/사고유형, 검색 버튼)만 흉내 낸 페이지
+# - selectAccidentInfo.do: (연도, 자치구)별로 고정된 가짜 사고 목록 반환 (x_crdnt/y_crdnt는 EPSG:5179)
+# - 검색 요청 필드명(year / sigungu)과 시군구 옵션 값(코드)은 화면 요소 id / 표시 텍스트와 다름
+#   → fetch_accident_df_http는 capture_search_form으로 캡처한 요청 폼을 써야 동작 (실제 화면과 같은 조건)
+# - --delay / --fail-rate로 느린 응답과 간헐적 오류를 재현, --fail-first N: (연도, 자치구)마다 처음 N번은 HTTP 500
+#
+# 실행: python scripts/dev/taas_stub_server.py --port 8765 --delay 0.5 2 --fail-rate 0.1
+import sys
+import os
+import json
+import time
+import random
+import zlib
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+import utils.CONSTANTS as CONST
+import utils.GEO_UTILS as GU
+
+MAP_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>TAAS stub</title></head>
+<body>
+<button id="menuPartSearch" type="button">조건검색</button>
+<div id="partSearch" style="display:none">
+  <select id="ptsRafYearStart">__YEARS__</select>
+  <select id="ptsRafYearEnd">__YEARS__</select>
+  <select id="ptsRafSido"><option value="">선택</option><option value="11">서울특별시</option></select>
+  <select id="ptsRafSigungu"><option value="">선택</option></select>
+  <label><input type="checkbox" name="ACDNT_GAE_CODE" value="01">사망</label>
+  <label><input type="checkbox" name="ACDNT_GAE_CODE" value="02">중상</label>
+  <label><input type="checkbox" name="ACDNT_GAE_CODE" value="03">경상</label>
+  <label><input type="checkbox" name="ACDNT_GAE_CODE" value="04">부상신고</label>
+  <button class="btn-search" type="button">검색</button>
+</div>
+<script>
+const DISTRICTS = __DISTRICTS__;  // [표시 텍스트, 코드]
+document.getElementById("menuPartSearch").onclick = () => {
+  document.getElementById("partSearch").style.display = "block";
+};
+// 실제 화면처럼 시도 선택 후 시군구 목록을 늦게 채움
+document.getElementById("ptsRafSido").onchange = (e) => {
+  const target = document.getElementById("ptsRafSigungu");
+  target.innerHTML = '<option value="">선택</option>';
+  if (!e.target.value) return;
+  setTimeout(() => {
+    for (const [name, code] of DISTRICTS) {
+      const option = document.createElement("option");
+      option.value = code; option.textContent = name;
+      target.appendChild(option);
+    }
+  }, 300);
+};
+document.querySelector(".btn-search").onclick = () => {
+  const body = new URLSearchParams({
+    year: document.getElementById("ptsRafYearStart").value,
+    sigungu: document.getElementById("ptsRafSigungu").value,
+  });
+  for (const checkbox of document.querySelectorAll('input[name="ACDNT_GAE_CODE"]:checked')) {
+    body.append("grade", checkbox.value);
+  }
+  fetch("/gis/mcm/mcl/selectAccidentInfo.do", {method: "POST", body: body});
+};
+</script>
+</body></html>
+"""
+
+# 자치구 중심 좌표 주변 반경 약 2km 내 임의 좌표
+SEOUL_CENTER = (37.5665, 126.9780)
+
+# 시군구 옵션 값 (표시 텍스트 → 코드)
+SIGUNGU_CODES = {name: f"11{i + 1:03d}" for i, name in enumerate(CONST.SEOUL_DISTRICTS)}
+
+
+def make_accidents(year, sigungu, rows):
+    seed = zlib.crc32(f"{year}:{sigungu}".encode("utf-8"))
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(rows // 2, rows + 1))
+    offset = rng.normal(0, 0.05, 2)
+    lat = SEOUL_CENTER[0] + offset[0] + rng.normal(0, 0.01, n)
+    lng = SEOUL_CENTER[1] + offset[1] + rng.normal(0, 0.01, n)
+    x, y = GU.get_transformer(4326, 5179).transform(lng, lat)
+    return [
+        {
+            "acdnt_no": f"{year}{seed % 100000:05d}{i:05d}",
+            "acdnt_year": year,
+            "x_crdnt": round(float(x[i]), 3),
+            "y_crdnt": round(float(y[i]), 3),
+            "occrrnc_time_code": int(rng.integers(0, 24)),
+            "acdnt_age_1_code": int(rng.integers(15, 90)),
+        }
+        for i in range(n)
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    settings = {"delay": (0.0, 0.0), "fail_rate": 0.0, "fail_first": 0, "rows": 200, "years": CONST.TAAS_YEARS}
+    attempts = Counter()
+    lock = threading.Lock()
+
+    def _send(self, status, body, content_type):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/gis/mcm/mcl/initMap.do":
+            return self._send(404, "not found", "text/plain")
+        years = "".join(f'<option value="{y}">{y}</option>' for y in self.settings["years"])
+        page = (MAP_PAGE.replace("__YEARS__", years)
+                .replace("__DISTRICTS__", json.dumps(list(SIGUNGU_CODES.items()), ensure_ascii=False)))
+        self._send(200, page, "text/html")
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/gis/mcm/mcl/selectAccidentInfo.do":
+            return self._send(404, "not found", "text/plain")
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        year = form.get("year", [""])[0]
+        sigungu = {code: name for name, code in SIGUNGU_CODES.items()}.get(form.get("sigungu", [""])[0])
+        if not year or not sigungu:
+            return self._send(400, json.dumps({"error": "missing search conditions"}), "application/json")
+
+        with self.lock:
+            self.attempts[(year, sigungu)] += 1
+            attempt = self.attempts[(year, sigungu)]
+        time.sleep(random.uniform(*self.settings["delay"]))
+        if attempt <= self.settings["fail_first"] or random.random() < self.settings["fail_rate"]:
+            return self._send(500, json.dumps({"error": "stub failure"}), "application/json")
+
+        accidents = make_accidents(year, sigungu, self.settings["rows"])
+        body = json.dumps({"resultValue": {"accidentInfoList": accidents}}, ensure_ascii=False)
+        self._send(200, body, "application/json")
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TAAS 로컬 대체 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", nargs=2, type=float, default=[0.0, 0.0], metavar=("MIN", "MAX"),
+                        help="selectAccidentInfo.do 응답 지연 범위 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="HTTP 500을 돌려줄 확률")
+    parser.add_argument("--fail-first", type=int, default=0, help="(연도, 자치구)마다 처음 N번 요청은 HTTP 500")
+    parser.add_argument("--rows", type=int, default=200, help="(연도, 자치구)별 최대 사고 건수")
+    args = parser.parse_args()
+
+    StubHandler.settings.update(delay=tuple(args.delay), fail_rate=args.fail_rate, fail_first=args.fail_first,
+                                rows=args.rows)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    print(f"==> TAAS 대체 서버 실행 중: http://127.0.0.1:{args.port}/gis/mcm/mcl/initMap.do?menuId=GIS_GMP_STS_RSN")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -3,169 +3,137 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-import requests
-import certifi
+import asyncio
 import pandas as pd
-import xml.etree.ElementTree as ET
-
-from pyproj import Transformer
-from dotenv import load_dotenv
-from pyproj import Transformer
-from dotenv import load_dotenv
 
 import utils.GEO_UTILS as GU
 import utils.CONSTANTS as CONST
+import utils.STORAGE as ST
+import utils.OPENAPI as OA
+import utils.STREAM_READ as SR
+
+CROSSWALK_COLUMNS = ['순번', '자치구', '관리번호', '횡단보도종류', '주소', '교차로명', 'X좌표', 'Y좌표', '도로구분']
+TRAFFIC_LIGHT_TYPES = [2.0, 4.0, 5.0, 6.0, 21.0]
+TRAFFIC_LIGHT_DTYPES = {"부착대관리번호": "string", "신호등종류": "float64", "X좌표": "string", "Y좌표": "string"}
 
-# 횡단보도 데이터 수집 (from xlsx)
-def process_crosswalk():
+# 횡단보도 데이터 수집 (from xlsx, read-only 모드로 청크 단위 처리)
+def process_crosswalk(chunk_size=SR.CHUNK_SIZE):
     print("==>1. 횡단보도 데이터 처리 시작")
     file_path = "./data/raw/서울특별시_자치구별 신호등 및 횡단보도 위치 및 현황_20230530.xlsx"
-    df = pd.read_excel(file_path, engine='openpyxl', header=2)
 
-    if df.columns[0].startswith("Unnamed"):
-        df = df.drop(columns=[df.columns[0]])
-        df.columns = ['순번', '자치구', '관리번호', '횡단보도종류', '주소', '교차로명', 'X좌표', 'Y좌표', '도로구분']
-    
-    df.reset_index(drop=True, inplace=True)
-    df["X좌표"] = pd.to_numeric(df["X좌표"], errors="coerce")
-    df["Y좌표"] = pd.to_numeric(df["Y좌표"], errors="coerce")
-          
-    df[["위도", "경도"]] = GU.convert_coordinates(df, "X좌표", "Y좌표", "위도", "경도")
+    with ST.TableWriter("./data/external/crosswalk_data") as writer:
+        for df in SR.iter_xlsx_chunks(file_path, header_row=2, chunk_size=chunk_size):
+            if df.columns[0].startswith("Unnamed"):
+                df = df.drop(columns=[df.columns[0]])
+                df.columns = CROSSWALK_COLUMNS
 
-    df["구분"] = "횡단보도"
-    df = df[["구분", "위도", "경도"]]
+            df["X좌표"] = pd.to_numeric(df["X좌표"], errors="coerce")
+            df["Y좌표"] = pd.to_numeric(df["Y좌표"], errors="coerce")
+            df[["위도", "경도"]] = GU.convert_coordinates(df, "X좌표", "Y좌표", "위도", "경도")
 
-    output_path = "./data/external/crosswalk_data.csv"
-    df.to_csv(output_path, index=False)
-    print(f"===> 횡단보도 CSV 저장 완료: {output_path}")
+            df["구분"] = "횡단보도"
+            writer.write(df[["구분", "위도", "경도"]])
 
-# 신호등 데이터 수집 (from csv)
-def process_traffic_light():
+    print(f"===> 횡단보도 저장 완료: {writer.path} ({writer.rows}건)")
+
+# 신호등 데이터 수집 (from csv, 청크 단위로 필터링 / 좌표 중복 제거 / 좌표 변환)
+def process_traffic_light(chunk_size=SR.CHUNK_SIZE):
     print("==>2. 신호등 데이터 처리 시작")
     file_path = "./data/raw/서울시 신호등 관련 정보.csv"
-    df = pd.read_csv(file_path, encoding="euc-kr")
+    dedupe = SR.CoordinateDeduper("X좌표", "Y좌표")
 
-    df = df[["부착대관리번호", "신호등종류", "X좌표", "Y좌표"]]
-    df = df[df["신호등종류"].isin([2.0, 4.0, 5.0, 6.0, 21.0])]
-    df = df.drop_duplicates(subset=["X좌표", "Y좌표"])
-    df["X좌표"] = pd.to_numeric(df["X좌표"], errors="coerce")
-    df["Y좌표"] = pd.to_numeric(df["Y좌표"], errors="coerce")
+    with ST.TableWriter("./data/external/traffic_light_data") as writer:
+        for df in SR.iter_csv_chunks(file_path, columns=list(TRAFFIC_LIGHT_DTYPES), dtype=TRAFFIC_LIGHT_DTYPES,
+                                     chunk_size=chunk_size, encoding="euc-kr"):
+            df = df[df["신호등종류"].isin(TRAFFIC_LIGHT_TYPES)]
+            df["X좌표"] = pd.to_numeric(df["X좌표"], errors="coerce")
+            df["Y좌표"] = pd.to_numeric(df["Y좌표"], errors="coerce")
+            df = dedupe(df)
 
-    df[["위도", "경도"]] = GU.convert_coordinates(df, "X좌표", "Y좌표", "위도", "경도")
+            df[["위도", "경도"]] = GU.convert_coordinates(df, "X좌표", "Y좌표", "위도", "경도")
+            df["구분"] = "신호등"
+            writer.write(df[["구분", "위도", "경도"]])
 
-    df["구분"] = "신호등"
-    df = df[["구분", "위도", "경도"]]
-    
-    output_path = "./data/external/traffic_light_data.csv"
-    df.to_csv(output_path, index=False)
-    print(f"===> 신호등 CSV 저장 완료: {output_path}")
+    print(f"===> 신호등 저장 완료: {writer.path} ({writer.rows}건)")
 
 # 보호구역 데이터 수집 (from OpenAPI)
 def process_protection_zone():
     print("==>3. 보호구역(OpenAPI) 데이터 처리 시작")
+    items = asyncio.run(_fetch_openapi(OA.fetch_utic_safe_zones))
+    if items is not None:
+        _save_protection_zone(items)
 
-    # API 키 불러오기
-    load_dotenv()
-    api_key = os.getenv("UTIC_API_KEY")
-    print(api_key)
-    if not api_key:
-        print("⚠️ API_KEY가 설정되지 않았습니다.")
-        return
-    
-    # API 호출
-    url = "http://www.utic.go.kr/guide/getSafeOpenJson.do"
-    params = {
-        "key": api_key,
-        "type": "json",
-        "sidoCd": CONST.SEOUL
-    }
-    response = requests.get(url, params=params, verify=certifi.where())
-
-    if response.status_code != 200:
-        print(f"⚠️ HTTP 오류 발생: {response.status_code}")
-        return
-
-    data = response.json()
-    if data.get("resultCode") != "00":
-        print(f"⚠️ API 요청 실패: {data.get('resultMsg')}")
-        return
-
-    # 데이터 가공
-    extracted = []
-    for item in data.get("items", []):
-        code = str(item.get("FCLTY_TY"))
-        x = item.get("X")
-        y = item.get("Y")
-        if code in CONST.ZONE_TYPE and x and y:
-            extracted.append({
-                "구분": CONST.ZONE_TYPE[code],
-                "경도": x,
-                "위도": y
-            })
-
-    df = pd.DataFrame(extracted)[["구분", "위도", "경도"]]
-
-    output_path = "./data/external/protection_zone_data.csv"
-    df.to_csv(output_path, index=False, encoding="utf-8-sig")
-    print(f"===> 보호구역 CSV 저장 완료: {output_path}")
-    
+# 교통량 지점 정보 수집 (from OpenAPI, 1000건 단위 페이지 전체)
 def process_traffic_spots():
     print("==>4. 교통량 지점 정보(OpenAPI) 데이터 처리 시작")
-
-    load_dotenv()
-    api_key = os.getenv("SEOUL_OPENAPI_KEY")
-    if not api_key:
-        print("⚠️ API_KEY가 설정되지 않았습니다.")
-        return
-    
-    # API 요청
-    url = f"http://openapi.seoul.go.kr:8088/{api_key}/xml/SpotInfo/1/1000/"
-    response = requests.get(url)
-
-    if response.status_code != 200:
-        print(f"⚠️ HTTP 오류 발생: {response.status_code}")
-        return
-
-    root = ET.fromstring(response.content)
-    rows = root.findall("row")
-    if not rows:
+    rows = asyncio.run(_fetch_openapi(_fetch_spot_rows))
+    if rows is not None:
+        _save_traffic_spots(rows)
+
+# 보호구역 + 교통량 지점을 하나의 연결 풀로 동시에 수집
+def process_openapi_sources():
+    print("==>3~4. 보호구역 / 교통량 지점 정보(OpenAPI) 동시 수집 시작")
+    items, rows = asyncio.run(_fetch_openapi(OA.fetch_utic_safe_zones, _fetch_spot_rows))
+    if items is not None:
+        _save_protection_zone(items)
+    if rows is not None:
+        _save_traffic_spots(rows)
+
+
+SPOT_FIELDS = ["spot_num", "spot_nm", "grs80tm_x", "grs80tm_y"]
+
+def _fetch_spot_rows(client, cache):
+    return OA.fetch_seoul_rows(client, cache, "SpotInfo", SPOT_FIELDS)
+
+# 수집 함수들을 같은 클라이언트/캐시로 동시에 실행 (실패한 항목은 None)
+async def _fetch_openapi(*fetchers):
+    cache = OA.ResponseCache()
+    async with OA.open_client() as client:
+        results = await asyncio.gather(*(fetcher(client, cache) for fetcher in fetchers), return_exceptions=True)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            print(f"⚠️ OpenAPI 수집 실패: {result}")
+            results[i] = None
+    return results[0] if len(fetchers) == 1 else results
+
+def _save_protection_zone(items):
+    df = pd.DataFrame(items, columns=["FCLTY_TY", "X", "Y"])
+    df["구분"] = df["FCLTY_TY"].astype("string").map(CONST.ZONE_TYPE)
+    df["위도"] = pd.to_numeric(df["Y"], errors="coerce")
+    df["경도"] = pd.to_numeric(df["X"], errors="coerce")
+    df = df[df["구분"].notna() & df["위도"].notna() & df["경도"].notna()]
+    df = df[["구분", "위도", "경도"]].astype({"구분": "string", "위도": "float64", "경도": "float64"})
+
+    output_path = ST.write_table(df.reset_index(drop=True), "./data/external/protection_zone_data")
+    print(f"===> 보호구역 저장 완료: {output_path} ({len(df)}건)")
+
+def _save_traffic_spots(rows):
+    df = pd.DataFrame(rows, columns=SPOT_FIELDS)
+    df["grs80tm_x"] = pd.to_numeric(df["grs80tm_x"], errors="coerce")
+    df["grs80tm_y"] = pd.to_numeric(df["grs80tm_y"], errors="coerce")
+    invalid = df["grs80tm_x"].isna() | df["grs80tm_y"].isna()
+    if invalid.any():
+        print(f"⚠️ 좌표 오류로 {int(invalid.sum())}건 건너뜀")
+    df = df[~invalid]
+    if df.empty:
         print("⚠️ 응답 데이터에 <row> 항목이 없습니다.")
         return
 
-    data = []
-    for row in rows:
-        try:
-            data.append({
-                "지점번호": row.findtext("spot_num"),
-                "지점명": row.findtext("spot_nm"),
-                "grs80tm_x": float(row.findtext("grs80tm_x")),
-                "grs80tm_y": float(row.findtext("grs80tm_y")),
-            })
-        except Exception as e:
-            print(f"⚠️ 일부 데이터 오류로 건너뜀: {e}")
-
-    df = pd.DataFrame(data)
-    
+    df = df.rename(columns={"spot_num": "지점번호", "spot_nm": "지점명"})
     df[["lat", "lng"]] = GU.convert_coordinates(df, "grs80tm_x", "grs80tm_y", "lat", "lng", epsg_from=5181, epsg_to=4326)
-    # transformer = Transformer.from_crs("EPSG:5181", "EPSG:4326", always_xy=True)
-    # df[["lng", "lat"]] = df.apply(
-    #     lambda row: pd.Series(transformer.transform(row["grs80tm_x"], row["grs80tm_y"])),
-    #     axis=1
-    # )
-    df.drop(columns=["grs80tm_x", "grs80tm_y"], inplace=True)
+    df = df[["지점번호", "지점명", "lat", "lng"]].astype(
+        {"지점번호": "string", "지점명": "string", "lat": "float64", "lng": "float64"})
 
     #저장
-    output_path = "./data/external/traffic_spot_data.csv"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df[["지점번호", "지점명", "lat", "lng"]].to_csv(output_path, index=False, encoding="utf-8-sig")
-    print(f"===> 교통량 지점 CSV 저장 완료: {output_path}")
+    output_path = ST.write_table(df.reset_index(drop=True), "./data/external/traffic_spot_data")
+    print(f"===> 교통량 지점 저장 완료: {output_path} ({len(df)}건)")
     
 def merge_traffic_data() -> pd.DataFrame:
     traffic_df = pd.read_csv("./data/raw/traffic_spot_info.csv")
-    spot_df = pd.read_csv("./data/external/traffic_spot_data.csv").drop(columns=["지점명"], errors="ignore")
+    spot_df = ST.read_table("./data/external/traffic_spot_data").drop(columns=["지점명"], errors="ignore")
     traffic_df = pd.concat([traffic_df.reset_index(drop=True), spot_df.reset_index(drop=True)], axis=1)
-    traffic_df.to_csv("./data/raw/traffic_mereg_data.csv", index=False, encoding="utf-8-sig")
-    print("✅ 최종 병합 저장 완료: ./data/raw/traffic_merge_data.csv")
+    output_path = ST.write_table(traffic_df, "./data/raw/traffic_mereg_data")
+    print(f"✅ 최종 병합 저장 완료: {output_path}")
 
 
 if __name__ == "__main__":
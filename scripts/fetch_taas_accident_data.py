@@ -1,9 +1,28 @@
 # TAAS 교통사고 데이터 수집 (Selenium 크롤링)
 # 대상: 서울시 교통사고 정보 (좌표 포함)
+# - get_accident_df: 연도별 드라이버 1개로 자치구를 순차 수집 (기존 방식)
+# - crawl_accident_df: 드라이버 풀이 (연도, 자치구) 작업 큐를 병렬 처리, 작업별 체크포인트 저장
+# - fetch_accident_df_http: 브라우저 없이 selectAccidentInfo.do를 직접 호출 (세션 풀 + 요청 속도 제한)
+#   요청 폼은 추측하지 않고, capture_search_form이 브라우저로 한 번 검색해 캡처한 실제 요청(필드명 / 옵션 값)을 사용
+#
+# 실행: python -m scripts.fetch_taas_accident_data --workers 4
+#       python -m scripts.fetch_taas_accident_data --capture-form   (요청 폼 캡처, 화면이 바뀌었을 때 다시 실행)
+#       python -m scripts.fetch_taas_accident_data --http --workers 8 --rate 5
+#       (로컬 대체 서버) python scripts/dev/taas_stub_server.py --port 8765
+#                        python -m scripts.fetch_taas_accident_data --base-url http://127.0.0.1:8765
 
 import os
 import time
 import json
+import queue
+import random
+import argparse
+import threading
+from functools import lru_cache
+from urllib.parse import urlparse, parse_qsl
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
 import pandas as pd
 from pyproj import Transformer
 
@@ -11,12 +30,19 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
 import scripts.utils.CONSTANTS as CONST
 import scripts.utils.GEO_UTILS as GU
 
+TAAS_URL = "https://taas.koroad.or.kr"
+MAP_PATH = "/gis/mcm/mcl/initMap.do?menuId=GIS_GMP_STS_RSN"
+RESPONSE_KEY = "selectAccidentInfo.do"
+CHECKPOINT_DIR = "./data/cache/taas_checkpoints"
+SEARCH_FORM_PATH = "./data/cache/taas_search_form.json"
+
 def get_accident_df(year_list=CONST.TAAS_YEARS, sigungu_list=CONST.SEOUL_DISTRICTS):
     
     all_data = []
@@ -45,25 +71,192 @@ def get_accident_df(year_list=CONST.TAAS_YEARS, sigungu_list=CONST.SEOUL_DISTRIC
         finally:
             driver.quit()
 
+    return _to_accident_df(all_data)
+
+
+# (연도, 자치구) 작업을 드라이버 풀로 병렬 수집
+# - 응답은 고정 대기 대신 performance 로그에서 selectAccidentInfo.do 로딩 완료를 확인하는 즉시 읽음
+# - 실패 시 지수 백오프로 재시도, 세션이 죽었으면 드라이버를 새로 띄움
+# - 완료된 작업은 checkpoint_dir에 저장되고, 재실행 시 건너뜀 (force=True면 다시 수집)
+def crawl_accident_df(year_list=CONST.TAAS_YEARS, sigungu_list=CONST.SEOUL_DISTRICTS, workers=4,
+                      base_url=TAAS_URL, checkpoint_dir=CHECKPOINT_DIR, max_retries=3, timeout=60,
+                      backoff=2.0, headless=True, force=False):
+    tasks = [(str(year), sigungu) for year in year_list for sigungu in sigungu_list]
+    pending = [task for task in tasks if force or not os.path.exists(_checkpoint_path(checkpoint_dir, *task))]
+    print(f"==> 수집 대상 {len(tasks)}건 중 {len(tasks) - len(pending)}건은 체크포인트 사용, {len(pending)}건 수집")
+
+    task_queue = queue.Queue()
+    for task in pending:
+        task_queue.put(task)
+
+    failed = []
+    progress = {"done": 0, "total": len(pending), "lock": threading.Lock()}
+    threads = [
+        threading.Thread(
+            target=_crawl_worker,
+            args=(task_queue, failed, progress, base_url, checkpoint_dir, max_retries, timeout, backoff, headless),
+            name=f"taas-worker-{i}", daemon=True,
+        )
+        for i in range(min(workers, len(pending)))
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if pending:
+        print(f"==> 수집 소요시간: {time.perf_counter() - start:.1f}s (드라이버 {len(threads)}개)")
+
+    if failed:
+        print(f"⚠️ 수집 실패 {len(failed)}건 (다시 실행하면 실패한 작업만 수집): "
+              + ", ".join(f"{year}년 {sigungu}" for year, sigungu in sorted(failed)))
+
+    all_data = []
+    for year, sigungu in tasks:
+        accidents = _read_checkpoint(checkpoint_dir, year, sigungu)
+        if accidents is None:
+            continue
+        for accident in accidents:
+            accident["year"] = year
+            accident["sigungu"] = sigungu
+        all_data.extend(accidents)
+    return _to_accident_df(all_data)
+
+
+# selectAccidentInfo.do를 브라우저 없이 직접 호출
+# - 요청 폼은 capture_search_form으로 캡처한 실제 요청에서 연도 / 자치구 값만 바꿔서 보냄
+# - 연결을 재사용하는 requests.Session 하나를 워커 스레드들이 공유
+# - rate: 초당 최대 요청 수 (워커 수와 무관하게 전체 기준)
+# - 응답이 오는 대로 해당 배치만 좌표 변환 후 누적 (체크포인트는 crawl_accident_df와 공유)
+def fetch_accident_df_http(year_list=CONST.TAAS_YEARS, sigungu_list=CONST.SEOUL_DISTRICTS, workers=8, rate=5.0,
+                           base_url=TAAS_URL, checkpoint_dir=CHECKPOINT_DIR, max_retries=3, timeout=30,
+                           backoff=1.0, force=False, form_path=SEARCH_FORM_PATH):
+    tasks = [(str(year), sigungu) for year in year_list for sigungu in sigungu_list]
+    form = load_search_form(form_path)
+    unknown = sorted({year for year, _ in tasks if year not in form["year_values"]}
+                     | {sigungu for _, sigungu in tasks if sigungu not in form["sigungu_values"]})
+    if unknown:
+        raise ValueError(f"캡처한 검색 화면에 없는 조건입니다 (--capture-form으로 다시 캡처): {', '.join(unknown)}")
+    frames = {}
+    pending = []
+    for task in tasks:
+        accidents = None if force else _read_checkpoint(checkpoint_dir, *task)
+        if accidents is None:
+            pending.append(task)
+        else:
+            frames[task] = _accident_frame(accidents, *task)
+    print(f"==> 수집 대상 {len(tasks)}건 중 {len(frames)}건은 체크포인트 사용, {len(pending)}건 수집")
+
+    failed = []
+    if pending:
+        start = time.perf_counter()
+        limiter = _RateLimiter(rate)
+        with _http_session(base_url, workers, timeout) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_post_search, session, limiter, base_url, form, year, sigungu, timeout, max_retries,
+                            backoff):
+                    (year, sigungu)
+                for year, sigungu in pending
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                year, sigungu = futures[future]
+                try:
+                    accidents, elapsed = future.result()
+                except Exception as e:
+                    print(f"❌ {year}년 {sigungu} 데이터 수집 실패: {e}")
+                    failed.append((year, sigungu))
+                    continue
+                _write_checkpoint(checkpoint_dir, year, sigungu, accidents)
+                frames[(year, sigungu)] = _accident_frame(accidents, year, sigungu)
+                print(f"  [{done}/{len(pending)}] {year}년 {sigungu} 완료 ({len(accidents)}건, {elapsed:.2f}s)")
+        print(f"==> 수집 소요시간: {time.perf_counter() - start:.1f}s (동시 요청 {workers}개, 초당 {rate}건 제한)")
+
+    if failed:
+        print(f"⚠️ 수집 실패 {len(failed)}건 (다시 실행하면 실패한 작업만 수집): "
+              + ", ".join(f"{year}년 {sigungu}" for year, sigungu in sorted(failed)))
+
+    frames = [frames[task] for task in tasks if task in frames and not frames[task].empty]
+    if not frames:
+        print("==>데이터가 없습니다.")
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    print(f"✅ 총 {len(df)}건의 사고 데이터 수집 완료")
+    return df
+
+
+# 지도 화면에서 검색을 한 번 실행해 selectAccidentInfo.do 요청을 그대로 저장 (fetch_accident_df_http가 사용)
+# - 필드명 / 요청 주소는 추측하지 않고 브라우저가 실제로 보낸 요청에서 가져옴
+# - 연도 / 자치구 필드 = 화면에서 고른 옵션 값이 들어 있는 필드, 옵션 목록(화면 텍스트 → 값)도 함께 저장
+def capture_search_form(year=CONST.TAAS_YEARS[0], sigungu=CONST.SEOUL_DISTRICTS[0], base_url=TAAS_URL,
+                        form_path=SEARCH_FORM_PATH, timeout=60, headless=True):
+    driver = _setup_driver(headless)
+    try:
+        _open_map(driver, base_url, timeout)
+        _submit_conditions(driver, str(year), sigungu, timeout)
+        request = _wait_search_request(driver, timeout)
+        year_values = _option_values(driver, "ptsRafYearStart")
+        sigungu_values = _option_values(driver, "ptsRafSigungu")
+    finally:
+        _quit_driver(driver)
+
+    if request["json"]:
+        fields = list(json.loads(request["body"]).items())
+    else:
+        fields = parse_qsl(request["body"], keep_blank_values=True)
+    year_value, sigungu_value = year_values[str(year)], sigungu_values[sigungu]
+    url = urlparse(request["url"])
+    form = {
+        "path": url.path + (f"?{url.query}" if url.query else ""),
+        "json": request["json"],
+        "fields": fields,
+        "year_fields": sorted({name for name, value in fields if str(value) == year_value}),
+        "sigungu_fields": sorted({name for name, value in fields if str(value) == sigungu_value}),
+        "year_values": year_values,
+        "sigungu_values": sigungu_values,
+    }
+    if not form["year_fields"] or not form["sigungu_fields"]:
+        raise RuntimeError(f"{RESPONSE_KEY} 요청에서 연도/자치구 필드를 찾지 못했습니다: {fields}")
+
+    os.makedirs(os.path.dirname(form_path) or ".", exist_ok=True)
+    with open(form_path, "w", encoding="utf-8") as f:
+        json.dump(form, f, ensure_ascii=False, indent=2)
+    print(f"✅ 검색 요청 폼 저장 완료: {form_path} (연도 {form['year_fields']}, 자치구 {form['sigungu_fields']})")
+    return form
+
+
+def load_search_form(form_path=SEARCH_FORM_PATH):
+    if not os.path.exists(form_path):
+        raise FileNotFoundError(f"검색 요청 폼이 없습니다: {form_path} (먼저 --capture-form 실행)")
+    with open(form_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ────────────── 내부 함수 ──────────────
+
+def _to_accident_df(all_data):
     df = pd.DataFrame(all_data)
-    df[["lat", "lng"]] = GU.convert_coordinates(df, "x_crdnt", "y_crdnt", "lat", "lng", epsg_from=5179, epsg_to=4326)
-        
     if df.empty:
         print("==>데이터가 없습니다.")
         return pd.DataFrame()
 
+    df[["lat", "lng"]] = GU.convert_coordinates(df, "x_crdnt", "y_crdnt", "lat", "lng", epsg_from=5179, epsg_to=4326)
     print(f"✅ 총 {len(df)}건의 사고 데이터 수집 완료")
     return df
 
 
-# ────────────── 내부 함수 ──────────────
+# chromedriver 경로는 한 번만 확인 (워커마다 설치 확인 요청을 보내지 않도록)
+@lru_cache(maxsize=1)
+def _driver_path():
+    return ChromeDriverManager().install()
 
-def _setup_driver():
+
+def _setup_driver(headless=True):
     options = Options()
-    options.add_argument("--headless")
+    if headless:
+        options.add_argument("--headless")
     options.add_argument("--disable-gpu")
     options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    return webdriver.Chrome(service=Service(_driver_path()), options=options)
 
 
 def _apply_conditions(driver, year, sigungu):
@@ -101,10 +294,276 @@ def _extract_accident_data(driver):
     raise Exception("❌ 사고 데이터 응답을 찾을 수 없습니다.")
 
 
+def _checkpoint_path(checkpoint_dir, year, sigungu):
+    return os.path.join(checkpoint_dir, f"{year}_{sigungu}.json")
+
+
+def _read_checkpoint(checkpoint_dir, year, sigungu):
+    path = _checkpoint_path(checkpoint_dir, year, sigungu)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["accidents"]
+
+
+def _write_checkpoint(checkpoint_dir, year, sigungu, accidents):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = _checkpoint_path(checkpoint_dir, year, sigungu)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"year": year, "sigungu": sigungu, "count": len(accidents), "accidents": accidents}, f,
+                  ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# 워커 스레드: 드라이버 1개를 유지하며 큐가 빌 때까지 작업 처리
+def _crawl_worker(task_queue, failed, progress, base_url, checkpoint_dir, max_retries, timeout, backoff, headless):
+    driver = None
+    needs_reload = True
+    try:
+        while True:
+            try:
+                year, sigungu = task_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            for attempt in range(max_retries + 1):
+                try:
+                    if driver is None:
+                        driver = _setup_driver(headless)
+                        needs_reload = True
+                    if needs_reload:
+                        _open_map(driver, base_url, timeout)
+                        needs_reload = False
+
+                    start = time.perf_counter()
+                    _submit_conditions(driver, year, sigungu, timeout)
+                    accidents = _wait_accident_response(driver, timeout)
+                    _write_checkpoint(checkpoint_dir, year, sigungu, accidents)
+
+                    with progress["lock"]:
+                        progress["done"] += 1
+                        done = progress["done"]
+                    print(f"  [{done}/{progress['total']}] {year}년 {sigungu} 완료 "
+                          f"({len(accidents)}건, {time.perf_counter() - start:.1f}s)")
+                    break
+
+                except Exception as e:
+                    needs_reload = True
+                    if not _driver_alive(driver):
+                        _quit_driver(driver)
+                        driver = None
+                    if attempt == max_retries:
+                        print(f"❌ {year}년 {sigungu} 데이터 수집 실패: {e}")
+                        failed.append((year, sigungu))
+                        break
+                    delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+                    print(f"  ↘︎ {year}년 {sigungu} 재시도 {attempt + 1}/{max_retries} ({delay:.1f}s 후): {e}")
+                    time.sleep(delay)
+    finally:
+        _quit_driver(driver)
+
+
+def _driver_alive(driver):
+    if driver is None:
+        return False
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _quit_driver(driver):
+    if driver is None:
+        return
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _open_map(driver, base_url, timeout):
+    driver.get(base_url.rstrip("/") + MAP_PATH)
+    WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.ID, "menuPartSearch")))
+
+
+# 옵션 목록이 채워질 때까지 기다린 뒤 선택 (시도 선택 후 시군구 목록은 비동기로 채워짐)
+def _select_when_ready(wait, element_id, text):
+    def ready(driver):
+        select = Select(driver.find_element(By.ID, element_id))
+        return select if any(option.text == text for option in select.options) else False
+    wait.until(ready).select_by_visible_text(text)
+
+
+# _apply_conditions와 같은 조건을 고정 sleep 없이 입력하고 검색 실행
+def _submit_conditions(driver, year, sigungu, timeout):
+    wait = WebDriverWait(driver, timeout)
+    wait.until(EC.element_to_be_clickable((By.ID, "menuPartSearch"))).click()
+    wait.until(EC.visibility_of_element_located((By.ID, "ptsRafYearStart")))
+
+    _select_when_ready(wait, "ptsRafYearStart", year)
+    _select_when_ready(wait, "ptsRafYearEnd", year)
+    _select_when_ready(wait, "ptsRafSido", "서울특별시")
+    _select_when_ready(wait, "ptsRafSigungu", sigungu)
+
+    for value in ["01", "02", "03", "04"]:
+        checkbox = driver.find_element(By.CSS_SELECTOR, f'input[name="ACDNT_GAE_CODE"][value="{value}"]')
+        if not checkbox.is_selected():
+            checkbox.click()
+
+    # 이전 검색의 응답 이벤트가 섞이지 않도록 로그를 비운 뒤 검색
+    driver.get_log("performance")
+    wait.until(EC.element_to_be_clickable((By.CLASS_NAME, "btn-search"))).click()
+
+
+# performance 로그를 짧게 폴링하며 selectAccidentInfo.do 응답 로딩 완료를 기다림
+def _wait_accident_response(driver, timeout, poll=0.2):
+    deadline = time.monotonic() + timeout
+    request_id = None
+    finished = set()
+    while time.monotonic() < deadline:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.responseReceived" and RESPONSE_KEY in params.get("response", {}).get("url", ""):
+                status = params["response"].get("status", 200)
+                if status >= 400:
+                    raise RuntimeError(f"{RESPONSE_KEY} 응답 오류 (HTTP {status})")
+                request_id = params["requestId"]
+            elif method == "Network.loadingFinished":
+                finished.add(params.get("requestId"))
+            elif method == "Network.loadingFailed" and params.get("requestId") == request_id:
+                raise RuntimeError(f"{RESPONSE_KEY} 로딩 실패: {params.get('errorText')}")
+
+        if request_id is not None and request_id in finished:
+            resp_body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            return json.loads(resp_body["body"])["resultValue"]["accidentInfoList"]
+        time.sleep(poll)
+    raise TimeoutError(f"{RESPONSE_KEY} 응답 대기 시간 초과 ({timeout}s)")
+
+
+# performance 로그에서 selectAccidentInfo.do 요청(주소 / 본문) 찾기
+def _wait_search_request(driver, timeout, poll=0.2):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            params = message.get("params", {})
+            request = params.get("request", {})
+            if message.get("method") != "Network.requestWillBeSent" or RESPONSE_KEY not in request.get("url", ""):
+                continue
+            body = request.get("postData")
+            if body is None and request.get("hasPostData"):
+                body = driver.execute_cdp_cmd("Network.getRequestPostData", {"requestId": params["requestId"]})["postData"]
+            content_type = next((v for k, v in request.get("headers", {}).items() if k.lower() == "content-type"), "")
+            return {"url": request["url"], "body": body or "", "json": "json" in content_type}
+        time.sleep(poll)
+    raise TimeoutError(f"{RESPONSE_KEY} 요청 대기 시간 초과 ({timeout}s)")
+
+
+# select 요소의 옵션 (화면 텍스트 → 값)
+def _option_values(driver, element_id):
+    select = Select(driver.find_element(By.ID, element_id))
+    return {option.text: option.get_attribute("value") for option in select.options if option.get_attribute("value")}
+
+
+# 응답 1건(연도, 자치구) 단위로 좌표 변환
+def _accident_frame(accidents, year, sigungu):
+    df = pd.DataFrame(accidents)
+    if df.empty:
+        return df
+    df["year"] = year
+    df["sigungu"] = sigungu
+    df["lat"], df["lng"] = GU.transform_coordinates(df["x_crdnt"], df["y_crdnt"], epsg_from=5179, epsg_to=4326)
+    return df
+
+
+# 워커 스레드 전체가 공유하는 초당 요청 수 제한
+class _RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def _http_session(base_url, workers, timeout):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    map_url = base_url.rstrip("/") + MAP_PATH
+    session.headers.update({"Referer": map_url, "X-Requested-With": "XMLHttpRequest"})
+    # 지도 화면을 한 번 열어 세션 쿠키를 받아 둠
+    session.get(map_url, timeout=timeout)
+    return session
+
+
+# 캡처한 요청 폼에서 연도 / 자치구 값만 바꾼 폼 (나머지 필드는 캡처한 값 그대로, 반복 필드 순서 유지)
+def _search_form(form, year, sigungu):
+    values = {name: form["year_values"][year] for name in form["year_fields"]}
+    values.update({name: form["sigungu_values"][sigungu] for name in form["sigungu_fields"]})
+    return [(name, values.get(name, value)) for name, value in form["fields"]]
+
+
+# 검색 요청 1건 (429/5xx/연결 오류는 지수 백오프로 재시도)
+def _post_search(session, limiter, base_url, form, year, sigungu, timeout, max_retries, backoff):
+    url = base_url.rstrip("/") + form["path"]
+    fields = _search_form(form, year, sigungu)
+    body = {"json": dict(fields)} if form["json"] else {"data": fields}
+    for attempt in range(max_retries + 1):
+        limiter.wait()
+        start = time.perf_counter()
+        try:
+            resp = session.post(url, timeout=timeout, **body)
+            if resp.status_code == 429 or resp.status_code >= 500:
+                raise requests.HTTPError(f"HTTP {resp.status_code}", response=resp)
+            resp.raise_for_status()
+            return resp.json()["resultValue"]["accidentInfoList"], time.perf_counter() - start
+        except (requests.RequestException, ValueError, KeyError) as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+            print(f"  ↘︎ {year}년 {sigungu} 재시도 {attempt + 1}/{max_retries} ({delay:.1f}s 후): {e}")
+            time.sleep(delay)
+
+
 # ────────────── 테스트 실행 ──────────────
 
 if __name__ == "__main__":
-    df = get_accident_df()
+    parser = argparse.ArgumentParser(description="TAAS 교통사고 데이터 수집")
+    parser.add_argument("--years", nargs="+", default=CONST.TAAS_YEARS)
+    parser.add_argument("--workers", type=int, default=4, help="동시에 띄울 드라이버 수 (--http: 동시 요청 수)")
+    parser.add_argument("--http", action="store_true", help="브라우저 없이 직접 요청")
+    parser.add_argument("--rate", type=float, default=5.0, help="--http 초당 최대 요청 수")
+    parser.add_argument("--base-url", default=TAAS_URL, help="로컬 대체 서버 주소 등")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+    parser.add_argument("--force", action="store_true", help="체크포인트를 무시하고 다시 수집")
+    parser.add_argument("--sequential", action="store_true", help="기존 순차 수집 방식 사용")
+    parser.add_argument("--capture-form", action="store_true", help="브라우저로 검색 요청 폼을 캡처해 저장하고 종료")
+    parser.add_argument("--search-form", default=SEARCH_FORM_PATH, help="--http가 사용할 검색 요청 폼")
+    args = parser.parse_args()
+
+    if args.capture_form:
+        capture_search_form(args.years[0], base_url=args.base_url, form_path=args.search_form)
+        raise SystemExit(0)
+    if args.sequential:
+        df = get_accident_df(args.years)
+    elif args.http:
+        df = fetch_accident_df_http(args.years, workers=args.workers, rate=args.rate, base_url=args.base_url,
+                                    checkpoint_dir=args.checkpoint_dir, force=args.force, form_path=args.search_form)
+    else:
+        df = crawl_accident_df(args.years, workers=args.workers, base_url=args.base_url,
+                               checkpoint_dir=args.checkpoint_dir, force=args.force)
     os.makedirs("data", exist_ok=True)
     df.to_csv("data/accident_info_list.csv", index=False, encoding="utf-8-sig")
     print("✅ accident_info_list.csv 저장 완료")
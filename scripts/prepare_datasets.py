@@ -3,132 +3,243 @@ import os
 import numpy as np
 import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
-from pathlib import Path
-from sklearn.neighbors import BallTree
 from sklearn.cluster import DBSCAN
 import utils.GEO_UTILS as GU
 import utils.CONSTANTS as CONST
+import utils.INDEX_CACHE as IC
+import utils.STORAGE as ST
+import utils.ACCIDENT_STORE as AS
+import utils.ROAD_NETWORK as RN
+import utils.GRID_TILES as GT
+import utils.PROFILING as PF
 
+# 입력/출력 경로 (확장자는 STORAGE가 결정)
+ACCIDENT_PATH = "./data/raw/all_accident_info_{year}"
+VELOCITY_PATH = "./data/raw/{year}velocity.csv"
+TRAFFIC_PATH = "./data/raw/traffic_mereg_data"
+PROCESSED_DIR = "./data/processed"
 
-def process_traffic_volume_combined(accident_df: pd.DataFrame, year: int) -> pd.DataFrame:
-    traffic_df = pd.read_csv("./data/raw/traffic_mereg_data.csv")
+# 교통량 지점 데이터 → (지점 × 연도) 교통량 행렬
+# - 연도 컬럼은 4자리 숫자 컬럼명으로 자동 인식
+# - 값이 없는 연도는 같은 지점의 다른 연도 평균으로 미리 채워 둠
+# - 마지막 열은 전체 연도 평균 (교통량 데이터에 없는 사고연도용)
+def build_traffic_volume_matrix(traffic_df):
+    years = [c for c in traffic_df.columns if str(c).isdigit() and len(str(c)) == 4]
+    volume = traffic_df[years].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
 
-    print(f"=> {year}년 사고 + 교통량 병합 중...")
+    observed = ~np.isnan(volume)
+    total = np.nansum(volume, axis=1, keepdims=True)
+    count = observed.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fallback = (total - np.where(observed, volume, 0)) / (count - observed)
+        all_years_mean = total / count
+
+    matrix = np.hstack([np.where(observed, volume, fallback), all_years_mean])
+    return [int(y) for y in years], matrix
+
+# 교통량 지점 검색 반경 기본값 (km)
+TRAFFIC_MAX_DISTANCE_KM = 2.0
+
+# 교통량 지점 인덱스 + (지점 × 연도) 교통량 행렬
+def load_traffic_spots():
+    years, volume = build_traffic_volume_matrix(ST.read_table(TRAFFIC_PATH))
+    index = IC.load_layer_index(TRAFFIC_PATH, lat_col="lat", lng_col="lng")
+    return {"index": index, "years": years, "volume": volume}
 
-    traffic_coords = traffic_df[["lat", "lng", "2021", "2022", "2023"]].copy()
-    acc_coords = accident_df[["lat", "lng"]].values
-    acc_years = accident_df["acdnt_year"].astype(str).values
+# 사고 지점별 교통량 매칭
+# - k=1: 최근접 교통량 지점의 해당 연도 교통량
+# - k>1: max_distance_km 이내 k개 지점의 역거리 가중(IDW) 평균
+# spots: load_traffic_spots() 결과 (타일 처리 시 타일 주변 지점만 담은 것), 없으면 파일에서 읽음
+def process_traffic_volume_combined(accident_df: pd.DataFrame, year: int,
+                                    max_distance_km: float = TRAFFIC_MAX_DISTANCE_KM, k: int = 1, power: float = 2,
+                                    spots=None) -> pd.DataFrame:
+    spots = load_traffic_spots() if spots is None else spots
 
-    tree = BallTree(np.radians(traffic_coords[["lat", "lng"]].values), metric='haversine')
-    distances, indices = tree.query(np.radians(acc_coords), k=1)
+    print(f"=> {year}년 사고 + 교통량 병합 중...")
 
-    distances_km = distances.flatten() * 6371
-    indices = indices.flatten()
+    years, volume = spots["years"], spots["volume"]
+    acc_years = pd.to_numeric(accident_df["acdnt_year"], errors="coerce")
+    year_pos = pd.Index(years).get_indexer(acc_years)
+    year_pos[year_pos < 0] = len(years)
 
-    traffic_values = []
-    for i, dist in enumerate(distances_km):
-        year_str = acc_years[i]
-        if dist > 2.0:
-            traffic_values.append(np.nan)
-            continue
+    spot_index = spots["index"]
+    acc_lat = accident_df["lat"].to_numpy(dtype="float64")
+    acc_lng = accident_df["lng"].to_numpy(dtype="float64")
+    search_m = max_distance_km * 1000
 
-        nearest = traffic_coords.iloc[indices[i]]
-        val = nearest[year_str]
-        if pd.isna(val):
-            fallback = [y for y in ["2021", "2022", "2023"] if y != year_str]
-            val = pd.to_numeric(nearest[fallback], errors='coerce').mean()
-        traffic_values.append(val)
+    if k == 1:
+        _, rows = spot_index.nearest(acc_lat, acc_lng, search_m=search_m)
+        found = rows >= 0
+        traffic_values = np.full(len(accident_df), np.nan)
+        traffic_values[found] = volume[rows[found], year_pos[found]]
+    else:
+        distances, rows = spot_index.k_nearest(acc_lat, acc_lng, k, search_m=search_m)
+        values = volume[np.maximum(rows, 0), year_pos[:, None]]
+        usable = (rows >= 0) & ~np.isnan(values)
+        weights = np.where(usable, 1 / np.maximum(np.nan_to_num(distances), 1.0) ** power, 0)
+        weight_sum = weights.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            traffic_values = (weights * np.where(usable, values, 0)).sum(axis=1) / weight_sum
 
     accident_df["traffic_volume"] = traffic_values
     return accident_df
 
-def run_all_processing_steps(year):
-    print(f"==> {year}년 데이터 통합 처리 시작...\n")
+# 차로수 문자열("3", "2~4") → 평균 차로수 (형식이 다르면 NaN)
+def parse_lanes(series):
+    parts = series.astype("string").str.extract(r"^\s*(\d+)\s*(?:~\s*(\d+))?\s*$").astype("float64")
+    return np.round(parts.mean(axis=1))
 
-    accident_path = f"./data/raw/all_accident_info_{year}.csv"
-    accident_df = pd.read_csv(accident_path)
+# 사고 발생 시간대(occrrnc_time_code)별 속도 컬럼
+# 오전(7~9시) / 낮(12~13시) / 오후(17~19시), 그 외는 전일 평균
+VELOCITY_BANDS = {(6, 10): "오전", (11, 14): "낮", (16, 20): "오후"}
+VELOCITY_DEFAULT_BAND = "전일"
 
-    # 1. 횡단보도 존재유무 컬럼병합
-    crosswalk_df = pd.read_csv("./data/external/crosswalk_data.csv")
-    accident_df = GU.mark_zone_proximity_common(
-        accident_df, crosswalk_df,
-        zone_lat_col="위도", zone_lng_col="경도",
-        output_col="near_crosswalk",
-        radius_m=10, buffer_m=10
-    )
+# 도로별 속도 CSV 정제 → 도로명당 1행
+# 같은 도로명이 여러 구간으로 나뉘어 있으면 하나로 합침 (사고 행이 불어나지 않도록)
+#   - 연장(lengths): 구간 연장 합계
+#   - 차로수(lanes): 구간 차로수의 중앙값
+#   - 시간대별 속도: 연장 가중 평균 (연장이 없으면 단순 평균)
+def load_velocity_table(path):
+    df = pd.read_csv(path)
+    df = df[df["도로명"].notna() & (df["도로명"].str.strip() != "")]
 
-    # 2. 신호등 존재유무 컬럼병합
-    light_df = pd.read_csv("./data/external/traffic_light_data.csv")
-    accident_df = GU.mark_zone_proximity_common(
-        accident_df, light_df,
-        zone_lat_col="위도", zone_lng_col="경도",
-        output_col="near_traffic_light",
-        radius_m=10, buffer_m=10
-    )
+    road = df["도로명"].str.replace(" ", "").str.strip()
+    lanes = parse_lanes(df["차로수"])
+    lengths = pd.to_numeric(df["연장"].astype("string").str.replace(",", ""), errors="coerce")
 
-    # 2. 보호구역 존재유무 컬럼 병합
-    zone_df = pd.read_csv("./data/external/protection_zone_data.csv")
-    for zone_type, col_name in CONST.ZONE_COLUMNS.items():
-        sub_df = zone_df[zone_df["구분"] == zone_type]
-        accident_df = GU.mark_zone_proximity_common(
-            accident_df, sub_df,
-            zone_lat_col="위도", zone_lng_col="경도",
-            output_col=col_name,
-            radius_m=300, buffer_m=100
-        )
-
-    # 3. 도로명, 차로수 컬럼 정제 / 속도 정보 추가
-    def refine(df):
-        df = df[df["도로명"].notna() & (df["도로명"].str.strip() != "")]
-        df["도로명"] = df["도로명"].str.replace(" ", "").str.strip()
-        
-        def parse_lanes(val):
-            try:
-                parts = str(val).strip().split("~")
-                nums = list(map(int, parts))
-                return round(sum(nums) / len(nums))
-            except:
-                return np.nan
-
-        df["차로수"] = df["차로수"].apply(parse_lanes)
-        return df
-
-    def pick_velocity(row):
-        code = row["occrrnc_time_code"]
-        return (
-            row["오전"] if 6 < code < 10 else
-            row["낮"] if 11 < code < 14 else
-            row["오후"] if 16 < code < 20 else
-            row["전일"]
-        )
-
-    velocity_df = refine(pd.read_csv(f"./data/raw/{year}velocity.csv"))
-    merged_velocity = pd.merge(accident_df, velocity_df, how="inner", left_on="route_nm", right_on="도로명")
-    merged_velocity["lanes"] = merged_velocity["차로수"]
-    merged_velocity["lengths"] = pd.to_numeric(merged_velocity["연장"].str.replace(",", ""), errors="coerce")
-    merged_velocity["velocity"] = merged_velocity.apply(pick_velocity, axis=1)
-    accident_df = pd.merge(
-        accident_df,
-        merged_velocity[["acdnt_no", "lanes", "lengths", "velocity"]],
-        how="left",
-        on="acdnt_no"
+    bands = list(VELOCITY_BANDS.values()) + [VELOCITY_DEFAULT_BAND]
+    speeds = df[bands].apply(pd.to_numeric, errors="coerce")
+    weights = speeds.notna().mul(lengths.fillna(0), axis=0)
+    weighted_sum = speeds.mul(weights).groupby(road).sum()
+    weight_sum = weights.groupby(road).sum()
+    road_speeds = (weighted_sum / weight_sum).where(weight_sum > 0, speeds.groupby(road).mean())
+
+    road_df = pd.DataFrame({
+        "lanes": np.round(lanes.groupby(road).median()),
+        "lengths": lengths.groupby(road).sum(min_count=1),
+    }).join(road_speeds)
+    road_df.index.name = "도로명"
+    return road_df.reset_index()
+
+def pick_velocity(time_code, speed_df):
+    code = pd.to_numeric(time_code, errors="coerce").to_numpy(dtype="float64")
+    conditions = [(low < code) & (code < high) for low, high in VELOCITY_BANDS]
+    choices = [speed_df[band].to_numpy(dtype="float64") for band in VELOCITY_BANDS.values()]
+    return np.select(conditions, choices, default=speed_df[VELOCITY_DEFAULT_BAND].to_numpy(dtype="float64"))
+
+# 사고 지점 → 최근접 도로 구간 (link_id, 구간까지 거리 link_dist_m / 허용 거리 밖이면 결측)
+# 스냅된 구간의 도로명(공백 제거)도 함께 반환
+def snap_road_links(accident_df, network, max_distance_m=RN.SNAP_M):
+    lat = pd.to_numeric(accident_df["lat"], errors="coerce").to_numpy(dtype="float64")
+    lng = pd.to_numeric(accident_df["lng"], errors="coerce").to_numpy(dtype="float64")
+    positions, distances = network.snap(lat, lng, max_distance_m)
+    accident_df["link_id"] = network.link_ids(positions)
+    accident_df["link_dist_m"] = np.round(distances, 2)
+    return accident_df, network.link_roads(positions)
+
+# 사고 데이터에 도로명 기준 차로수/연장/속도 병합 (left merge 1회, 사고 건수 유지)
+# link_roads: 스냅된 도로 구간의 도로명, 속도 테이블에 있으면 route_nm 문자열 대신 사용
+def merge_velocity(accident_df, velocity_df, link_roads=None):
+    bands = list(VELOCITY_BANDS.values()) + [VELOCITY_DEFAULT_BAND]
+    road = accident_df["route_nm"].astype("string")
+    if link_roads is not None:
+        link_roads = pd.Series(link_roads, index=accident_df.index, dtype="string")
+        road = link_roads.where(link_roads.isin(velocity_df["도로명"]), road)
+    merged = pd.DataFrame({"road": road.to_numpy()}).merge(
+        velocity_df, how="left", left_on="road", right_on="도로명", validate="many_to_one"
     )
-    
-    # 4. 교통량
-    accident_df = process_traffic_volume_combined(accident_df, year)
+    accident_df = accident_df.drop(columns=["lanes", "lengths", "velocity"], errors="ignore")
+    accident_df["lanes"] = merged["lanes"].to_numpy()
+    accident_df["lengths"] = merged["lengths"].to_numpy()
+    accident_df["velocity"] = pick_velocity(accident_df["occrrnc_time_code"], merged[bands])
+    return accident_df
+
+# 근접성 판단용 기준 레이어 (원본 경로 / 필터 / 결과 컬럼 / 반경)
+REFERENCE_LAYERS = {
+    # 1. 횡단보도 존재유무
+    "crosswalk": {
+        "path": "./data/external/crosswalk_data",
+        "output_col": "near_crosswalk", "radius_m": 10, "buffer_m": 10
+    },
+    # 2. 신호등 존재유무
+    "traffic_light": {
+        "path": "./data/external/traffic_light_data",
+        "output_col": "near_traffic_light", "radius_m": 10, "buffer_m": 10
+    },
+}
+# 3. 보호구역 존재유무 (어린이/노인/장애인)
+for zone_type, col_name in CONST.ZONE_COLUMNS.items():
+    REFERENCE_LAYERS[col_name] = {
+        "path": "./data/external/protection_zone_data", "filter_col": "구분", "filter_val": zone_type,
+        "output_col": col_name, "radius_m": 300, "buffer_m": 100
+    }
+
+# 근접성 판단용 기준 레이어 로드 (연도와 무관하므로 한 번만 생성해 재사용)
+# 원본이 바뀌지 않았으면 디스크 캐시(data/cache/index)에서 바로 읽음
+def load_reference_layers():
+    layers = {}
+    for name, spec in REFERENCE_LAYERS.items():
+        index = IC.load_layer_index(spec["path"], filter_col=spec.get("filter_col"), filter_val=spec.get("filter_val"))
+        layers[name] = {**spec, "index": index}
+    return layers
+
+# 사고 데이터 보강 (근접성 / 속도 / 교통량), 파일 입출력 없음
+# timings: dict를 넘기면 단계별 소요시간(초)을 누적 기록 (PROFILING 기록은 항상 남김)
+# velocity_df / spots / network: 미리 읽어 둔 속도 테이블 / 교통량 지점 / 도로망 (없으면 파일에서 읽음)
+def enrich_accidents(accident_df, year, layers=None, timings=None, velocity_df=None, spots=None, network=None):
+    timings = {} if timings is None else timings
+
+    def timed(stage, func, *args, **kwargs):
+        rows = len(args[0]) if args and isinstance(args[0], pd.DataFrame) else None
+        with PF.measure(stage, year=year, rows=rows) as record:
+            result = func(*args, **kwargs)
+        timings[stage] = timings.get(stage, 0.0) + record["wall_s"]
+        return result
+
+    # 1~2. 횡단보도 / 신호등 / 보호구역 존재유무 컬럼 병합 (사고좌표 1회 변환)
+    if layers is None:
+        layers = timed("load_layers", load_reference_layers)
+    accident_df = timed("proximity", GU.mark_zone_proximity_layers, accident_df, layers)
+
+    # 3. 도로 구간 매칭 (도로망 파일이 있을 때만, 프로세스당 1회 로드)
+    if network is None:
+        network = timed("load_road_network", RN.load_road_network)
+    link_roads = None
+    if network is not None:
+        accident_df, link_roads = timed("road_link", snap_road_links, accident_df, network)
+
+    # 4. 도로명, 차로수 컬럼 정제 / 속도 정보 추가
+    if velocity_df is None:
+        velocity_df = timed("load_velocity", load_velocity_table, VELOCITY_PATH.format(year=year))
+    accident_df = timed("velocity", merge_velocity, accident_df, velocity_df, link_roads)
+
+    # 5. 교통량
+    if spots is None:
+        spots = timed("load_traffic", load_traffic_spots)
+    accident_df = timed("traffic_volume", process_traffic_volume_combined, accident_df, year, spots=spots)
+    return accident_df
+
+def run_all_processing_steps(year, layers=None):
+    print(f"==> {year}년 데이터 통합 처리 시작...\n")
+
+    with PF.measure("read", year=year) as record:
+        accident_df = ST.read_table(ACCIDENT_PATH.format(year=year))
+        record["rows"] = len(accident_df)
+
+    with PF.measure("enrich", year=year, rows=len(accident_df)):
+        accident_df = enrich_accidents(accident_df, year, layers)
 
     # 저장
-    output_path = f"./data/processed/accident_data_{year}.csv"
-    accident_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    with PF.measure("write", year=year, rows=len(accident_df)):
+        output_path = ST.write_table(accident_df, os.path.join(PROCESSED_DIR, f"accident_data_{year}"))
     print(f"====> 최종 저장 완료: {output_path}\n")
     
-def merge_all_years():
+def merge_all_years(years=range(2021, 2024)):
     print("===> 연도별 CSV 전체 병합 중...")
-    base_dir = "./data/processed"
-    file_names = [f"accident_data_{y}.csv" for y in range(2021, 2024)]
+    base_dir = PROCESSED_DIR
+    file_names = [f"accident_data_{y}" for y in years]
     
-    # ⚠️ DtypeWarning 방지: low_memory=False 옵션 추가
-    dfs = [pd.read_csv(os.path.join(base_dir, f), low_memory=False) for f in file_names]
+    dfs = [ST.read_table(os.path.join(base_dir, f)) for f in file_names]
     merged_df = pd.concat(dfs, ignore_index=True)
     
     before_rows = len(merged_df)
@@ -137,47 +248,65 @@ def merge_all_years():
     after_rows = len(merged_df)
     print(f"🚲 '자전거' 운전자 행 제거됨: {before_rows - after_rows}건")
     
-    merged_df.to_csv(os.path.join(base_dir, "accident_data_all.csv"), index=False, encoding="utf-8-sig")
-    print("====> 병합 완료: accident_data_all.csv")    
+    output_path = ST.write_table(merged_df, os.path.join(base_dir, "accident_data_all"))
+    print(f"====> 병합 완료: {output_path}")    
     
     return merged_df
     
+# 최종 분석용으로 남길 컬럼
+FILTER_COLUMNS = [
+    "acdnt_year", "occrrnc_time_code", "legaldong_name", "acdnt_hdc",
+    "lrg_violt_1_dc", "road_stle_dc", "wrngdo_vhcle_asort_dc", "acdnt_age_1_code", #"acdnt_age_1_dc",
+    "rdse_sttus_dc", "road_div", "lat", "lng", "link_id",
+    "near_crosswalk", "near_traffic_light", "near_child_zone",
+    "near_elderly_zone", "near_disabled_zone",
+    "lanes", "lengths", "velocity", "traffic_volume",
+    "elderly_hotspot","non_elderly_hotspot","all_hotspot"
+]
+
 def filter_all_data():
-    base_dir = "./data/processed"
-    merged_file = os.path.join(base_dir, "accident_data_all.csv")
+    base_dir = PROCESSED_DIR
+    merged_file = os.path.join(base_dir, "accident_data_all")
 
-    if not Path(merged_file).exists():
+    if not ST.exists(merged_file):
         print(f"⚠️ 병합 파일이 존재하지 않습니다: {merged_file}")
         return
 
-    df = pd.read_csv(merged_file, low_memory=False)
-
-    # 필요한 컬럼만 선택
-    columns_to_keep = [
-        "acdnt_year", "occrrnc_time_code", "legaldong_name", "acdnt_hdc",
-        "lrg_violt_1_dc", "road_stle_dc", "wrngdo_vhcle_asort_dc", "acdnt_age_1_code", #"acdnt_age_1_dc",
-        "rdse_sttus_dc", "road_div", "lat", "lng",
-        "near_crosswalk", "near_traffic_light", "near_child_zone",
-        "near_elderly_zone", "near_disabled_zone",
-        "lanes", "lengths", "velocity", "traffic_volume",
-        "elderly_hotspot","non_elderly_hotspot","all_hotspot"
-    ]
-    filtered_columns = [col for col in columns_to_keep if col in df.columns]
-    filtered_df = df[filtered_columns]
+    # 필요한 컬럼만 선택 (파일에서 해당 컬럼만 청크 단위로 읽어 압축 저장소로 인코딩)
+    # 다시 파일로 쓰므로 실수 컬럼은 float64로 유지하는 EXACT_SCHEMA 사용
+    available = set(ST.available_columns(merged_file))
+    filtered_columns = [col for col in FILTER_COLUMNS if col in available]
+    store = AS.AccidentStore.load(merged_file, columns=filtered_columns, schema=AS.EXACT_SCHEMA)
+    filtered_df = store.to_frame(filtered_columns)
 
-    # 저장
-    output_path = os.path.join(base_dir, "accident_data_filtered.csv")
-    filtered_df.to_csv(output_path, index=False, encoding="utf-8-sig")
+    # 저장 (대시보드용 CSV도 함께 내보냄)
+    output_path = ST.write_table(filtered_df, os.path.join(base_dir, "accident_data_filtered"), export_csv=True)
     print(f"===> 필터링된 데이터 저장 완료: {output_path}")    
 
 if __name__ == "__main__":
+    report = PF.RunReport("prepare_datasets")
+
     #1. 연도별 사고 데이터 전처리 시작
+    with report.stage("load_layers"):
+        layers = load_reference_layers()
     for year in [2021, 2022, 2023]:
-        run_all_processing_steps(year)
+        with report.stage("year", year=year):
+            run_all_processing_steps(year, layers)
     
     #2. 데이터통합 및 사고다발 구역 컬럼 추가
-    all_df = merge_all_years()
-    GU.assign_hotspot_columns(all_df, lat_col='lat', lon_col='lng', id_col='acdnt_no')
+    with report.stage("merge") as record:
+        all_df = merge_all_years()
+        record["rows"] = len(all_df)
+    with report.stage("hotspot", rows=len(all_df)):
+        GU.assign_hotspot_columns(all_df, lat_col='lat', lon_col='lng', id_col='acdnt_no')
     
     #3. 데이터 필터링
-    filter_all_data()
+    with report.stage("filter"):
+        filter_all_data()
+
+    #4. 대시보드용 격자 칸 집계
+    with report.stage("grid"):
+        GT.build_grid_aggregates()
+
+    report.print_summary()
+    print(f"==> 실행 보고서 저장: {report.save()}")
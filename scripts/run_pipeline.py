@@ -0,0 +1,314 @@
+# 연도별(및 연도 내 자치구별) 사고 데이터 전처리 병렬 실행기
+# - 기준 레이어 인덱스는 부모 프로세스에서 디스크 캐시로 한 번 만들어 두고,
+#   각 워커는 같은 memory-map 파일을 열어 페이지를 공유
+# - 단계별 소요시간 / 진행상황 출력 후 연도별 파일 병합 → hotspot → 필터링까지 수행
+# - 단계 × 연도별 소요시간 / CPU 시간 / 최대 메모리 / 행 수를 실행 보고서로 저장 (utils/PROFILING.py)
+#   PIPELINE_PROFILE=cprofile | sample 이면 단계별 프로파일 파일도 저장
+# - 입력 파일/파라미터가 바뀐 단계만 다시 실행 (--force: 전체 재실행)
+# - --tile-km: 전국 단위용 격자 타일 분할 모드 (사고/기준 레이어를 타일 + halo 단위로 나눠 처리)
+#
+# 실행: python scripts/run_pipeline.py --years 2021 2022 2023 --workers 8
+#       python scripts/run_pipeline.py --tile-km 20 --workers 8
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import prepare_datasets as PD
+import utils.GEO_UTILS as GU
+import utils.GRID_TILES as GT
+import utils.PROFILING as PF
+import utils.ROAD_NETWORK as RN
+import utils.STORAGE as ST
+import utils.STAGE_GRAPH as SG
+import utils.TILES as TL
+
+# 워커 프로세스별 기준 레이어 / 교통량 지점 (initializer에서 1회 로드)
+_LAYERS = None
+_SPOTS = None
+
+# 워커 프로세스별 연도 속도 테이블 (연도당 1회 로드)
+_VELOCITY = {}
+
+
+def _init_worker():
+    global _LAYERS, _SPOTS
+    _LAYERS = PD.load_reference_layers()
+    _SPOTS = PD.load_traffic_spots()
+    RN.load_road_network()
+
+
+# 연도 속도 테이블 (워커 프로세스당 연도별 1회 로드, 파티션 / 타일 작업이 공유)
+def _velocity_table(year):
+    if year not in _VELOCITY:
+        _VELOCITY[year] = PD.load_velocity_table(PD.VELOCITY_PATH.format(year=year))
+    return _VELOCITY[year]
+
+
+# 워커 작업 단위: (연도, 파티션) 사고 데이터 보강, 계측 기록은 결과와 함께 부모로 전달
+def _enrich_part(year, part_name, part_df):
+    timings = {}
+    with PF.measure("enrich", year=year, part=part_name, rows=len(part_df)) as record:
+        result = PD.enrich_accidents(part_df, year, _LAYERS, timings, velocity_df=_velocity_table(year),
+                                     spots=_SPOTS)
+    return year, part_name, result, timings, PF.drain(), record["wall_s"]
+
+
+# 연도 데이터를 자치구(sigungu) 단위로 분할, 컬럼이 없으면 행 수 기준으로 분할
+def split_partitions(accident_df, n_parts, by="sigungu"):
+    if by in accident_df.columns:
+        return [(str(name), part) for name, part in accident_df.groupby(by, sort=False, dropna=False)]
+    bounds = np.linspace(0, len(accident_df), n_parts + 1, dtype=int)
+    return [(f"part{i}", accident_df.iloc[bounds[i]:bounds[i + 1]])
+            for i in range(n_parts) if bounds[i] < bounds[i + 1]]
+
+
+def run_years_parallel(years, workers=None, partition_col="sigungu"):
+    workers = workers or os.cpu_count()
+    total_start = time.perf_counter()
+
+    # 기준 레이어 / 교통량 지점 / 도로망 캐시를 미리 생성 (워커들이 동시에 만들지 않도록)
+    with PF.measure("load_layers") as record:
+        PD.load_reference_layers()
+        PD.load_traffic_spots()
+        RN.load_road_network()
+    print(f"==> 기준 레이어 준비 완료 ({record['wall_s']:.2f}s)")
+
+    parts = {}
+    year_timings = {year: {} for year in years}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = []
+        for year in years:
+            with PF.measure("read", year=year) as record:
+                accident_df = ST.read_table(PD.ACCIDENT_PATH.format(year=year))
+                record["rows"] = len(accident_df)
+            year_timings[year]["read"] = record["wall_s"]
+            for part_name, part_df in split_partitions(accident_df, workers, partition_col):
+                futures.append(pool.submit(_enrich_part, year, part_name, part_df))
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            year, part_name, result, timings, records, elapsed = future.result()
+            parts.setdefault(year, []).append(result)
+            PF.extend(records)
+            for stage, seconds in timings.items():
+                year_timings[year][stage] = year_timings[year].get(stage, 0.0) + seconds
+            print(f"  [{done}/{len(futures)}] {year}년 {part_name} 완료 ({len(result)}건, {elapsed:.2f}s)")
+
+    # 연도별 결과를 원래 행 순서대로 합쳐 저장
+    for year in years:
+        with PF.measure("write", year=year) as record:
+            accident_df = pd.concat(parts.get(year, []), copy=False).sort_index()
+            output_path = ST.write_table(accident_df, os.path.join(PD.PROCESSED_DIR, f"accident_data_{year}"))
+            record["rows"] = len(accident_df)
+        year_timings[year]["write"] = record["wall_s"]
+        print(f"====> {year}년 저장 완료: {output_path} ({len(accident_df)}건)")
+
+    print("\n==> 연도별 단계 소요시간 (초, 워커 합계)")
+    print(pd.DataFrame(year_timings).T.round(2).to_string())
+    print(f"==> 연도별 처리 전체 소요시간: {time.perf_counter() - total_start:.2f}s\n")
+    return year_timings
+
+
+# 타일 주변 기준 지점 좌표로 인덱스 생성 (rows: 원본 레이어 행 위치)
+def _points_index(lat, lng, rows):
+    index = GU.ProximityIndex(lat, lng)
+    index.rows = rows[index.rows]
+    return index
+
+
+# 타일 모드 워커 작업 단위: 타일 소속 사고 + 타일 주변(halo) 기준 레이어/교통량 지점 좌표 / 도로 구간만 전달받음
+# road_links: RoadNetwork.ragged() 배열 (도로망 파일이 없으면 None)
+def _enrich_tile(year, tile_name, part_df, layer_points, spot_points, road_links):
+    timings = {}
+    with PF.measure("enrich", year=year, part=tile_name, rows=len(part_df)) as record:
+        layers = {name: {**spec, "index": _points_index(lat, lng, rows)}
+                  for name, (spec, lat, lng, rows) in layer_points.items()}
+        spot_lat, spot_lng, years, volume = spot_points
+        spots = {"index": GU.ProximityIndex(spot_lat, spot_lng), "years": years, "volume": volume}
+        network = RN.RoadNetwork.from_ragged(*road_links) if road_links is not None else None
+        result = PD.enrich_accidents(part_df, year, layers, timings, velocity_df=_velocity_table(year), spots=spots,
+                                     network=network)
+    return year, tile_name, result, timings, PF.drain(), record["wall_s"]
+
+
+# 사고 / 기준 레이어 / 교통량 지점을 같은 격자(평면 좌표)로 나눠 타일별 병렬 처리
+# - 타일에는 소속 사고와, 타일 경계에서 가장 큰 검색 반경(halo) 안의 기준 지점만 전달 → 워커 메모리 ∝ 타일 크기
+# - halo 안에 검색 반경 내 지점이 모두 들어오므로 결과는 run_years_parallel과 같음
+# - 좌표가 없는 사고는 별도 작업 1개로 처리 (근접성 0 / 교통량 없음, 속도는 도로명 기준)
+# - 도로망도 부모가 한 번 읽고, 타일 + halo 영역에 걸치는 구간만 전달 (워커는 도로망 파일을 읽지 않음)
+#   도로망 파일이 없으면 워커도 파일 확인만 하고 도로명 기준으로 처리
+def run_years_tiled(years, workers=None, tile_m=TL.TILE_SIZE_M):
+    workers = workers or os.cpu_count()
+    total_start = time.perf_counter()
+
+    with PF.measure("load_layers") as record:
+        layers = PD.load_reference_layers()
+        spots = PD.load_traffic_spots()
+        network = RN.load_road_network()
+        halo_m = TL.halo_for(*(spec["radius_m"] + spec["buffer_m"] for spec in layers.values()),
+                             PD.TRAFFIC_MAX_DISTANCE_KM * 1000, RN.SNAP_M)
+        layer_tiles = {name: TL.TiledPoints(*GU.project_xy(layer["index"].lat, layer["index"].lng), tile_m)
+                       for name, layer in layers.items()}
+        spot_index = spots["index"]
+        spot_tiles = TL.TiledPoints(*GU.project_xy(spot_index.lat, spot_index.lng), tile_m)
+    print(f"==> 기준 레이어 타일 분할 완료 (타일 {tile_m / 1000:g}km, halo {halo_m:.0f}m, "
+          f"{record['wall_s']:.2f}s)")
+
+    def tile_points(key):
+        layer_points = {}
+        for name, layer in layers.items():
+            index = layer["index"]
+            spec = {k: v for k, v in layer.items() if k != "index"}
+            idx = layer_tiles[name].around(key, halo_m) if key is not None else np.empty(0, dtype="int64")
+            layer_points[name] = (spec, index.lat[idx], index.lng[idx], index.rows[idx])
+        idx = spot_tiles.around(key, halo_m) if key is not None else np.empty(0, dtype="int64")
+        spot_points = (spot_index.lat[idx], spot_index.lng[idx], spots["years"], spots["volume"][spot_index.rows[idx]])
+        if network is None:
+            return layer_points, spot_points, None
+        links = (network.within_box(spot_tiles.bounds(key, halo_m), GU.HOTSPOT_EPSG) if key is not None
+                 else np.empty(0, dtype="int64"))
+        return layer_points, spot_points, network.ragged(links)
+
+    parts = {}
+    year_timings = {year: {} for year in years}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for year in years:
+            with PF.measure("read", year=year) as record:
+                accident_df = ST.read_table(PD.ACCIDENT_PATH.format(year=year))
+                record["rows"] = len(accident_df)
+            year_timings[year]["read"] = record["wall_s"]
+
+            lat = pd.to_numeric(accident_df["lat"], errors="coerce").to_numpy(dtype="float64")
+            lng = pd.to_numeric(accident_df["lng"], errors="coerce").to_numpy(dtype="float64")
+            accident_tiles = TL.TiledPoints(*GU.project_xy(lat, lng), tile_m)
+            tasks = [(f"tile{key}", accident_tiles.owned(key), key) for key in accident_tiles.tiles()]
+            if len(accident_tiles.missing):
+                tasks.append(("좌표없음", accident_tiles.missing, None))
+            for tile_name, rows, key in tasks:
+                futures.append(pool.submit(_enrich_tile, year, tile_name, accident_df.iloc[rows], *tile_points(key)))
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            year, tile_name, result, timings, records, elapsed = future.result()
+            parts.setdefault(year, []).append(result)
+            PF.extend(records)
+            for stage, seconds in timings.items():
+                year_timings[year][stage] = year_timings[year].get(stage, 0.0) + seconds
+            print(f"  [{done}/{len(futures)}] {year}년 {tile_name} 완료 ({len(result)}건, {elapsed:.2f}s)")
+
+    for year in years:
+        with PF.measure("write", year=year) as record:
+            accident_df = pd.concat(parts.get(year, []), copy=False).sort_index()
+            output_path = ST.write_table(accident_df, os.path.join(PD.PROCESSED_DIR, f"accident_data_{year}"))
+            record["rows"] = len(accident_df)
+        year_timings[year]["write"] = record["wall_s"]
+        print(f"====> {year}년 저장 완료: {output_path} ({len(accident_df)}건)")
+
+    print("\n==> 연도별 단계 소요시간 (초, 워커 합계)")
+    print(pd.DataFrame(year_timings).T.round(2).to_string())
+    print(f"==> 연도별 타일 처리 전체 소요시간: {time.perf_counter() - total_start:.2f}s\n")
+    return year_timings
+
+
+# 증분 실행용 단계 그래프: 연도별 처리 → 병합 → hotspot → 필터링
+def build_stage_graph(years):
+    graph = SG.StageGraph()
+    layer_inputs = sorted({spec["path"] for spec in PD.REFERENCE_LAYERS.values()})
+    year_params = {
+        "layers": PD.REFERENCE_LAYERS,
+        "velocity_bands": [[list(k), v] for k, v in PD.VELOCITY_BANDS.items()],
+        "road_snap_m": RN.SNAP_M,
+    }
+    for year in years:
+        graph.add(
+            f"year_{year}",
+            inputs=[PD.ACCIDENT_PATH.format(year=year), PD.VELOCITY_PATH.format(year=year),
+                    PD.TRAFFIC_PATH, *layer_inputs, *RN.source_files()],
+            outputs=[os.path.join(PD.PROCESSED_DIR, f"accident_data_{year}")],
+            params=year_params,
+        )
+
+    all_path = os.path.join(PD.PROCESSED_DIR, "accident_data_all")
+    graph.add("merge", deps=[f"year_{y}" for y in years], outputs=[all_path], params={"years": list(years)})
+    graph.add("hotspot", deps=["merge"], outputs=[all_path], params=GU.HOTSPOT_COHORTS)
+    graph.add("filter", deps=["hotspot"], outputs=[os.path.join(PD.PROCESSED_DIR, "accident_data_filtered")],
+              params={"columns": PD.FILTER_COLUMNS})
+    graph.add("grid", deps=["filter"], outputs=[GT.grid_path(size) for size in GT.cell_sizes()],
+              params={"cell_sizes": GT.cell_sizes(), "elderly_age": GT.ELDERLY_AGE})
+    return graph
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="연도별 사고 데이터 병렬 전처리")
+    parser.add_argument("--years", nargs="+", type=int, default=[2021, 2022, 2023])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--skip-merge", action="store_true", help="연도별 처리만 수행")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 상관없이 전체 재실행")
+    parser.add_argument("--tile-km", type=float, default=None, help="격자 타일 분할 모드의 타일 크기 (km)")
+    args = parser.parse_args()
+
+    graph = build_stage_graph(args.years)
+    stale = graph.plan(force=args.force)
+    print(f"==> 재실행 단계: {', '.join(stale) if stale else '없음 (모두 최신)'}")
+    report = PF.RunReport("run_pipeline", params={**vars(args), "stale": stale})
+
+    # 다시 실행한 단계가 없으면 보고서를 남기지 않음 (실행 간 비교 대상이 아님)
+    def finish():
+        if not stale:
+            return
+        report.print_summary()
+        print(f"==> 실행 보고서 저장: {report.save()}")
+
+    #1. 연도별 사고 데이터 전처리 (변경된 연도만, 병렬)
+    stale_years = [year for year in args.years if f"year_{year}" in stale]
+    tile_m = args.tile_km * 1000 if args.tile_km else None
+    if stale_years and tile_m:
+        with report.stage("years"):
+            run_years_tiled(stale_years, args.workers, tile_m)
+    elif stale_years:
+        with report.stage("years"):
+            run_years_parallel(stale_years, args.workers)
+    for year in stale_years:
+        graph.mark_done(f"year_{year}")
+    if args.skip_merge:
+        finish()
+        sys.exit(0)
+
+    #2. 데이터통합 및 사고다발 구역 컬럼 추가
+    all_df = None
+    if "merge" in stale:
+        with report.stage("merge") as record:
+            all_df = PD.merge_all_years(args.years)
+            record["rows"] = len(all_df)
+        graph.mark_done("merge")
+        print(f"==> 병합 소요시간: {record['wall_s']:.2f}s")
+
+    if "hotspot" in stale:
+        with report.stage("hotspot") as record:
+            if all_df is None:
+                all_df = ST.read_table(os.path.join(PD.PROCESSED_DIR, "accident_data_all"))
+            record["rows"] = len(all_df)
+            GU.assign_hotspot_columns(all_df, lat_col='lat', lon_col='lng', id_col='acdnt_no',
+                                      tile_m=tile_m, workers=args.workers)
+        graph.mark_done("hotspot")
+        print(f"==> hotspot 소요시간: {record['wall_s']:.2f}s")
+
+    #3. 데이터 필터링
+    if "filter" in stale:
+        with report.stage("filter"):
+            PD.filter_all_data()
+        graph.mark_done("filter")
+
+    #4. 대시보드용 격자 칸 집계
+    if "grid" in stale:
+        with report.stage("grid") as record:
+            GT.build_grid_aggregates()
+        graph.mark_done("grid")
+        print(f"==> 격자 집계 소요시간: {record['wall_s']:.2f}s")
+
+    finish()
@@ -0,0 +1,115 @@
+# 새 사고 배치(월별 TAAS 등)로 hotspot 컬럼 증분 갱신
+# - 배치는 run_all_processing_steps와 같은 전처리를 거친 사고 행이어야 함
+# - 배치마다 누적 데이터를 다시 읽거나 쓰지 않음 (비용은 배치 크기에 비례)
+#   · 배치 행은 data/processed/accident_batches/ 에 조각 파일로 추가 (accident_data_all 뒤에 이어지는 행)
+#   · 이번 배치로 바뀐 행 / 군집은 hotspot_changes / hotspot_centers_changed 에 저장
+#     흡수된 군집은 merged_into에 흡수한 군집 번호가 있으므로, 기존 행의 군집 번호는 이를 따라가 최신 중심을 찾음
+#   · 군집 상태(data/cache/hotspot_state)는 메모리 맵으로 열어 바뀐 부분만 기록
+# - --compact: 배치 조각을 accident_data_all에 합치고 hotspot 컬럼을 최신 값으로 다시 씀 (전체 재작성, 필요할 때만)
+# - 저장된 군집 상태가 없거나 accident_data_all / 배치 조각과 맞지 않으면 전체를 한 번 다시 생성
+#
+# 실행: python scripts/update_hotspots.py data/processed/accident_batch_202401.parquet
+#       python scripts/update_hotspots.py --compact
+import sys
+import os
+import time
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+import pandas as pd
+
+import utils.GEO_UTILS as GU
+import utils.STORAGE as ST
+import utils.HOTSPOT_STREAM as HS
+
+ALL_PATH = "./data/processed/accident_data_all"
+BATCH_DIR = "./data/processed/accident_batches"
+CHANGES_PATH = "./data/processed/hotspot_changes"
+CENTERS_PATH = "./data/processed/hotspot_centers_changed"
+
+HOTSPOT_COLUMNS = [c for prefix in GU.HOTSPOT_COHORTS for c in GU.hotspot_columns(prefix)]
+
+
+# 상태를 만든 accident_data_all 버전 (파일 크기 / 수정 시각)
+def source_version():
+    path = ST.resolve(ALL_PATH)
+    stat = os.stat(path)
+    return {"path": os.path.basename(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+# 아직 accident_data_all에 합치지 않은 배치 조각 (추가된 순서)
+def batch_parts():
+    if not os.path.isdir(BATCH_DIR):
+        return []
+    stems = {os.path.splitext(name)[0] for name in os.listdir(BATCH_DIR) if name.endswith((ST.PARQUET, ST.CSV))}
+    return [os.path.join(BATCH_DIR, stem) for stem in sorted(stems)]
+
+
+# accident_data_all + 배치 조각 (행 순서 = 상태의 행 번호)
+def read_all_rows(columns=None):
+    frames = [ST.read_table(path, columns=columns) for path in [ALL_PATH, *batch_parts()]]
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_state(id_col="acdnt_no"):
+    state = HS.HotspotState.load()
+    parts = batch_parts()
+    if state is not None and state.meta.get("source") == source_version() and state.meta.get("parts") == len(parts):
+        return state
+
+    print("==> hotspot 상태가 없거나 데이터와 맞지 않아 전체 재생성 중...")
+    start = time.perf_counter()
+    df_all = read_all_rows(columns=["lat", "lng", "acdnt_age_1_code", id_col])
+    state = HS.HotspotState.build(df_all, id_col=id_col)
+    state.meta = {"source": source_version(), "parts": len(parts)}
+    state.save()
+    print(f"==> 상태 생성 완료 ({len(df_all)}건, {time.perf_counter() - start:.2f}s)")
+    return state
+
+
+def update_hotspots(batch_path, id_col="acdnt_no"):
+    batch_df = ST.read_table(batch_path)
+    batch_df = batch_df.drop(columns=[c for c in HOTSPOT_COLUMNS if c in batch_df.columns])
+    state = load_state(id_col)
+
+    start = time.perf_counter()
+    changes, centers = state.insert(batch_df, id_col=id_col)
+    print(f"==> 배치 {len(batch_df)}건 반영: 변경 행 {len(changes)}건, 갱신 군집 {len(centers)}개 "
+          f"({time.perf_counter() - start:.2f}s)")
+
+    # 조각 파일을 먼저 쓰고 상태를 저장 (중간에 실패하면 상태가 clean이 아니므로 다음 실행에서 재생성)
+    state.meta["parts"] += 1
+    part_path = ST.write_table(batch_df, os.path.join(BATCH_DIR, f"part_{state.meta['parts']:05d}"))
+    ST.write_table(changes, CHANGES_PATH)
+    ST.write_table(centers, CENTERS_PATH)
+    state.save()
+    print(f"====> hotspot 증분 갱신 저장 완료: {part_path}")
+    return changes, centers
+
+
+# 배치 조각을 accident_data_all에 합치고 전체 hotspot 컬럼을 최신 값으로 저장
+def compact_hotspots(id_col="acdnt_no"):
+    state = load_state(id_col)
+    df_all = read_all_rows()
+    df_all = df_all.drop(columns=[c for c in HOTSPOT_COLUMNS if c in df_all.columns])
+    df_all = pd.concat([df_all, pd.DataFrame(state.columns(), index=df_all.index)], axis=1)
+    output_path = ST.write_table(df_all, ALL_PATH)
+
+    parts = batch_parts()
+    for stem in parts:
+        for ext in (ST.PARQUET, ST.CSV):
+            if os.path.exists(stem + ext):
+                os.remove(stem + ext)
+    state.meta = {"source": source_version(), "parts": 0}
+    state.save()
+    print(f"====> 배치 조각 {len(parts)}개 병합, hotspot 컬럼 저장 완료: {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("사용법: python scripts/update_hotspots.py <전처리된 사고 배치 파일> | --compact")
+        sys.exit(1)
+    if sys.argv[1] == "--compact":
+        compact_hotspots()
+    else:
+        update_hotspots(sys.argv[1])
@@ -0,0 +1,280 @@
+# 사고 데이터 압축 인메모리 저장소 (컬럼별 numpy 배열, struct-of-arrays)
+# - 문자열 컬럼: 사전 인코딩 (코드 배열 int16/int32 + 고유값 목록), 결측 코드는 -1
+# - 0/1 플래그·hotspot 여부: int8, 연도/시간대/나이: 작은 정수형, 측정값: float32
+# - 사고 좌표(lat/lng)는 float64 (float32면 최대 약 1m 오차 → 근접성 / 격자 칸 배정이 달라질 수 있음)
+# - 파일로 다시 쓰는 경로(filter_all_data)는 EXACT_SCHEMA(실수 컬럼 float64)로 읽어 원래 값 그대로 저장
+# - 정수 컬럼의 결측은 dtype 최솟값(missing_value)으로 표시하고, to_frame()에서 NaN(float64)으로 되돌림
+# - 파일은 청크 단위로 읽으면서 인코딩하므로 문자열 object 프레임 전체를 한 번에 만들지 않음
+# - mask / between / take / groupby: 문자열 비교 없이 인코딩된 배열 그대로 계산
+import numpy as np
+import pandas as pd
+
+from . import GEO_UTILS as GU
+from . import STORAGE as ST
+from . import STREAM_READ as SR
+
+CATEGORY = "category"
+
+ACCIDENT_SCHEMA = {
+    "acdnt_no": "int64",
+    "acdnt_year": "int16",
+    "occrrnc_time_code": "int8",
+    "acdnt_age_1_code": "int16",
+    "acdnt_age_1_dc": CATEGORY,
+    "sigungu": CATEGORY,
+    "legaldong_name": CATEGORY,
+    "route_nm": CATEGORY,
+    "acdnt_hdc": CATEGORY,
+    "lrg_violt_1_dc": CATEGORY,
+    "road_stle_dc": CATEGORY,
+    "wrngdo_vhcle_asort_dc": CATEGORY,
+    "rdse_sttus_dc": CATEGORY,
+    "road_div": CATEGORY,
+    "lat": "float64",
+    "lng": "float64",
+    "link_id": CATEGORY,
+    "link_dist_m": "float32",
+    "near_crosswalk": "int8",
+    "near_traffic_light": "int8",
+    "near_child_zone": "int8",
+    "near_elderly_zone": "int8",
+    "near_disabled_zone": "int8",
+    "lanes": "float32",
+    "lengths": "float32",
+    "velocity": "float32",
+    "traffic_volume": "float32",
+}
+for _prefix in GU.HOTSPOT_COHORTS:
+    _flag, _lat, _lng = GU.hotspot_columns(_prefix)
+    ACCIDENT_SCHEMA.update({_flag: "int8", _lat: "float32", _lng: "float32"})
+
+# 값 보존용: 문자열 / 정수 인코딩은 그대로 (손실 없음), 실수만 float64
+EXACT_SCHEMA = {col: "float64" if kind == "float32" else kind for col, kind in ACCIDENT_SCHEMA.items()}
+
+
+def missing_value(dtype):
+    return np.iinfo(dtype).min
+
+
+# 스키마에 없는 컬럼: 문자열은 사전 인코딩, 숫자는 원래 타입 유지
+def _infer_kind(series):
+    if pd.api.types.is_bool_dtype(series):
+        return "int8"
+    if pd.api.types.is_integer_dtype(series) or pd.api.types.is_float_dtype(series):
+        return str(np.dtype(series.dtype.numpy_dtype if hasattr(series.dtype, "numpy_dtype") else series.dtype))
+    return CATEGORY
+
+
+def _encode_values(series, kind, col):
+    numeric = pd.to_numeric(series, errors="coerce")
+    if np.dtype(kind).kind == "f":
+        return numeric.to_numpy(dtype=kind, na_value=np.nan)
+
+    missing = numeric.isna().to_numpy()
+    values = numeric.to_numpy(dtype="float64", na_value=np.nan) if missing.any() else numeric.to_numpy()
+    valid = values[~missing]
+    info = np.iinfo(kind)
+    if len(valid) and (valid.min() <= info.min or valid.max() > info.max):
+        raise ValueError(f"{col}: {kind} 범위를 벗어난 값이 있습니다.")
+    if valid.dtype.kind == "f" and (valid != np.floor(valid)).any():
+        raise ValueError(f"{col}: 정수 컬럼에 소수 값이 있습니다.")
+    return np.where(missing, info.min, values).astype(kind)
+
+
+# 청크를 넘어 같은 문자열에 같은 코드를 붙이는 사전
+class _Categories:
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def _code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, series):
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+        local = series.cat.codes.to_numpy()
+        if not len(series.cat.categories):
+            return np.full(len(series), -1, dtype="int32")
+        mapping = np.fromiter((self._code(v) for v in series.cat.categories), dtype="int32")
+        return np.where(local >= 0, mapping[local], -1).astype("int32")
+
+
+def _code_dtype(n_categories):
+    return "int16" if n_categories < np.iinfo("int16").max else "int32"
+
+
+# 파일을 청크 단위 DataFrame으로 (문자열 컬럼은 청크 안에서 이미 category로 읽음)
+def _iter_file_chunks(path, columns, schema, chunk_size):
+    path = ST.resolve(path)
+    if path.endswith(ST.PARQUET):
+        arrow_schema = ST.pq.read_schema(path)
+        dictionary = [
+            c for c in columns
+            if schema.get(c) == CATEGORY and ST.pa.types.is_string(arrow_schema.field(c).type)
+        ]
+        parquet = ST.pq.ParquetFile(path, read_dictionary=dictionary)
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        dtype = {c: "category" for c in columns if schema.get(c) == CATEGORY}
+        yield from SR.iter_csv_chunks(path, columns=columns, dtype=dtype, chunk_size=chunk_size)
+
+
+class AccidentStore:
+    def __init__(self, arrays, categories, kinds):
+        self.arrays = arrays            # 컬럼 → 값 배열 (문자열 컬럼은 코드)
+        self.categories = categories    # 문자열 컬럼 → 고유값 배열
+        self.kinds = kinds              # 컬럼 → 스키마 타입
+        self.n = len(next(iter(arrays.values()))) if arrays else 0
+        self._lookups = {}
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=None, schema=ACCIDENT_SCHEMA):
+        parts, kinds, dictionaries = {}, {}, {}
+        for chunk in chunks:
+            for col in columns or chunk.columns:
+                kind = kinds.setdefault(col, schema.get(col) or _infer_kind(chunk[col]))
+                if kind == CATEGORY:
+                    codes = dictionaries.setdefault(col, _Categories()).encode(chunk[col])
+                    parts.setdefault(col, []).append(codes)
+                else:
+                    parts.setdefault(col, []).append(_encode_values(chunk[col], kind, col))
+
+        arrays, categories = {}, {}
+        for col in columns or parts:
+            kind = kinds.get(col) or schema.get(col, "float64")
+            kinds[col] = kind
+            if kind == CATEGORY:
+                values = dictionaries[col].values if col in dictionaries else []
+                categories[col] = np.asarray(values, dtype=object)
+                arrays[col] = np.concatenate(parts.get(col, [np.empty(0, "int32")])).astype(_code_dtype(len(values)))
+            else:
+                arrays[col] = np.concatenate(parts.get(col, [np.empty(0, kind)]))
+        return cls(arrays, categories, kinds)
+
+    @classmethod
+    def from_frame(cls, df, schema=ACCIDENT_SCHEMA):
+        return cls.from_chunks([df], list(df.columns), schema)
+
+    # 파일(Parquet/CSV)을 chunk_size행씩 읽으며 인코딩
+    @classmethod
+    def load(cls, path, columns=None, schema=ACCIDENT_SCHEMA, chunk_size=SR.CHUNK_SIZE):
+        columns = list(columns or ST.available_columns(path))
+        return cls.from_chunks(_iter_file_chunks(path, columns, schema, chunk_size), columns, schema)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def columns(self):
+        return list(self.arrays)
+
+    @property
+    def nbytes(self):
+        arrays = sum(a.nbytes for a in self.arrays.values())
+        return arrays + sum(int(pd.Index(c).memory_usage(deep=True)) for c in self.categories.values())
+
+    # 원래 값으로 되돌린 DataFrame (문자열 컬럼은 pandas Categorical)
+    def to_frame(self, columns=None):
+        data = {}
+        for col in columns or self.arrays:
+            values = self.arrays[col]
+            if self.kinds[col] == CATEGORY:
+                data[col] = pd.Categorical.from_codes(values, categories=pd.Index(self.categories[col], dtype=object))
+            elif values.dtype.kind == "i":
+                missing = values == missing_value(values.dtype)
+                data[col] = np.where(missing, np.nan, values) if missing.any() else values
+            else:
+                data[col] = values
+        return pd.DataFrame(data)
+
+    def take(self, rows):
+        arrays = {col: values[rows] for col, values in self.arrays.items()}
+        return AccidentStore(arrays, self.categories, self.kinds)
+
+    # 문자열 값 → 코드 (없는 값은 무시)
+    def codes(self, col, values):
+        lookup = self._lookups.get(col)
+        if lookup is None:
+            lookup = self._lookups[col] = {v: i for i, v in enumerate(self.categories[col])}
+        return np.asarray([lookup[v] for v in values if v in lookup], dtype=self.arrays[col].dtype)
+
+    # 숫자 컬럼 → 실수 배열 (결측은 NaN, 정수 컬럼의 결측 표시값도 NaN으로)
+    def float_values(self, col, dtype="float64"):
+        values = self.arrays[col].astype(dtype)
+        values[~self.valid(col)] = np.nan
+        return values
+
+    def valid(self, col):
+        values = self.arrays[col]
+        if self.kinds[col] == CATEGORY:
+            return values >= 0
+        if values.dtype.kind == "i":
+            return values != missing_value(values.dtype)
+        return np.isfinite(values)
+
+    # 컬럼=값 (또는 값 목록) 조건을 모두 만족하는 행
+    def mask(self, **conditions):
+        keep = np.ones(self.n, dtype=bool)
+        for col, value in conditions.items():
+            values = list(value) if isinstance(value, (list, tuple, set, frozenset, np.ndarray)) else [value]
+            if self.kinds[col] == CATEGORY:
+                keep &= np.isin(self.arrays[col], self.codes(col, values))
+            else:
+                keep &= np.isin(self.arrays[col], values) & self.valid(col)
+        return keep
+
+    # low <= 값 < high (결측 제외, GEO_UTILS 연령 대상 구분과 같은 경계)
+    def between(self, col, low=None, high=None):
+        values = self.arrays[col]
+        keep = self.valid(col)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values < high
+        return keep
+
+    # by 컬럼별 건수 + values 컬럼의 합계/평균 (결측 키는 제외, 결측 값은 평균에서 제외)
+    def groupby(self, by, values=(), agg="mean", rows=None):
+        if agg not in ("sum", "mean"):
+            raise ValueError(f"agg는 sum 또는 mean이어야 합니다: {agg}")
+        by = [by] if isinstance(by, str) else list(by)
+        values = [values] if isinstance(values, str) else list(values)
+        keep = np.ones(self.n, dtype=bool) if rows is None else np.asarray(rows, dtype=bool).copy()
+        for col in by:
+            keep &= self.valid(col)
+
+        keys, dims, labels = [], [], []
+        for col in by:
+            column = self.arrays[col][keep]
+            if self.kinds[col] == CATEGORY:
+                keys.append(column.astype("int64"))
+                dims.append(max(len(self.categories[col]), 1))
+                labels.append(self.categories[col])
+            else:
+                unique, inverse = np.unique(column, return_inverse=True)
+                keys.append(inverse)
+                dims.append(max(len(unique), 1))
+                labels.append(unique)
+        flat = np.ravel_multi_index(keys, dims) if keys else np.zeros(int(keep.sum()), dtype="int64")
+        groups, inverse = np.unique(flat, return_inverse=True)
+
+        result = {}
+        for col, positions, label in zip(by, np.unravel_index(groups, dims), labels):
+            result[col] = label[positions]
+        result["count"] = np.bincount(inverse, minlength=len(groups))
+        for col in values:
+            column = self.arrays[col][keep].astype("float64")
+            present = self.valid(col)[keep]
+            total = np.bincount(inverse, weights=np.where(present, column, 0.0), minlength=len(groups))
+            if agg == "sum":
+                result[col] = total
+            else:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result[col] = total / np.bincount(inverse, weights=present, minlength=len(groups))
+        return pd.DataFrame(result).sort_values(by).reset_index(drop=True) if by else pd.DataFrame(result)
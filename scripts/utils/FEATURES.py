@@ -0,0 +1,210 @@
+# 학습/SHAP용 사고 특성 행렬 (float32, dense numpy 또는 CSR sparse)
+# - 사고 데이터를 압축 저장소(ACCIDENT_STORE)로 읽어 인코딩된 배열에서 한 번에 생성 (pandas 전처리 없음)
+#   onehot: 범주별 0/1 컬럼, ordinal: 정렬 순번(결측 0), numeric: 중앙값 대체,
+#   impute: 중앙값 대체 + 결측 표시 컬럼, flags: 1이면 1 (결측은 0)
+# - 범주 목록/중앙값(fitted)을 넘기면 같은 컬럼 구성으로 생성 (학습 데이터와 예측 데이터의 컬럼을 맞출 때)
+# - 원본 파일 해시 + 특성 정의 해시를 키로 디스크 캐시 (dense 행렬은 memory-map으로 읽음)
+# - aggregate(): 도로 구간 / 격자 칸 등 그룹별 평균 특성 행렬
+import os
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+
+from . import ACCIDENT_STORE as AS
+from . import GRID_TILES as GT
+from . import INDEX_CACHE as IC
+from . import STORAGE as ST
+
+INPUT_PATH = "./data/processed/accident_data_filtered"
+CACHE_DIR = "./data/cache/features"
+
+# 행렬 생성 방식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 1
+
+FEATURE_SPEC = {
+    "onehot": ["acdnt_hdc", "lrg_violt_1_dc", "road_stle_dc", "wrngdo_vhcle_asort_dc", "rdse_sttus_dc", "road_div"],
+    "ordinal": ["legaldong_name"],
+    "numeric": ["occrrnc_time_code", "acdnt_age_1_code", "lanes", "lengths"],
+    "impute": ["velocity", "traffic_volume"],
+    "flags": ["near_crosswalk", "near_traffic_light", "near_child_zone", "near_elderly_zone", "near_disabled_zone",
+              "elderly_hotspot", "non_elderly_hotspot", "all_hotspot"],
+}
+
+# aggregate() 격자 칸 크기 (GRID_TILES 해상도 중 하나, 같은 칸 키)
+GRID_M = 500
+
+
+class FeatureMatrix:
+    def __init__(self, X, names, fitted, lat=None, lng=None):
+        self.X = X                # (행 수 × 특성 수) float32, dense 또는 CSR
+        self.names = names        # 특성 이름 (one-hot은 "컬럼=값")
+        self.fitted = fitted      # {"categories": {컬럼: [값...]}, "medians": {컬럼: 값}}
+        self.lat = lat
+        self.lng = lng
+
+    @property
+    def shape(self):
+        return self.X.shape
+
+    # SHAP 등 컬럼 이름이 필요한 곳에서 사용
+    def to_frame(self):
+        if sp.issparse(self.X):
+            return pd.DataFrame.sparse.from_spmatrix(self.X, columns=self.names)
+        return pd.DataFrame(self.X, columns=self.names)
+
+
+def _median(values):
+    return float(np.nanmedian(values)) if np.isfinite(values).any() else 0.0
+
+
+# 저장소 코드 → fitted 범주 순번 (fitted에 없는 값 / 결측은 -1)
+def _category_positions(store, col, categories):
+    lookup = {v: i for i, v in enumerate(categories)}
+    mapping = np.array([lookup.get(v, -1) for v in store.categories[col]] + [-1], dtype="int64")
+    return mapping[store.arrays[col].astype("int64")]
+
+
+# 특성 정의 중 데이터에 있는 컬럼만 사용
+def _present_spec(store, spec):
+    return {kind: [c for c in columns if c in store.arrays] for kind, columns in spec.items()}
+
+
+def build_features(store, spec=FEATURE_SPEC, sparse=False, fitted=None):
+    spec = _present_spec(store, spec)
+    n = len(store)
+    fit = fitted is None
+    fitted = fitted or {"categories": {}, "medians": {}}
+
+    # 값 컬럼 (이름, float32 배열) / one-hot 블록 (이름 목록, 행별 범주 순번)
+    columns, blocks = [], []
+    for kind in ("numeric", "impute"):
+        for col in spec[kind]:
+            values = store.float_values(col, "float32")
+            if fit:
+                fitted["medians"][col] = _median(values)
+            missing = np.isnan(values)
+            values[missing] = fitted["medians"][col]
+            columns.append((col, values))
+            if kind == "impute":
+                columns.append((f"{col}_missing", missing.astype("float32")))
+    for col in spec["flags"]:
+        columns.append((col, ((store.arrays[col] == 1) & store.valid(col)).astype("float32")))
+    for kind in ("ordinal", "onehot"):
+        for col in spec[kind]:
+            if fit:
+                fitted["categories"][col] = sorted(store.categories[col])
+            positions = _category_positions(store, col, fitted["categories"][col])
+            if kind == "ordinal":
+                columns.append((col, (positions + 1).astype("float32")))
+            else:
+                blocks.append(([f"{col}={v}" for v in fitted["categories"][col]], positions))
+
+    names = [name for name, _ in columns] + [name for block_names, _ in blocks for name in block_names]
+    p = len(names)
+    # sparse: 0이 아닌 값의 (행, 열, 값)을 모아 CSR로
+    rows, cols, data = [], [], []
+    if sparse:
+        for j, (_, values) in enumerate(columns):
+            nz = np.flatnonzero(values)
+            rows.append(nz)
+            cols.append(np.full(len(nz), j))
+            data.append(values[nz])
+    else:
+        X = np.zeros((n, p), dtype="float32")
+        for j, (_, values) in enumerate(columns):
+            X[:, j] = values
+
+    offset = len(columns)
+    for block_names, positions in blocks:
+        hit = np.flatnonzero(positions >= 0)
+        if sparse:
+            rows.append(hit)
+            cols.append(offset + positions[hit])
+            data.append(np.ones(len(hit), dtype="float32"))
+        else:
+            X[hit, offset + positions[hit]] = 1.0
+        offset += len(block_names)
+
+    if sparse:
+        empty = [np.empty(0, dtype="int64")]
+        X = sp.csr_matrix(
+            (np.concatenate(data or [np.empty(0, dtype="float32")]),
+             (np.concatenate(rows or empty), np.concatenate(cols or empty))),
+            shape=(n, p), dtype="float32",
+        )
+    lat = store.float_values("lat", "float32") if "lat" in store.arrays else None
+    lng = store.float_values("lng", "float32") if "lng" in store.arrays else None
+    return FeatureMatrix(X, names, fitted, lat, lng)
+
+
+# 캐시 키: 원본 파일 내용 + 특성 정의 + 형식
+def _cache_key(path, spec, sparse, fitted):
+    h = hashlib.sha256()
+    for part in (CACHE_VERSION, IC.file_hash(path), json.dumps(spec, sort_keys=True), sparse,
+                 json.dumps(fitted, sort_keys=True, ensure_ascii=False)):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _load(cache_path):
+    with open(os.path.join(cache_path, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta["sparse"]:
+        X = sp.load_npz(os.path.join(cache_path, "X.npz"))
+    else:
+        X = np.load(os.path.join(cache_path, "X.npy"), mmap_mode="r")
+    coords = np.load(os.path.join(cache_path, "coords.npy"), mmap_mode="r")
+    return FeatureMatrix(X, meta["names"], meta["fitted"], coords[0], coords[1])
+
+
+def _save(fm, cache_path):
+    def write(tmp_path):
+        if sp.issparse(fm.X):
+            sp.save_npz(os.path.join(tmp_path, "X.npz"), fm.X, compressed=False)
+        else:
+            np.save(os.path.join(tmp_path, "X.npy"), fm.X)
+        n = fm.shape[0]
+        lat = fm.lat if fm.lat is not None else np.full(n, np.nan, dtype="float32")
+        lng = fm.lng if fm.lng is not None else np.full(n, np.nan, dtype="float32")
+        np.save(os.path.join(tmp_path, "coords.npy"), np.vstack((lat, lng)))
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"names": fm.names, "fitted": fm.fitted, "sparse": sp.issparse(fm.X)}, f, ensure_ascii=False)
+
+    IC.write_cache_dir(cache_path, write)
+
+
+# 특성 행렬 로드 (캐시가 없거나 원본 / 특성 정의가 바뀌었으면 새로 생성 후 저장)
+def load_feature_matrix(path=INPUT_PATH, spec=FEATURE_SPEC, sparse=False, fitted=None, cache_dir=CACHE_DIR):
+    path = ST.resolve(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f"{name}_{_cache_key(path, spec, sparse, fitted)}")
+    if os.path.isdir(cache_path):
+        return _load(cache_path)
+
+    print(f"↘︎ [{name}] 특성 행렬 캐시 생성 중...")
+    columns = {c for cols in spec.values() for c in cols} | {"lat", "lng"}
+    available = [c for c in ST.available_columns(path) if c in columns]
+    fm = build_features(AS.AccidentStore.load(path, columns=available), spec, sparse, fitted)
+    _save(fm, cache_path)
+    return fm
+
+
+# 격자 칸 키 (GRID_TILES 집계 파일의 cell_key와 같은 키, 좌표가 없으면 -1)
+def grid_cells(lat, lng, cell_m=GRID_M):
+    return GT.cell_keys(lat, lng, cell_m)
+
+
+# 그룹별 평균 특성 (keys: 행별 그룹 키, 결측 키 missing_key 행은 제외) → (그룹 키, 평균 행렬, 건수)
+# 그룹 지시 행렬(그룹 × 행, sparse)과 곱해 한 번에 계산
+def aggregate(fm, keys, missing_key=-1):
+    keys = np.asarray(keys)
+    rows = np.flatnonzero(keys != missing_key) if missing_key is not None else np.arange(len(keys))
+    groups, inverse = np.unique(keys[rows], return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(groups))
+    indicator = sp.csr_matrix((1.0 / counts[inverse], (inverse, rows)), shape=(len(groups), len(keys)), dtype="float32")
+    means = indicator @ fm.X
+    return groups, (means if sp.issparse(means) else np.asarray(means, dtype="float32")), counts
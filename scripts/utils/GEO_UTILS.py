@@ -1,23 +1,55 @@
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
 from pyproj import Transformer
 from scipy.spatial import KDTree
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 from sklearn.cluster import DBSCAN
 from math import radians, cos, sin, sqrt, atan2
 
+from concurrent.futures import ProcessPoolExecutor
+
+from . import PROFILING as PF
+from . import STORAGE as ST
+from . import TILES as TL
+
 # 지구 반지름 (단위: m)
 EARTH_RADIUS_M = 6371000
 
+# 한 번에 변환할 최대 행 수 (메모리 상한)
+CONVERT_CHUNK_SIZE = 500_000
+
+# (from, to) 좌표계 쌍별 Transformer 캐시
+@lru_cache(maxsize=None)
+def get_transformer(epsg_from=5186, epsg_to=4326):
+    return Transformer.from_crs(f"epsg:{epsg_from}", f"epsg:{epsg_to}", always_xy=True)
+
+# x/y 배열을 한 번에 변환 → (lat, lng) 배열 반환
+# 숫자가 아니거나 변환에 실패한 좌표는 NaN 처리
+def transform_coordinates(x, y, epsg_from=5186, epsg_to=4326, chunk_size=CONVERT_CHUNK_SIZE):
+    x = pd.to_numeric(pd.Series(x), errors="coerce").to_numpy(dtype="float64")
+    y = pd.to_numeric(pd.Series(y), errors="coerce").to_numpy(dtype="float64")
+    lat = np.full(len(x), np.nan)
+    lng = np.full(len(x), np.nan)
+
+    valid_idx = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    transformer = get_transformer(epsg_from, epsg_to)
+    for start in range(0, len(valid_idx), chunk_size):
+        idx = valid_idx[start:start + chunk_size]
+        lng[idx], lat[idx] = transformer.transform(x[idx], y[idx])
+
+    failed = ~(np.isfinite(lat) & np.isfinite(lng))
+    lat[failed] = np.nan
+    lng[failed] = np.nan
+    return lat, lng
+
 # EPSG 기반 좌표계 변환 함수
-def convert_coordinates(df, x_col, y_col, lat_col, lng_col, epsg_from=5186, epsg_to=4326):
-    transformer = Transformer.from_crs(f"epsg:{epsg_from}", f"epsg:{epsg_to}", always_xy=True)
-    def transform_row(row):
-        try:
-            lng, lat = transformer.transform(row[x_col], row[y_col])
-            return pd.Series({lat_col: lat, lng_col: lng})
-        except:
-            return pd.Series({lat_col: None, lng_col: None})
-    return df.apply(transform_row, axis=1)
+def convert_coordinates(df, x_col, y_col, lat_col, lng_col, epsg_from=5186, epsg_to=4326,
+                        chunk_size=CONVERT_CHUNK_SIZE):
+    lat, lng = transform_coordinates(df[x_col], df[y_col], epsg_from, epsg_to, chunk_size)
+    return pd.DataFrame({lat_col: lat, lng_col: lng}, index=df.index)
 
 # 위도/경도를 라디안으로 변환
 def latlng_to_radians(df, lat_col="Y", lng_col="X"):
@@ -33,42 +65,176 @@ def haversine(lat1, lng1, lat2, lng2):
     c = 2 * atan2(sqrt(a), sqrt(1 - a))
     return EARTH_RADIUS_M * c
 
+# Haversine 거리계산 (NumPy 배열 버전, 단위: m)
+def haversine_np(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2)**2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+# 위도/경도 → 지구중심 직교좌표(ECEF, 구면 근사, 단위: m)
+# 직교좌표의 직선(현) 거리는 구면 거리와 단조 관계라 KDTree 검색에 그대로 사용 가능
+def latlng_to_ecef(lat, lng):
+    lat = np.radians(np.asarray(lat, dtype="float64"))
+    lng = np.radians(np.asarray(lng, dtype="float64"))
+    cos_lat = np.cos(lat)
+    return EARTH_RADIUS_M * np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+# 구면 거리(m) → 현 거리(m)
+def arc_to_chord(distance_m):
+    return 2 * EARTH_RADIUS_M * np.sin(np.minimum(distance_m, np.pi * EARTH_RADIUS_M) / (2 * EARTH_RADIUS_M))
+
+# 기준 레이어(횡단보도/신호등/보호구역 등) 근접성 인덱스
+# 좌표가 없는 행은 제외하고 ECEF KDTree를 한 번만 생성
+# rows: 인덱스에 포함된 지점의 원본 행 위치
+class ProximityIndex:
+    def __init__(self, lat, lng):
+        lat = np.asarray(lat, dtype="float64")
+        lng = np.asarray(lng, dtype="float64")
+        valid = np.isfinite(lat) & np.isfinite(lng)
+        self.rows = np.flatnonzero(valid)
+        self.lat = lat[valid]
+        self.lng = lng[valid]
+        self.tree = KDTree(latlng_to_ecef(self.lat, self.lng))
+
+    @classmethod
+    def from_df(cls, df, lat_col="Y", lng_col="X"):
+        return cls(pd.to_numeric(df[lat_col], errors="coerce"), pd.to_numeric(df[lng_col], errors="coerce"))
+
+    # 디스크 캐시의 좌표 / ECEF 배열로 복원 (좌표 변환 없이 트리만 다시 만듦)
+    # copy_data=False: 트리가 xyz(memory-map)를 복사하지 않고 그대로 참조
+    @classmethod
+    def from_arrays(cls, lat, lng, rows, xyz):
+        index = cls.__new__(cls)
+        index.lat, index.lng, index.rows = lat, lng, rows
+        index.tree = KDTree(xyz, copy_data=False)
+        return index
+
+    def __len__(self):
+        return len(self.lat)
+
+    # 최근접 지점까지의 거리(m)와 원본 행 위치 (search_m 밖이면 거리 NaN, 위치 -1)
+    # 최근접 1건만 찾으므로 반경 내 후보를 모두 나열하지 않음
+    # xyz: 미리 계산한 latlng_to_ecef(lat, lng) (여러 레이어에 같은 사고좌표를 쓸 때 재사용)
+    def nearest(self, lat, lng, search_m=np.inf, xyz=None):
+        lat = np.asarray(lat, dtype="float64")
+        lng = np.asarray(lng, dtype="float64")
+        distance = np.full(len(lat), np.nan)
+        index = np.full(len(lat), -1, dtype="int64")
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lng))
+        if len(self) == 0 or len(valid) == 0:
+            return distance, index
+
+        xyz = latlng_to_ecef(lat[valid], lng[valid]) if xyz is None else xyz[valid]
+        _, idx = self.tree.query(xyz, k=1, distance_upper_bound=arc_to_chord(search_m))
+        found = idx < len(self)
+        rows, idx = valid[found], idx[found]
+        distance[rows] = haversine_np(lat[rows], lng[rows], self.lat[idx], self.lng[idx])
+        index[rows] = self.rows[idx]
+        return distance, index
+
+    # k개 최근접 지점까지의 거리(m)와 원본 행 위치, shape (n, k) (없으면 거리 NaN, 위치 -1)
+    def k_nearest(self, lat, lng, k, search_m=np.inf, xyz=None):
+        lat = np.asarray(lat, dtype="float64")
+        lng = np.asarray(lng, dtype="float64")
+        distance = np.full((len(lat), k), np.nan)
+        index = np.full((len(lat), k), -1, dtype="int64")
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lng))
+        if len(self) == 0 or len(valid) == 0:
+            return distance, index
+
+        xyz = latlng_to_ecef(lat[valid], lng[valid]) if xyz is None else xyz[valid]
+        _, idx = self.tree.query(xyz, k=k, distance_upper_bound=arc_to_chord(search_m))
+        idx = idx.reshape(len(valid), k)
+        found = idx < len(self)
+        rows, cols = np.nonzero(found)
+        matched = idx[rows, cols]
+        acc_rows = valid[rows]
+        distance[acc_rows, cols] = haversine_np(lat[acc_rows], lng[acc_rows], self.lat[matched], self.lng[matched])
+        index[acc_rows, cols] = self.rows[matched]
+        return distance, index
+
+    # 반경(radius_m) 내 지점 수
+    # buffer_m 만큼 넓혀 후보를 찾은 뒤, 후보쌍 전체에 대해 haversine을 한 번에 계산
+    def count_within(self, lat, lng, radius_m, buffer_m=0, xyz=None):
+        lat = np.asarray(lat, dtype="float64")
+        lng = np.asarray(lng, dtype="float64")
+        counts = np.zeros(len(lat), dtype="int64")
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lng))
+        if len(self) == 0 or len(valid) == 0:
+            return counts
+
+        xyz = latlng_to_ecef(lat[valid], lng[valid]) if xyz is None else xyz[valid]
+        candidates = self.tree.query_ball_point(xyz, r=arc_to_chord(radius_m + buffer_m))
+        lengths = np.fromiter((len(c) for c in candidates), dtype="int64", count=len(candidates))
+        if lengths.sum() == 0:
+            return counts
+
+        rows = np.repeat(valid, lengths)
+        idx = np.concatenate([c for c in candidates if c]).astype("int64")
+        within = haversine_np(lat[rows], lng[rows], self.lat[idx], self.lng[idx]) <= radius_m
+        counts += np.bincount(rows[within], minlength=len(lat))
+        return counts
+
+# 여러 기준 레이어의 근접 플래그를 한 번에 계산
+# layers: {레이어명: {"df" 또는 "index", "lat_col", "lng_col", "radius_m", "buffer_m",
+#                   "output_col", ("distance_col"), ("count_col")}}
+#   - "index"(ProximityIndex)를 넘기면 트리를 다시 만들지 않고 재사용
+# 사고 좌표 변환은 1회만 수행하고, 결과 컬럼은 마지막에 한 번에 붙임
+def mark_zone_proximity_layers(accident_df, layers, accident_lat_col="lat", accident_lng_col="lng"):
+    acc_lat = pd.to_numeric(accident_df[accident_lat_col], errors="coerce").to_numpy(dtype="float64")
+    acc_lng = pd.to_numeric(accident_df[accident_lng_col], errors="coerce").to_numpy(dtype="float64")
+    acc_xyz = latlng_to_ecef(acc_lat, acc_lng)
+
+    columns = {}
+    for name, layer in layers.items():
+        index = layer.get("index")
+        if index is None:
+            index = ProximityIndex.from_df(layer["df"], layer.get("lat_col", "Y"), layer.get("lng_col", "X"))
+        radius_m = layer.get("radius_m", 300)
+        buffer_m = layer.get("buffer_m", 100)
+
+        distance, _ = index.nearest(acc_lat, acc_lng, search_m=radius_m + buffer_m, xyz=acc_xyz)
+        columns[layer["output_col"]] = (distance <= radius_m).astype(int)
+        if layer.get("distance_col"):
+            columns[layer["distance_col"]] = distance
+        if layer.get("count_col"):
+            columns[layer["count_col"]] = index.count_within(acc_lat, acc_lng, radius_m, buffer_m, xyz=acc_xyz)
+        print(f"↘︎ [{layer['output_col']}] ({name}) 계산 완료")
+
+    result = pd.concat(
+        [accident_df.drop(columns=[c for c in columns if c in accident_df.columns]),
+         pd.DataFrame(columns, index=accident_df.index)],
+        axis=1
+    )
+    print(f"↘︎ 근접성 컬럼 {len(columns)}개 병합 완료 (총 {len(result)}건)\n")
+    return result
+
 # 교차로 근접성 마킹 함수
 # accident_df: 사고 데이터프레임
 # zone_df: 보호구역 데이터프레임
 # accident_lat_col: 사고 데이터프레임의 위도 컬럼명
+# distance_col / count_col: 지정 시 최근접 거리(m) / 반경 내 개수 컬럼도 함께 추가
 def mark_zone_proximity_common(
     accident_df, zone_df,
     accident_lat_col="lat", accident_lng_col="lng",
     zone_lat_col="Y", zone_lng_col="X",
     output_col="zone_flag",
-    radius_m=300, buffer_m=100
+    radius_m=300, buffer_m=100,
+    distance_col=None, count_col=None
 ):
-    accident_df[output_col] = 0
-
-    zone_df = zone_df.dropna(subset=[zone_lat_col, zone_lng_col])
-    zone_coords_deg = zone_df[[zone_lat_col, zone_lng_col]].values
-    zone_coords_rad = latlng_to_radians(zone_df, zone_lat_col, zone_lng_col)
-
-    accident_coords_deg = accident_df[[accident_lat_col, accident_lng_col]].values
-    accident_coords_rad = latlng_to_radians(accident_df, accident_lat_col, accident_lng_col)
-
-    tree = KDTree(zone_coords_rad)
-    radius_rad = (radius_m + buffer_m) / EARTH_RADIUS_M
-    candidates = tree.query_ball_point(accident_coords_rad, r=radius_rad)
-
-    flags = []
-    for i, match_idxs in enumerate(candidates):
-        lat1, lng1 = accident_coords_deg[i]
-        found = False
-        for idx in match_idxs:
-            lat2, lng2 = zone_coords_deg[idx]
-            if haversine(lat1, lng1, lat2, lng2) <= radius_m:
-                found = True
-                break
-        flags.append(1 if found else 0)
-    print(f"↘︎ [{output_col}] 컬럼 병합 완료 (총 {len(flags)}건)\n")  
+    index = ProximityIndex.from_df(zone_df, zone_lat_col, zone_lng_col)
+    acc_lat = pd.to_numeric(accident_df[accident_lat_col], errors="coerce").to_numpy(dtype="float64")
+    acc_lng = pd.to_numeric(accident_df[accident_lng_col], errors="coerce").to_numpy(dtype="float64")
+
+    distance, _ = index.nearest(acc_lat, acc_lng, search_m=radius_m + buffer_m)
+    flags = (distance <= radius_m).astype(int)
+
     accident_df[output_col] = flags
+    if distance_col:
+        accident_df[distance_col] = distance
+    if count_col:
+        accident_df[count_col] = index.count_within(acc_lat, acc_lng, radius_m, buffer_m)
+    print(f"↘︎ [{output_col}] 컬럼 병합 완료 (총 {len(flags)}건)\n")
     return accident_df
 
 
@@ -93,30 +259,262 @@ def cluster_and_mark(df, lat_col='lat', lng_col='lng', eps_m=100, min_samples=5)
     df = df.merge(centers, on='cluster', how='left')
     return df
 
-# 고령/비고령/전체 기준 hotspot 분석 및 병합
-def assign_hotspot_columns(df_all, lat_col='lat', lon_col='lng', id_col='acdnt_no'):
-    print("====> Hotspot 분석 중...")
+# hotspot 군집화용 평면 좌표계 (Korea 2000 / Central Belt, 단위: m)
+HOTSPOT_EPSG = 5186
+
+# 위도/경도 → 평면 좌표 (x, y)
+def project_xy(lat, lng, epsg_to=HOTSPOT_EPSG):
+    y, x = transform_coordinates(lng, lat, epsg_from=4326, epsg_to=epsg_to)
+    return x, y
+
+# 평면 좌표 기준 반경(radius_m) 이내 이웃 그래프 (i<j 쌍, 거리)
+# 좌표가 없는 점은 이웃이 없는 것으로 처리
+class NeighborGraph:
+    def __init__(self, x, y, radius_m):
+        self.n = len(x)
+        self.radius_m = radius_m
+        valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+        xy = np.column_stack((x[valid], y[valid]))
+        pairs = KDTree(xy).query_pairs(radius_m, output_type="ndarray")
+        self.dist = np.hypot(*(xy[pairs[:, 0]] - xy[pairs[:, 1]]).T).astype("float32")
+        index_dtype = "int32" if self.n < 2**31 else "int64"
+        self.i = valid[pairs[:, 0]].astype(index_dtype)
+        self.j = valid[pairs[:, 1]].astype(index_dtype)
+        self.valid = np.zeros(self.n, dtype=bool)
+        self.valid[valid] = True
+
+    # eps_m 이내이면서 양 끝점이 모두 mask에 속하는 간선
+    def edges(self, mask, eps_m):
+        if eps_m > self.radius_m:
+            raise ValueError(f"eps_m({eps_m})가 그래프 반경({self.radius_m})보다 큽니다.")
+        keep = mask[self.i] & mask[self.j] & (self.dist <= eps_m)
+        return self.i[keep], self.j[keep]
+
+# 이웃 그래프 기반 DBSCAN → (군집 라벨, hotspot 여부, 중심 위도, 중심 경도)
+# sklearn DBSCAN과 같은 라벨을 만듦
+#   - 핵심점: 자기 자신 포함 eps 이내 이웃 수 >= min_samples
+#   - 군집: 핵심점끼리의 연결요소, 가장 작은 행 번호 순으로 라벨 부여
+#   - 경계점: 인접한 핵심점 군집 중 라벨이 가장 작은 군집에 소속
+def dbscan_on_graph(graph, mask, lat, lng, eps_m, min_samples):
+    mask = mask & graph.valid
+    labels = np.full(graph.n, -1, dtype="int64")
+    i, j = graph.edges(mask, eps_m)
+
+    degree = np.bincount(i, minlength=graph.n) + np.bincount(j, minlength=graph.n) + 1
+    core = mask & (degree >= min_samples)
+    core_idx = np.flatnonzero(core)
+    if len(core_idx):
+        core_edges = core[i] & core[j]
+        position = np.cumsum(core) - 1
+        ci, cj = position[i[core_edges]], position[j[core_edges]]
+        n_core = len(core_idx)
+        adjacency = csr_matrix((np.ones(len(ci), dtype="int8"), (ci, cj)), shape=(n_core, n_core))
+        n_comp, comp = connected_components(adjacency, directed=False)
+
+        first = np.full(n_comp, graph.n, dtype="int64")
+        np.minimum.at(first, comp, core_idx)
+        rank = np.empty(n_comp, dtype="int64")
+        rank[np.argsort(first)] = np.arange(n_comp)
+        labels[core_idx] = rank[comp]
+
+        border_label = np.full(graph.n, np.iinfo("int64").max, dtype="int64")
+        for a, b in ((i, j), (j, i)):
+            hit = core[a] & ~core[b]
+            np.minimum.at(border_label, b[hit], labels[a[hit]])
+        border = border_label != np.iinfo("int64").max
+        labels[border] = border_label[border]
+
+    is_hotspot = labels != -1
+    center_lat = np.full(graph.n, np.nan)
+    center_lng = np.full(graph.n, np.nan)
+    if is_hotspot.any():
+        members = labels[is_hotspot]
+        counts = np.bincount(members)
+        center_lat[is_hotspot] = (np.bincount(members, weights=lat[is_hotspot]) / counts)[members]
+        center_lng[is_hotspot] = (np.bincount(members, weights=lng[is_hotspot]) / counts)[members]
+    return labels, is_hotspot, center_lat, center_lng
+
+# hotspot 분석 대상 (컬럼 접두어: 대상 필터 / DBSCAN 파라미터)
+HOTSPOT_COHORTS = {
+    "elderly": {"min_age": 65, "max_age": None, "eps_m": 100, "min_samples": 5},
+    "non_elderly": {"min_age": None, "max_age": 65, "eps_m": 100, "min_samples": 7},
+    "all": {"min_age": None, "max_age": None, "eps_m": 50, "min_samples": 5},
+}
+
+# hotspot 분석 결과 컬럼명
+def hotspot_columns(prefix):
+    return [f"{prefix}_hotspot", f"{prefix}_hotspot_lat", f"{prefix}_hotspot_lng"]
+
+# 대상별 hotspot 컬럼 계산 (행 위치 기준 배열, 대상이 아닌 행은 NaN)
+# 평면 좌표로 한 번 투영한 뒤, 가장 큰 eps 기준 이웃 그래프를 모든 대상이 공유
+def compute_hotspot_columns(df_all, lat_col='lat', lon_col='lng', cohorts=None, graph=None):
+    cohorts = HOTSPOT_COHORTS if cohorts is None else cohorts
+    lat = pd.to_numeric(df_all[lat_col], errors="coerce").to_numpy(dtype="float64")
+    lng = pd.to_numeric(df_all[lon_col], errors="coerce").to_numpy(dtype="float64")
+    age = pd.to_numeric(df_all['acdnt_age_1_code'], errors="coerce").to_numpy(dtype="float64")
+
+    if graph is None:
+        x, y = project_xy(lat, lng)
+        graph = NeighborGraph(x, y, max(c["eps_m"] for c in cohorts.values()))
+
+    columns = {}
+    for (prefix, cohort), mask in zip(cohorts.items(), _cohort_masks(age, cohorts).values()):
+        _, is_hotspot, center_lat, center_lng = dbscan_on_graph(
+            graph, mask, lat, lng, cohort["eps_m"], cohort["min_samples"]
+        )
+        flag_col, lat_out, lng_out = hotspot_columns(prefix)
+        columns[flag_col] = np.where(mask, is_hotspot.astype("float64"), np.nan)
+        columns[lat_out] = center_lat
+        columns[lng_out] = center_lng
+    return columns
+
+# 대상별 마스크 (행 위치 기준 bool 배열)
+def _cohort_masks(age, cohorts):
+    masks = {}
+    for prefix, cohort in cohorts.items():
+        mask = np.ones(len(age), dtype=bool)
+        if cohort["min_age"] is not None:
+            mask &= age >= cohort["min_age"]
+        if cohort["max_age"] is not None:
+            mask &= age < cohort["max_age"]
+        masks[prefix] = mask
+    return masks
 
-    elderly = df_all[df_all['acdnt_age_1_code'] >= 65].copy()
-    elderly = cluster_and_mark(elderly, lat_col, lon_col, eps_m=100, min_samples=5)
-    elderly = elderly[[id_col, 'is_hotspot', 'hotspot_center_lat', 'hotspot_center_lng']]
-    elderly.columns = [id_col, 'elderly_hotspot', 'elderly_hotspot_lat', 'elderly_hotspot_lng']
+# 타일 1개의 대상별 DBSCAN 중간 결과 (worker 프로세스에서 실행, 인덱스는 모두 전역 행 위치)
+#   - owned_core: 이 타일 소속 점 중 핵심점
+#   - core_ids / core_comp: 타일 경계에서 eps 이내(trusted) 핵심점과 타일 내 연결요소 번호
+#   - border_ids / border_core: 이 타일 소속 비핵심점과 인접한 핵심점 쌍
+# halo가 2 × eps 이상이면 trusted 점의 이웃은 모두 타일 데이터 안에 있으므로 핵심점 여부가 전체 계산과 같음
+def _hotspot_tile(ids, x, y, owned, bounds, params, masks):
+    graph = NeighborGraph(x, y, max(eps_m for eps_m, _ in params))
+    x0, y0, x1, y1 = bounds
+    results = []
+    for (eps_m, min_samples), mask in zip(params, masks):
+        mask = mask & graph.valid
+        i, j = graph.edges(mask, eps_m)
+        degree = np.bincount(i, minlength=graph.n) + np.bincount(j, minlength=graph.n) + 1
+        trusted = (x >= x0 - eps_m) & (x < x1 + eps_m) & (y >= y0 - eps_m) & (y < y1 + eps_m)
+        core = mask & trusted & (degree >= min_samples)
 
-    non_elderly = df_all[df_all['acdnt_age_1_code'] < 65].copy()
-    non_elderly = cluster_and_mark(non_elderly, lat_col, lon_col, eps_m=100, min_samples=7)
-    non_elderly = non_elderly[[id_col, 'is_hotspot', 'hotspot_center_lat', 'hotspot_center_lng']]
-    non_elderly.columns = [id_col, 'non_elderly_hotspot', 'non_elderly_hotspot_lat', 'non_elderly_hotspot_lng']
+        core_idx = np.flatnonzero(core)
+        core_edges = core[i] & core[j]
+        position = np.cumsum(core) - 1
+        ci, cj = position[i[core_edges]], position[j[core_edges]]
+        adjacency = csr_matrix((np.ones(len(ci), dtype="int8"), (ci, cj)), shape=(len(core_idx), len(core_idx)))
+        _, comp = connected_components(adjacency, directed=False)
+
+        border = mask & owned & ~core
+        core_i = core[i] & border[j]
+        core_j = core[j] & border[i]
+        results.append({
+            "owned_core": ids[core & owned],
+            "core_ids": ids[core_idx],
+            "core_comp": comp,
+            "border_ids": ids[np.concatenate((j[core_i], i[core_j]))],
+            "border_core": ids[np.concatenate((i[core_i], j[core_j]))],
+        })
+    return results
+
+# 타일별 결과 → 전역 라벨 (dbscan_on_graph와 같은 규칙)
+# 같은 핵심점을 포함한 타일별 연결요소끼리 합쳐 타일 경계를 넘는 군집을 복원
+def _stitch_hotspot_tiles(n, parts, lat, lng):
+    core = np.zeros(n, dtype=bool)
+    labels = np.full(n, -1, dtype="int64")
+    point_nodes, comp_nodes, border_ids, border_core = [], [], [], []
+    offset = n
+    for part in parts:
+        core[part["owned_core"]] = True
+        point_nodes.append(part["core_ids"])
+        comp_nodes.append(part["core_comp"] + offset)
+        offset += (part["core_comp"].max() + 1) if len(part["core_comp"]) else 0
+        border_ids.append(part["border_ids"])
+        border_core.append(part["border_core"])
+
+    core_idx = np.flatnonzero(core)
+    if len(core_idx):
+        a, b = np.concatenate(point_nodes), np.concatenate(comp_nodes)
+        adjacency = csr_matrix((np.ones(len(a), dtype="int8"), (a, b)), shape=(offset, offset))
+        _, comp = connected_components(adjacency, directed=False)
+        _, comp = np.unique(comp[core_idx], return_inverse=True)
+
+        first = np.full(comp.max() + 1, n, dtype="int64")
+        np.minimum.at(first, comp, core_idx)
+        rank = np.empty(len(first), dtype="int64")
+        rank[np.argsort(first)] = np.arange(len(first))
+        labels[core_idx] = rank[comp]
+
+        border_label = np.full(n, np.iinfo("int64").max, dtype="int64")
+        np.minimum.at(border_label, np.concatenate(border_ids), labels[np.concatenate(border_core)])
+        border = border_label != np.iinfo("int64").max
+        labels[border] = border_label[border]
+
+    is_hotspot = labels != -1
+    center_lat = np.full(n, np.nan)
+    center_lng = np.full(n, np.nan)
+    if is_hotspot.any():
+        members = labels[is_hotspot]
+        counts = np.bincount(members)
+        center_lat[is_hotspot] = (np.bincount(members, weights=lat[is_hotspot]) / counts)[members]
+        center_lng[is_hotspot] = (np.bincount(members, weights=lng[is_hotspot]) / counts)[members]
+    return labels, is_hotspot, center_lat, center_lng
+
+# compute_hotspot_columns의 타일 분할 버전 (전국 단위 데이터용, 결과 동일)
+# 타일마다 2 × 최대 eps 만큼 halo를 붙여 병렬로 처리하므로 worker 메모리는 타일 크기에 비례
+def compute_hotspot_columns_tiled(df_all, lat_col='lat', lon_col='lng', cohorts=None,
+                                  tile_m=TL.TILE_SIZE_M, workers=None):
+    cohorts = HOTSPOT_COHORTS if cohorts is None else cohorts
+    lat = pd.to_numeric(df_all[lat_col], errors="coerce").to_numpy(dtype="float64")
+    lng = pd.to_numeric(df_all[lon_col], errors="coerce").to_numpy(dtype="float64")
+    age = pd.to_numeric(df_all['acdnt_age_1_code'], errors="coerce").to_numpy(dtype="float64")
+    x, y = project_xy(lat, lng)
+
+    masks = _cohort_masks(age, cohorts)
+    stacked = np.vstack(list(masks.values()))
+    params = [(c["eps_m"], c["min_samples"]) for c in cohorts.values()]
+    tiled = TL.TiledPoints(x, y, tile_m)
+    halo_m = TL.halo_for(2 * max(eps_m for eps_m, _ in params))
+
+    def tasks():
+        for key in tiled.tiles():
+            ids = tiled.around(key, halo_m)
+            owned = np.isin(ids, tiled.owned(key), assume_unique=True)
+            yield ids, x[ids], y[ids], owned, tiled.bounds(key), params, stacked[:, ids]
+
+    if workers == 1:
+        tile_results = [_hotspot_tile(*task) for task in tasks()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tile_results = list(pool.map(_hotspot_tile, *zip(*tasks())))
+    print(f"↘︎ hotspot 타일 {len(tile_results)}개 처리 완료 (타일 {tile_m / 1000:g}km, halo {halo_m:.0f}m)")
+
+    columns = {}
+    for c, (prefix, mask) in enumerate(masks.items()):
+        _, is_hotspot, center_lat, center_lng = _stitch_hotspot_tiles(
+            len(df_all), [result[c] for result in tile_results], lat, lng
+        )
+        flag_col, lat_out, lng_out = hotspot_columns(prefix)
+        columns[flag_col] = np.where(mask, is_hotspot.astype("float64"), np.nan)
+        columns[lat_out] = center_lat
+        columns[lng_out] = center_lng
+    return columns
+
+# 고령/비고령/전체 기준 hotspot 분석 및 병합
+# 이미 hotspot 컬럼이 있으면(재실행) 지우고 다시 계산, 결과는 행 위치 그대로 붙임 (merge 없음)
+# tile_m: 지정 시 타일 분할 병렬 계산 (전국 단위)
+def assign_hotspot_columns(df_all, lat_col='lat', lon_col='lng', id_col='acdnt_no', tile_m=None, workers=None):
+    print("====> Hotspot 분석 중...")
 
-    all_drivers = df_all.copy()
-    all_drivers = cluster_and_mark(all_drivers, lat_col, lon_col, eps_m=50, min_samples=5)
-    all_drivers = all_drivers[[id_col, 'is_hotspot', 'hotspot_center_lat', 'hotspot_center_lng']]
-    all_drivers.columns = [id_col, 'all_hotspot', 'all_hotspot_lat', 'all_hotspot_lng']
+    existing = [c for prefix in HOTSPOT_COHORTS for c in hotspot_columns(prefix) if c in df_all.columns]
+    df_all = df_all.drop(columns=existing)
 
-    # 병합하여 df_all에 직접 추가
-    df_all = df_all.merge(elderly, on=id_col, how='left')
-    df_all = df_all.merge(non_elderly, on=id_col, how='left')
-    df_all = df_all.merge(all_drivers, on=id_col, how='left')
+    with PF.measure("hotspot_cluster", rows=len(df_all)):
+        if tile_m:
+            columns = compute_hotspot_columns_tiled(df_all, lat_col, lon_col, tile_m=tile_m, workers=workers)
+        else:
+            columns = compute_hotspot_columns(df_all, lat_col, lon_col)
+    df_all = pd.concat([df_all, pd.DataFrame(columns, index=df_all.index)], axis=1)
 
     # 저장
-    df_all.to_csv("./data/processed/accident_data_all.csv", index=False, encoding="utf-8-sig")
-    print(f"====> hotspot 컬럼 포함 저장 완료")
\ No newline at end of file
+    with PF.measure("hotspot_write", rows=len(df_all)):
+        output_path = ST.write_table(df_all, "./data/processed/accident_data_all")
+    print(f"====> hotspot 컬럼 포함 저장 완료: {output_path}")
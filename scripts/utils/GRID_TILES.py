@@ -0,0 +1,183 @@
+# 대시보드용 격자 칸 집계 (계층형 정사각 격자, EPSG:5179)
+# - 가장 작은 칸(BASE_CELL_M)에서 사고를 한 번 집계한 뒤 2배씩 큰 칸으로 합산 (칸 경계가 정확히 포개짐)
+#   h3 육각 격자 대신, 추가 의존성 없이 부모 칸 = 자식 칸 좌표 // 2 인 정사각 격자 사용
+# - 칸별: 사고 건수, 고령(65세 이상) / 비고령 건수, 플래그 비율, 평균 교통량, 칸 중심 위경도
+# - 해상도별 파일(data/processed/grid/grid_{크기}m)을 칸 키(cell_x, cell_y 순) 정렬로 저장
+# - GridTiles.query(): 화면 범위 안의 칸만 정렬 키 이진 탐색으로 조회 (줌 레벨 → 해상도 자동 선택)
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import ACCIDENT_STORE as AS
+from . import GEO_UTILS as GU
+from . import STORAGE as ST
+
+INPUT_PATH = "./data/processed/accident_data_filtered"
+OUTPUT_DIR = "./data/processed/grid"
+
+GRID_EPSG = 5179
+BASE_CELL_M = 125
+LEVELS = 6              # 125m ~ 4km
+KEY_STRIDE = 1 << 32    # cell_key = cell_x * KEY_STRIDE + cell_y (EPSG:5179 좌표는 양수)
+
+AGE_COL = "acdnt_age_1_code"
+ELDERLY_AGE = 65
+VOLUME_COL = "traffic_volume"
+FLAG_COLUMNS = ["near_crosswalk", "near_traffic_light", "near_child_zone", "near_elderly_zone", "near_disabled_zone",
+                "elderly_hotspot", "non_elderly_hotspot", "all_hotspot"]
+
+# 화면에서 칸 하나가 차지할 대략적인 크기 (px), 웹 메르카토르 줌 0의 적도 기준 m/px
+CELL_PX = 24
+WEB_MERCATOR_M_PER_PX = 156543.03392
+
+
+def cell_sizes(base_m=BASE_CELL_M, levels=LEVELS):
+    return [base_m * 2 ** level for level in range(levels)]
+
+
+def grid_path(cell_m, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, f"grid_{cell_m}m")
+
+
+# 위경도 → cell_m 크기 칸 좌표 (EPSG:5179 좌표 // cell_m)
+def cell_xy(lat, lng, cell_m):
+    x, y = GU.project_xy(lat, lng, epsg_to=GRID_EPSG)
+    return np.floor(np.asarray(x) / cell_m).astype("int64"), np.floor(np.asarray(y) / cell_m).astype("int64")
+
+
+# 위경도 → 칸 키 (집계 파일의 cell_key와 같은 값, 좌표가 없으면 -1)
+def cell_keys(lat, lng, cell_m=BASE_CELL_M):
+    lat = np.asarray(lat, dtype="float64")
+    lng = np.asarray(lng, dtype="float64")
+    valid = np.isfinite(lat) & np.isfinite(lng)
+    keys = np.full(len(lat), -1, dtype="int64")
+    cx, cy = cell_xy(lat[valid], lng[valid], cell_m)
+    keys[valid] = cx * KEY_STRIDE + cy
+    return keys
+
+
+# 칸 좌표별 합계 (키 오름차순)
+def _sum_cells(cx, cy, sums):
+    keys, inverse = np.unique(cx * KEY_STRIDE + cy, return_inverse=True)
+    summed = {name: np.bincount(inverse, weights=values, minlength=len(keys)) for name, values in sums.items()}
+    return keys // KEY_STRIDE, keys % KEY_STRIDE, summed
+
+
+# 칸 합계 → 출력 테이블 (비율 / 평균 / 중심 위경도)
+def _cell_table(cx, cy, summed, cell_m):
+    lng, lat = GU.get_transformer(GRID_EPSG, 4326).transform((cx + 0.5) * cell_m, (cy + 0.5) * cell_m)
+    table = {
+        "cell_key": cx * KEY_STRIDE + cy,
+        "cell_x": cx,
+        "cell_y": cy,
+        "lat": np.asarray(lat, dtype="float32"),
+        "lng": np.asarray(lng, dtype="float32"),
+        "count": summed["count"].astype("int32"),
+        "elderly": summed["elderly"].astype("int32"),
+        "non_elderly": summed["non_elderly"].astype("int32"),
+    }
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for col in FLAG_COLUMNS:
+            if col in summed:
+                table[f"{col}_rate"] = (summed[col] / summed[f"{col}_n"]).astype("float32")
+        if "volume_n" in summed:
+            table[f"{VOLUME_COL}_mean"] = (summed["volume_sum"] / summed["volume_n"]).astype("float32")
+    return pd.DataFrame(table)
+
+
+# 해상도별 칸 집계 테이블 {칸 크기(m): DataFrame}
+def aggregate_cells(store, sizes=None):
+    sizes = sorted(sizes or cell_sizes())
+    if any(size % sizes[0] or (size // sizes[0]) & (size // sizes[0] - 1) for size in sizes):
+        raise ValueError(f"칸 크기는 가장 작은 칸의 2의 거듭제곱 배여야 합니다: {sizes}")
+
+    lat, lng = store.float_values("lat"), store.float_values("lng")
+    valid = np.isfinite(lat) & np.isfinite(lng)
+    cx, cy = cell_xy(lat[valid], lng[valid], sizes[0])
+
+    sums = {
+        "count": np.ones(len(cx)),
+        "elderly": store.between(AGE_COL, ELDERLY_AGE)[valid] if AGE_COL in store.arrays else np.zeros(len(cx)),
+        "non_elderly": store.between(AGE_COL, None, ELDERLY_AGE)[valid] if AGE_COL in store.arrays else np.zeros(len(cx)),
+    }
+    for col in FLAG_COLUMNS:
+        if col in store.arrays:
+            known = store.valid(col)[valid]
+            sums[col] = ((store.arrays[col][valid] == 1) & known).astype("float64")
+            sums[f"{col}_n"] = known.astype("float64")
+    if VOLUME_COL in store.arrays:
+        volume = store.float_values(VOLUME_COL)[valid]
+        sums["volume_sum"] = np.nan_to_num(volume)
+        sums["volume_n"] = np.isfinite(volume).astype("float64")
+
+    tables = {}
+    cx, cy, summed = _sum_cells(cx, cy, sums)
+    tables[sizes[0]] = _cell_table(cx, cy, summed, sizes[0])
+    for prev, size in zip(sizes, sizes[1:]):
+        factor = size // prev
+        cx, cy, summed = _sum_cells(cx // factor, cy // factor, summed)
+        tables[size] = _cell_table(cx, cy, summed, size)
+    return tables
+
+
+# 필터링된 사고 데이터 → 해상도별 격자 집계 파일 저장
+def build_grid_aggregates(input_path=INPUT_PATH, output_dir=OUTPUT_DIR, sizes=None):
+    if not ST.exists(input_path):
+        print(f"⚠️ 사고 데이터 파일이 존재하지 않습니다: {input_path}")
+        return []
+
+    columns = ["lat", "lng", AGE_COL, VOLUME_COL, *FLAG_COLUMNS]
+    available = set(ST.available_columns(input_path))
+    store = AS.AccidentStore.load(input_path, columns=[c for c in columns if c in available])
+
+    paths = []
+    for size, table in aggregate_cells(store, sizes).items():
+        paths.append(ST.write_table(table, grid_path(size, output_dir)))
+        print(f"  [{size}m] {len(table):,}칸")
+    print(f"===> 격자 집계 저장 완료: {output_dir} (사고 {len(store):,}건)")
+    return paths
+
+
+class GridTiles:
+    def __init__(self, tables):
+        self.tables = tables                                   # 칸 크기 → cell_key 정렬 DataFrame
+        self.keys = {size: df["cell_key"].to_numpy() for size, df in tables.items()}
+        self.sizes = sorted(tables)
+
+    @classmethod
+    def load(cls, output_dir=OUTPUT_DIR, sizes=None):
+        paths = {size: grid_path(size, output_dir) for size in sizes or cell_sizes()}
+        return cls({size: ST.read_table(path) for size, path in paths.items() if ST.exists(path)})
+
+    # 줌 레벨에서 칸이 약 CELL_PX 크기로 보이는 해상도
+    def size_for_zoom(self, zoom, lat=37.55):
+        target_m = WEB_MERCATOR_M_PER_PX * np.cos(np.radians(lat)) / 2 ** zoom * CELL_PX
+        return min(self.sizes, key=lambda size: abs(np.log(size / target_m)))
+
+    # 화면 범위(위경도) 안의 칸 (zoom 또는 cell_m 중 하나로 해상도 지정)
+    def query(self, min_lat, min_lng, max_lat, max_lng, zoom=None, cell_m=None, columns=None):
+        if cell_m is None:
+            if zoom is None:
+                raise ValueError("zoom 또는 cell_m을 지정해야 합니다.")
+            cell_m = self.size_for_zoom(zoom, (min_lat + max_lat) / 2)
+        if cell_m not in self.tables:
+            raise ValueError(f"집계되지 않은 칸 크기입니다: {cell_m}m (가능: {self.sizes})")
+
+        # 위경도 사각형의 네 모서리 + 변 중점을 평면 좌표로 변환해 감싸는 칸 범위
+        mid_lat, mid_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+        lats = np.array([min_lat, min_lat, max_lat, max_lat, min_lat, max_lat, mid_lat, mid_lat])
+        lngs = np.array([min_lng, max_lng, min_lng, max_lng, mid_lng, mid_lng, min_lng, max_lng])
+        x, y = GU.project_xy(lats, lngs, epsg_to=GRID_EPSG)
+        cx0, cx1 = np.floor(np.min(x) / cell_m).astype("int64"), np.floor(np.max(x) / cell_m).astype("int64")
+        cy0, cy1 = np.floor(np.min(y) / cell_m).astype("int64"), np.floor(np.max(y) / cell_m).astype("int64")
+
+        keys = self.keys[cell_m]
+        columns_x = np.arange(cx0, cx1 + 1, dtype="int64")
+        lo = np.searchsorted(keys, columns_x * KEY_STRIDE + cy0)
+        hi = np.searchsorted(keys, columns_x * KEY_STRIDE + cy1, side="right")
+        counts = hi - lo
+        rows = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        table = self.tables[cell_m]
+        return table.iloc[rows] if columns is None else table.iloc[rows][columns]
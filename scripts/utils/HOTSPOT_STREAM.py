@@ -0,0 +1,506 @@
+# 증분 hotspot 갱신
+# - 새 사고 배치가 들어오면 전체 DBSCAN을 다시 돌리지 않고, 배치 주변 이웃만 다시 계산
+# - 배치 1개의 비용은 배치 크기(+ 배치가 닿은 이웃 / 합쳐진 군집의 경계점)에 비례하고 누적 행 수와 무관
+#   · 행별 배열: 용량을 두 배씩 늘리며 뒤에 이어 씀 (전체 복사는 용량이 찰 때만)
+#   · 격자 버킷: 배치마다 (격자 번호, 행 번호) 정렬 조각을 추가하고, 크기가 비슷한 조각끼리만 병합 (조각 수 O(log n))
+#   · 군집: union-find (흡수된 군집은 parent만 바꾸고, 행의 군집 번호는 조회할 때 루트로 해석)
+# - 상태는 배열별 .npy 파일을 메모리 맵으로 열어 배치가 건드린 부분만 읽고 씀
+# - 라벨 규칙은 GEO_UTILS.dbscan_on_graph(= sklearn DBSCAN)와 동일해 전체 재계산 결과와 같음
+#   · 삽입만 있으므로 군집은 합쳐지기만 함 (분할은 삭제 시에만 발생)
+#   · 군집 번호 = 군집 내 가장 작은 핵심점 행 번호 (= union-find 루트), 경계점은 인접 군집 중 번호가 가장 작은 군집에 소속
+#   · 군집이 흡수되면 번호가 작아지므로, 두 군집 이상에 닿은 경계점(군집별 목록)만 다시 확인
+import os
+import json
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from . import GEO_UTILS as GU
+
+STATE_DIR = "./data/cache/hotspot_state"
+
+# 이웃 검색 시 한 번에 처리할 점 수 (메모리 상한)
+QUERY_CHUNK = 20_000
+
+# 전체 생성 시 한 번에 삽입할 행 수
+BUILD_CHUNK = 50_000
+
+# 배열을 처음 만들 때의 최소 용량
+MIN_CAPACITY = 1024
+
+# 격자 번호를 양수로 만들기 위한 offset
+_CELL_OFFSET = 1 << 31
+
+# 배열 이름 → (dtype, 빈 칸 값)
+_ROW_ARRAYS = {
+    "ids": ("int64", -1), "lat": ("float64", np.nan), "lng": ("float64", np.nan),
+    "x": ("float64", np.nan), "y": ("float64", np.nan), "age": ("float64", np.nan), "valid": ("bool", False),
+}
+_COHORT_ARRAYS = {
+    "degree": ("int64", 0),          # 자기 자신 포함 eps 이내 이웃 수
+    "core": ("bool", False),         # 핵심점 여부
+    "parent": ("int64", -1),         # 핵심점의 union-find 부모 (루트 = 군집 번호)
+    "label": ("int64", -1),          # 행별 소속 군집 (-1: 노이즈, 흡수됐을 수 있으므로 루트로 해석해서 사용)
+    "sum_lat": ("float64", 0.0),     # 군집(루트)별 위도 합
+    "sum_lng": ("float64", 0.0),     # 군집(루트)별 경도 합
+    "count": ("int64", 0),           # 군집(루트)별 소속 점 수
+    "shared_head": ("int64", -1),    # 군집(루트)별 공유 경계점 목록의 첫 / 마지막 노드
+    "shared_tail": ("int64", -1),
+}
+# 공유 경계점 목록 노드 (군집별 연결 리스트, 노드는 뒤에 이어 쓰기만 함)
+_SHARED_ARRAYS = {"shared_row": ("int64", -1), "shared_next": ("int64", -1)}
+
+
+def _spec(name):
+    base = name.split("__")[-1]
+    return {**_ROW_ARRAYS, **_COHORT_ARRAYS, **_SHARED_ARRAYS}[base]
+
+
+class HotspotState:
+    def __init__(self, cohorts=None):
+        self.cohorts = dict(GU.HOTSPOT_COHORTS if cohorts is None else cohorts)
+        self.cell_m = float(max(c["eps_m"] for c in self.cohorts.values()))
+        self.n = 0
+        # 호출하는 쪽에서 상태와 함께 저장할 값 (원본 데이터 버전 등)
+        self.meta = {}
+        self.state_dir = None
+        self.arrays = {}
+        for name in self._row_names():
+            self.arrays[name] = np.full(0, _spec(name)[1], dtype=_spec(name)[0])
+        self.shared_n = {prefix: 0 for prefix in self.cohorts}
+        for name in self._shared_names():
+            self.arrays[name] = np.full(0, _spec(name)[1], dtype=_spec(name)[0])
+        # 격자 버킷 조각: {"id": 파일 번호(저장 전 None), "keys": 격자 번호 오름차순, "rows": 행 번호}
+        self.segments = []
+        self.next_segment = 0
+
+    # 행 수만큼 용량을 갖는 배열 이름 / 공유 경계점 노드 배열 이름
+    def _row_names(self):
+        return list(_ROW_ARRAYS) + [f"{prefix}__{name}" for prefix in self.cohorts for name in _COHORT_ARRAYS]
+
+    def _shared_names(self):
+        return [f"{prefix}__{name}" for prefix in self.cohorts for name in _SHARED_ARRAYS]
+
+    def _cohort(self, prefix):
+        return {name: self.arrays[f"{prefix}__{name}"] for name in (*_COHORT_ARRAYS, *_SHARED_ARRAYS)}
+
+    # 전체 사고 데이터로 상태 생성 (빈 상태에 BUILD_CHUNK 행씩 나눠 삽입, 이웃 쌍을 한꺼번에 만들지 않아 메모리 절약)
+    @classmethod
+    def build(cls, df_all, lat_col="lat", lng_col="lng", id_col="acdnt_no", cohorts=None):
+        state = cls(cohorts)
+        for start in range(0, len(df_all), BUILD_CHUNK):
+            state.insert(df_all.iloc[start:start + BUILD_CHUNK], lat_col, lng_col, id_col)
+        return state
+
+    # 대상(고령/비고령/전체) 소속 여부 (좌표 유무와 무관)
+    def _in_cohort(self, prefix, rows):
+        cohort = self.cohorts[prefix]
+        age = self.arrays["age"][rows]
+        mask = np.ones(len(rows), dtype=bool)
+        if cohort["min_age"] is not None:
+            mask &= age >= cohort["min_age"]
+        if cohort["max_age"] is not None:
+            mask &= age < cohort["max_age"]
+        return mask
+
+    # 대상 소속 + 좌표 있음 (군집 계산 대상)
+    def _member(self, prefix, rows):
+        return self._in_cohort(prefix, rows) & self.arrays["valid"][rows]
+
+    def _cell_keys(self, x, y):
+        cx = np.floor(x / self.cell_m).astype("int64") + _CELL_OFFSET
+        cy = np.floor(y / self.cell_m).astype("int64") + _CELL_OFFSET
+        return (cx << 32) | cy
+
+    # 배열 용량 변경 (메모리 맵 상태면 새 파일에 옮겨 쓰고 교체)
+    def _resize(self, name, capacity):
+        old = self.arrays[name]
+        dtype, fill = _spec(name)
+        if self.state_dir is None:
+            new = np.full(capacity, fill, dtype=dtype)
+            new[:len(old)] = old
+        else:
+            path = self._array_path(self.state_dir, name)
+            new = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=dtype, shape=(capacity,))
+            new[len(old):] = fill
+            new[:len(old)] = old
+            new.flush()
+            os.replace(path + ".tmp", path)
+        self.arrays[name] = new
+
+    def _reserve(self, names, needed):
+        capacity = len(self.arrays[names[0]])
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, MIN_CAPACITY)
+        for name in names:
+            self._resize(name, capacity)
+
+    # 새 격자 조각 추가 후, 마지막 조각이 바로 앞 조각의 절반 이상이면 병합
+    # → 조각 크기가 앞에서부터 절반 이하로 줄어들어 조각 수는 O(log n), 행마다 병합 횟수도 O(log n)
+    def _add_segment(self, keys, rows):
+        if len(keys) == 0:
+            return
+        self.segments.append({"id": None, "keys": keys, "rows": rows})
+        while len(self.segments) >= 2 and 2 * len(self.segments[-1]["keys"]) >= len(self.segments[-2]["keys"]):
+            older, newer = self.segments[-2:]
+            keys = np.concatenate([older["keys"], newer["keys"]])
+            rows = np.concatenate([older["rows"], newer["rows"]])
+            order = np.argsort(keys, kind="stable")
+            self.segments[-2:] = [{"id": None, "keys": keys[order], "rows": rows[order]}]
+
+    # rows 각 점의 이웃 (행 번호 쌍, float32 거리), 격자 한 칸 크기(가장 큰 eps) 이내, 자기 자신 제외
+    # 거리 계산은 NeighborGraph와 같은 방식이라 전체 재계산과 같은 간선을 만듦
+    def _neighbors(self, rows):
+        rows = np.asarray(rows, dtype="int64")
+        rows = rows[self.arrays["valid"][rows]]
+        x, y = self.arrays["x"], self.arrays["y"]
+        # 격자 번호 순으로 질의하면 조회 위치가 가까워 캐시 효율이 좋음
+        rows = rows[np.argsort(self._cell_keys(x[rows], y[rows]), kind="stable")]
+        out_q, out_nb, out_d = [], [], []
+        for start in range(0, len(rows), QUERY_CHUNK):
+            q = rows[start:start + QUERY_CHUNK]
+            qx, qy = x[q], y[q]
+            base = self._cell_keys(qx, qy)
+            q_parts, cand_parts = [], []
+            for segment in self.segments:
+                grid_keys, grid_rows = segment["keys"], segment["rows"]
+                # 같은 x 열의 세 칸(y-1, y, y+1)은 격자 번호가 연속 → 열마다 범위 하나로 조회
+                for dx in (-1, 0, 1):
+                    column = base + (dx << 32)
+                    lo = np.searchsorted(grid_keys, column - 1, "left")
+                    hi = np.searchsorted(grid_keys, column + 1, "right")
+                    counts = hi - lo
+                    total = counts.sum()
+                    if total == 0:
+                        continue
+                    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                    q_parts.append(np.repeat(np.arange(len(q)), counts))
+                    cand_parts.append(grid_rows[np.repeat(lo, counts) + offsets])
+            if not q_parts:
+                continue
+            qi, nb = np.concatenate(q_parts), np.concatenate(cand_parts)
+            dist = np.hypot(qx[qi] - x[nb], qy[qi] - y[nb])
+            qi = q[qi]
+            keep = (dist <= self.cell_m) & (qi != nb)
+            out_q.append(qi[keep])
+            out_nb.append(nb[keep])
+            out_d.append(dist[keep].astype("float32"))
+        if not out_q:
+            return np.empty(0, "int64"), np.empty(0, "int64"), np.empty(0, "float32")
+        return np.concatenate(out_q), np.concatenate(out_nb), np.concatenate(out_d)
+
+    def _append(self, batch_df, lat_col, lng_col, id_col):
+        lat = pd.to_numeric(batch_df[lat_col], errors="coerce").to_numpy(dtype="float64")
+        lng = pd.to_numeric(batch_df[lng_col], errors="coerce").to_numpy(dtype="float64")
+        age = pd.to_numeric(batch_df["acdnt_age_1_code"], errors="coerce").to_numpy(dtype="float64")
+        x, y = GU.project_xy(lat, lng)
+        valid = np.isfinite(x) & np.isfinite(y)
+        new_rows = np.arange(self.n, self.n + len(batch_df))
+
+        self._reserve(self._row_names(), self.n + len(batch_df))
+        values = {
+            "ids": pd.to_numeric(batch_df[id_col]).to_numpy(dtype="int64"),
+            "lat": lat, "lng": lng, "x": x, "y": y, "age": age, "valid": valid,
+        }
+        for name, column in values.items():
+            self.arrays[name][new_rows] = column
+        self.n += len(batch_df)
+
+        # 격자 버킷: 새 점만 정렬한 조각 추가
+        keys = self._cell_keys(x[valid], y[valid])
+        order = np.argsort(keys, kind="stable")
+        self._add_segment(keys[order], new_rows[valid][order])
+        return new_rows
+
+    # 새 사고 배치 삽입 → (변경된 행, 바뀐 군집)
+    # 배치는 accident_data_all과 같은 전처리를 거친 행이어야 하며, 기존 행 뒤에 순서대로 붙는 것으로 간주
+    # 변경된 행: 새 행 + 소속(hotspot 여부 / 군집)이 바뀐 기존 행
+    # 바뀐 군집: 중심이 바뀐 군집 + 다른 군집에 흡수된 군집(merged_into), 흡수된 군집 소속 행은 따로 나열하지 않음
+    def insert(self, batch_df, lat_col="lat", lng_col="lng", id_col="acdnt_no"):
+        self._mark_dirty()
+        new_rows = self._append(batch_df, lat_col, lng_col, id_col)
+
+        # 새 점과 기존 점 사이 간선 (기존 점은 항상 새 점보다 행 번호가 작고, 새 점끼리는 한 번만)
+        qi, nb, dist = self._neighbors(new_rows)
+        once = nb < qi
+        pairs = (qi[once], nb[once], dist[once])
+
+        changed, clusters = {}, {}
+        for prefix in self.cohorts:
+            changed[prefix], clusters[prefix] = self._insert_cohort(prefix, new_rows, pairs)
+        return self._changes(new_rows, changed), self._centers(clusters)
+
+    def _insert_cohort(self, prefix, new_rows, pairs):
+        st = self._cohort(prefix)
+        eps_m = self.cohorts[prefix]["eps_m"]
+        min_samples = self.cohorts[prefix]["min_samples"]
+        new_members = new_rows[self._member(prefix, new_rows)]
+
+        # 1. 이웃 수 / 핵심점 갱신 (이웃 수는 새 점과 그 이웃에서만 바뀜)
+        qi, nb, dist = pairs
+        sel = (dist <= eps_m) & self._member(prefix, qi) & self._member(prefix, nb)
+        a, b = qi[sel], nb[sel]
+        st["degree"][new_members] = 1
+        np.add.at(st["degree"], a, 1)
+        np.add.at(st["degree"], b, 1)
+        grown = np.unique(np.concatenate([new_members, a, b]))
+        newly = grown[(st["degree"][grown] >= min_samples) & ~st["core"][grown]]
+        st["core"][newly] = True
+        st["parent"][newly] = newly
+
+        # 새로 핵심점이 된 점의 전체 이웃 (핵심점 간 간선, 경계점 후보)
+        nq, nn = self._cohort_neighbors(prefix, newly, eps_m)
+
+        # 2. 군집 병합: 새 핵심점은 자기 자신을 번호로 하는 군집에서 시작, 연결된 군집 중 번호가 가장 작은 군집이 흡수
+        ea, eb = np.concatenate([a, nq]), np.concatenate([b, nn])
+        core_edge = st["core"][ea] & st["core"][eb]
+        ra, rb = self._find(st["parent"], ea[core_edge]), self._find(st["parent"], eb[core_edge])
+        nodes = np.unique(np.concatenate([ra, rb, newly]))
+
+        merged = pd.Series(dtype="int64")
+        recheck = np.empty(0, dtype="int64")
+        if len(nodes):
+            pa, pb = np.searchsorted(nodes, ra), np.searchsorted(nodes, rb)
+            graph = csr_matrix((np.ones(len(pa), dtype="int8"), (pa, pb)), shape=(len(nodes), len(nodes)))
+            _, group = connected_components(graph, directed=False)
+            # nodes는 오름차순이므로 그룹에서 처음 나오는 노드가 번호가 가장 작은 군집
+            _, first = np.unique(group, return_index=True)
+            into = nodes[first][group]
+            absorbed = nodes != into
+            gone, into = nodes[absorbed], into[absorbed]
+
+            if len(gone):
+                # 흡수된 군집은 번호가 작아짐 → 그 군집과 다른 군집에 함께 닿은 경계점의 소속이 바뀔 수 있음
+                recheck = self._pop_shared(st, gone)
+                visible = st["count"][gone] > 0
+                merged = pd.Series(into[visible], index=gone[visible])
+                st["parent"][gone] = into
+                for name in ("sum_lat", "sum_lng", "count"):
+                    np.add.at(st[name], into, st[name][gone])
+                    st[name][gone] = 0
+
+        # 3. 경계점 재계산 대상: 새 비핵심점 + 새 핵심점의 비핵심 이웃 + 흡수된 군집의 공유 경계점
+        candidates = np.unique(np.concatenate([new_members, nn, recheck]))
+        candidates = candidates[~st["core"][candidates]]
+        cq, cn = self._cohort_neighbors(prefix, candidates, eps_m)
+        to_core = st["core"][cn]
+        cq, cn = cq[to_core], cn[to_core]
+        adjacent = np.unique(np.column_stack([cq, self._find(st["parent"], cn)]), axis=0)
+        border_rows, first, n_adjacent = np.unique(adjacent[:, 0], return_index=True, return_counts=True)
+        cand_label = np.full(len(candidates), -1, dtype="int64")
+        cand_label[np.searchsorted(candidates, border_rows)] = adjacent[first, 1]
+        shared = np.repeat(n_adjacent >= 2, n_adjacent)
+        self._push_shared(prefix, adjacent[shared, 0], adjacent[shared, 1])
+
+        # 4. 소속 변경 반영 (중심좌표 합계 증감)
+        rows = np.concatenate([candidates, newly])
+        new = np.concatenate([cand_label, self._find(st["parent"], newly)])
+        old = st["label"][rows]
+        hot = old >= 0
+        old[hot] = self._find(st["parent"], old[hot])
+        st["label"][rows] = new
+        diff = old != new
+        rows, old, new = rows[diff], old[diff], new[diff]
+        for labels, sign in ((old, -1), (new, 1)):
+            ok = labels >= 0
+            np.add.at(st["sum_lat"], labels[ok], sign * self.arrays["lat"][rows[ok]])
+            np.add.at(st["sum_lng"], labels[ok], sign * self.arrays["lng"][rows[ok]])
+            np.add.at(st["count"], labels[ok], sign)
+
+        touched = np.unique(np.concatenate([self._find(st["parent"], nodes), old[old >= 0], new[new >= 0]]))
+        touched = touched[st["count"][touched] > 0]
+        return rows, {"touched": touched, "merged": merged}
+
+    # 같은 대상 내 eps 이내 이웃 (질의점, 이웃)
+    def _cohort_neighbors(self, prefix, rows, eps_m):
+        qi, nb, dist = self._neighbors(rows)
+        keep = self._member(prefix, nb) & (dist <= eps_m)
+        return qi[keep], nb[keep]
+
+    # union-find 루트 (조회한 행은 루트를 바로 가리키도록 경로 압축)
+    @staticmethod
+    def _find(parent, rows):
+        rows = np.asarray(rows, dtype="int64")
+        roots = rows
+        up = parent[roots]
+        while True:
+            moving = up != roots
+            if not moving.any():
+                break
+            roots = np.where(moving, up, roots)
+            up = parent[roots]
+        parent[rows] = roots
+        return roots
+
+    # 두 군집 이상에 닿은 경계점을 각 군집 목록 끝에 추가
+    def _push_shared(self, prefix, rows, roots):
+        if len(rows) == 0:
+            return
+        names = [f"{prefix}__{name}" for name in _SHARED_ARRAYS]
+        start = self.shared_n[prefix]
+        self._reserve(names, start + len(rows))
+        st = self._cohort(prefix)
+        head, tail, node_row, node_next = st["shared_head"], st["shared_tail"], st["shared_row"], st["shared_next"]
+        for node, (row, root) in enumerate(zip(rows.tolist(), roots.tolist()), start=start):
+            node_row[node] = row
+            if head[root] < 0:
+                head[root] = node
+            else:
+                node_next[tail[root]] = node
+            tail[root] = node
+        self.shared_n[prefix] = start + len(rows)
+
+    # 군집들의 공유 경계점 목록을 꺼내고 비움 (다시 확인한 뒤 여전히 공유면 새 군집 목록에 다시 추가됨)
+    @staticmethod
+    def _pop_shared(st, roots):
+        head, tail, node_row, node_next = st["shared_head"], st["shared_tail"], st["shared_row"], st["shared_next"]
+        rows = []
+        for root in roots.tolist():
+            node = int(head[root])
+            while node >= 0:
+                rows.append(int(node_row[node]))
+                node = int(node_next[node])
+            head[root] = tail[root] = -1
+        return np.unique(np.array(rows, dtype="int64"))
+
+    # 행별 hotspot 컬럼 (GEO_UTILS.compute_hotspot_columns와 같은 형식), with_cluster면 군집 번호 컬럼 추가
+    def _row_columns(self, rows, with_cluster=False):
+        columns = {}
+        for prefix in self.cohorts:
+            st = self._cohort(prefix)
+            label = st["label"][rows]
+            is_hotspot = label >= 0
+            label[is_hotspot] = self._find(st["parent"], label[is_hotspot])
+            members = label[is_hotspot]
+            center_lat = np.full(len(rows), np.nan)
+            center_lng = np.full(len(rows), np.nan)
+            center_lat[is_hotspot] = st["sum_lat"][members] / st["count"][members]
+            center_lng[is_hotspot] = st["sum_lng"][members] / st["count"][members]
+
+            flag_col, lat_col, lng_col = GU.hotspot_columns(prefix)
+            columns[flag_col] = np.where(self._in_cohort(prefix, rows), is_hotspot.astype("float64"), np.nan)
+            columns[lat_col] = center_lat
+            columns[lng_col] = center_lng
+            if with_cluster:
+                columns[f"{prefix}_cluster"] = label
+        return columns
+
+    # 전체 행의 hotspot 컬럼 (누적 행 수에 비례, 전체 파일을 다시 쓸 때만 사용)
+    def columns(self):
+        return self._row_columns(np.arange(self.n))
+
+    # 새 행 + 소속이 바뀐 기존 행의 hotspot 컬럼과 군집 번호
+    def _changes(self, new_rows, changed):
+        rows = np.unique(np.concatenate([new_rows, *changed.values()]))
+        result = pd.DataFrame({"row": rows, "acdnt_no": self.arrays["ids"][rows]})
+        for col, values in self._row_columns(rows, with_cluster=True).items():
+            result[col] = values
+        return result
+
+    # 이번 배치로 바뀐 군집의 중심좌표 + 흡수된 군집 (군집 번호 = 최소 핵심점 행 번호)
+    def _centers(self, clusters):
+        frames = []
+        for prefix, result in clusters.items():
+            st = self._cohort(prefix)
+            touched, merged = result["touched"], result["merged"]
+            count = st["count"][touched]
+            frames.append(pd.DataFrame({
+                "cohort": prefix, "cluster": touched, "size": count,
+                "center_lat": st["sum_lat"][touched] / count, "center_lng": st["sum_lng"][touched] / count,
+                "merged_into": -1,
+            }))
+            frames.append(pd.DataFrame({
+                "cohort": prefix, "cluster": merged.index.to_numpy(dtype="int64"), "size": 0,
+                "center_lat": np.nan, "center_lng": np.nan, "merged_into": merged.to_numpy(dtype="int64"),
+            }))
+        columns = ["cohort", "cluster", "size", "center_lat", "center_lng", "merged_into"]
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
+
+    @staticmethod
+    def _array_path(state_dir, name):
+        return os.path.join(state_dir, "arrays", f"{name}.npy")
+
+    @staticmethod
+    def _segment_path(state_dir, segment_id):
+        return os.path.join(state_dir, "grid", f"{segment_id}.npy")
+
+    def _write_params(self, state_dir, clean):
+        params = {
+            "cohorts": self.cohorts, "epsg": GU.HOTSPOT_EPSG, "n": self.n, "clean": clean,
+            "shared_n": self.shared_n, "segments": [s["id"] for s in self.segments],
+            "next_segment": self.next_segment, "meta": self.meta,
+        }
+        path = os.path.join(state_dir, "params.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(params, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    # 메모리 맵 배열을 제자리에서 고치기 전에 표시 (중간에 실패하면 다음 load에서 재생성하도록)
+    def _mark_dirty(self):
+        if self.state_dir is not None:
+            self._write_params(self.state_dir, clean=False)
+
+    # 저장: 처음 저장하는 디렉토리면 배열 전체를 쓰고 메모리 맵으로 다시 엶,
+    # 이미 메모리 맵으로 열린 상태면 바뀐 부분만 flush + 새 격자 조각만 기록
+    def save(self, state_dir=STATE_DIR):
+        os.makedirs(os.path.join(state_dir, "arrays"), exist_ok=True)
+        os.makedirs(os.path.join(state_dir, "grid"), exist_ok=True)
+        if self.state_dir != state_dir:
+            if os.path.exists(os.path.join(state_dir, "params.json")):
+                self._write_params(state_dir, clean=False)
+            for name, values in self.arrays.items():
+                np.save(self._array_path(state_dir, name), values)
+            for segment in self.segments:
+                segment["id"] = None
+            self.state_dir = state_dir
+            self._open_arrays()
+        else:
+            for values in self.arrays.values():
+                values.flush()
+
+        for segment in self.segments:
+            if segment["id"] is None:
+                segment["id"] = self.next_segment
+                self.next_segment += 1
+                np.save(self._segment_path(state_dir, segment["id"]), np.vstack([segment["keys"], segment["rows"]]))
+        self._write_params(state_dir, clean=True)
+
+        # 병합되어 더 이상 쓰지 않는 조각 파일 정리
+        current = {f"{s['id']}.npy" for s in self.segments}
+        for name in os.listdir(os.path.join(state_dir, "grid")):
+            if name not in current:
+                os.remove(os.path.join(state_dir, "grid", name))
+
+    def _open_arrays(self):
+        for name in [*self._row_names(), *self._shared_names()]:
+            self.arrays[name] = np.load(self._array_path(self.state_dir, name), mmap_mode="r+")
+
+    # 저장된 상태 로드 (파라미터가 바뀌었거나 이전 갱신이 중간에 실패했으면 None → 전체 재생성 필요)
+    @classmethod
+    def load(cls, state_dir=STATE_DIR, cohorts=None):
+        cohorts = dict(GU.HOTSPOT_COHORTS if cohorts is None else cohorts)
+        try:
+            with open(os.path.join(state_dir, "params.json"), encoding="utf-8") as f:
+                params = json.load(f)
+        except FileNotFoundError:
+            return None
+        if params["cohorts"] != cohorts or params["epsg"] != GU.HOTSPOT_EPSG or not params.get("clean"):
+            return None
+
+        state = cls(cohorts)
+        state.n = params["n"]
+        state.meta = params["meta"]
+        state.shared_n = params["shared_n"]
+        state.next_segment = params["next_segment"]
+        state.state_dir = state_dir
+        state._open_arrays()
+        for segment_id in params["segments"]:
+            data = np.load(cls._segment_path(state_dir, segment_id), mmap_mode="r")
+            state.segments.append({"id": segment_id, "keys": data[0], "rows": data[1]})
+        return state
@@ -0,0 +1,92 @@
+# 정적 기준 레이어(횡단보도/신호등/보호구역/교통량 지점) 공간 인덱스 디스크 캐시
+# - 원본 CSV 내용 해시를 키로 좌표 배열과 ECEF 좌표 배열(.npy)을 저장
+# - 배열은 memory-map 으로 읽어 여러 프로세스가 같은 페이지를 공유 (트리는 ECEF 배열을 복사 없이 참조)
+# - KDTree 노드 구조는 저장하지 않고 프로세스마다 다시 만듦 (기준 레이어 크기에서 수 ms,
+#   pickle로 저장하면 프로세스마다 트리 전체를 따로 역직렬화해 메모리를 공유하지 못함)
+import os
+import hashlib
+import shutil
+import tempfile
+
+import numpy as np
+
+from . import GEO_UTILS as GU
+from . import STORAGE as ST
+
+CACHE_DIR = "./data/cache/index"
+
+# 인덱스 저장 형식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 2
+
+
+# 파일 내용 해시 (sha256)
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# 캐시 키: 파일 내용 + 좌표 컬럼 + 필터 조건
+def _cache_key(path, lat_col, lng_col, filter_col, filter_val):
+    h = hashlib.sha256()
+    for part in (CACHE_VERSION, file_hash(path), lat_col, lng_col, filter_col, filter_val):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _load(cache_path):
+    lat = np.load(os.path.join(cache_path, "lat.npy"), mmap_mode="r")
+    lng = np.load(os.path.join(cache_path, "lng.npy"), mmap_mode="r")
+    rows = np.load(os.path.join(cache_path, "rows.npy"), mmap_mode="r")
+    xyz = np.load(os.path.join(cache_path, "xyz.npy"), mmap_mode="r")
+    return GU.ProximityIndex.from_arrays(lat, lng, rows, xyz)
+
+
+# 캐시 디렉토리 저장: write(임시 디렉토리)로 파일을 쓴 뒤 이름을 바꿔,
+# 동시에 실행 중인 워커가 반쯤 쓰인 캐시를 읽지 않도록 함 (특성 행렬 / 도로망 캐시도 사용)
+def write_cache_dir(cache_path, write):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=os.path.dirname(cache_path))
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # 다른 워커가 먼저 같은 캐시를 만든 경우
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _save(index, cache_path):
+    def write(tmp_path):
+        np.save(os.path.join(tmp_path, "lat.npy"), np.ascontiguousarray(index.lat))
+        np.save(os.path.join(tmp_path, "lng.npy"), np.ascontiguousarray(index.lng))
+        np.save(os.path.join(tmp_path, "rows.npy"), np.ascontiguousarray(index.rows))
+        np.save(os.path.join(tmp_path, "xyz.npy"), np.ascontiguousarray(index.tree.data))
+
+    write_cache_dir(cache_path, write)
+
+
+# 기준 레이어 인덱스 로드 (캐시가 없거나 원본이 바뀌었으면 새로 생성 후 저장)
+# filter_col / filter_val: 보호구역처럼 한 파일을 구분값으로 나눠 쓰는 경우
+def load_layer_index(path, lat_col="위도", lng_col="경도", filter_col=None, filter_val=None,
+                     cache_dir=CACHE_DIR):
+    path = ST.resolve(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    if filter_val is not None:
+        name = f"{name}_{filter_val}"
+    cache_path = os.path.join(cache_dir, f"{name}_{_cache_key(path, lat_col, lng_col, filter_col, filter_val)}")
+
+    if os.path.isdir(cache_path):
+        return _load(cache_path)
+
+    print(f"↘︎ [{name}] 공간 인덱스 캐시 생성 중...")
+    columns = [lat_col, lng_col] + ([filter_col] if filter_col is not None else [])
+    df = ST.read_table(path, columns=columns)
+    if filter_col is not None:
+        df = df[df[filter_col] == filter_val]
+    index = GU.ProximityIndex.from_df(df, lat_col, lng_col)
+    _save(index, cache_path)
+    return index
+
@@ -0,0 +1,239 @@
+# 서울 열린데이터광장 / UTIC OpenAPI 비동기 수집
+# - httpx.AsyncClient 하나의 연결 풀을 모든 엔드포인트가 공유 (동시 연결 수 MAX_CONNECTIONS)
+# - 서울 OpenAPI는 1000건 단위 페이지: 첫 페이지의 list_total_count로 나머지 페이지를 동시에 요청
+# - 응답 본문은 받는 대로 조각 단위로 파서에 넘기면서 캐시 파일에 기록 (본문 전체를 메모리에 모으지 않음)
+#   XML은 XMLPullParser로 <row> 단위로 읽고 바로 버림 (전체 트리를 만들지 않음)
+# - 원본 응답은 CACHE_DIR에 저장, max_age 이내면 재사용하고 지나면 ETag/Last-Modified로 재검증
+#
+# 로컬 점검: SEOUL_OPENAPI_URL / UTIC_OPENAPI_URL 환경변수로 대체 서버(scripts/dev/openapi_stub_server.py) 지정
+import os
+import ssl
+import json
+import time
+import asyncio
+import hashlib
+from functools import lru_cache, partial
+from contextlib import contextmanager
+from urllib.parse import urlencode
+import xml.etree.ElementTree as ET
+
+import certifi
+import httpx
+from dotenv import load_dotenv
+
+from . import CONSTANTS as CONST
+
+SEOUL_URL = os.getenv("SEOUL_OPENAPI_URL", "http://openapi.seoul.go.kr:8088")
+UTIC_URL = os.getenv("UTIC_OPENAPI_URL", "http://www.utic.go.kr")
+CACHE_DIR = "./data/cache/openapi"
+
+PAGE_SIZE = 1000
+MAX_CONNECTIONS = 8
+CACHE_MAX_AGE = 24 * 3600
+TIMEOUT = 30
+CHUNK_SIZE = 64 * 1024
+
+
+# .env는 프로세스당 한 번만 읽음
+@lru_cache(maxsize=1)
+def _load_env():
+    load_dotenv()
+
+
+def api_key(name):
+    _load_env()
+    return os.getenv(name)
+
+
+# certifi 인증서로 만든 SSL 컨텍스트 (프로세스당 한 번, 모든 클라이언트가 공유)
+@lru_cache(maxsize=1)
+def _ssl_context():
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def open_client(max_connections=MAX_CONNECTIONS, timeout=TIMEOUT):
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=timeout, verify=_ssl_context(), follow_redirects=True,
+    )
+
+
+# 원본 응답 디스크 캐시 (키: URL + 파라미터 해시, API 키가 파일에 남지 않도록 해시만 사용)
+class ResponseCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_age=CACHE_MAX_AGE):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+
+    def _paths(self, key):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{digest}.body"), os.path.join(self.cache_dir, f"{digest}.json")
+
+    # 캐시 메타 정보 (본문 파일이 없으면 캐시 없음으로 봄)
+    def load_meta(self, key):
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return meta if os.path.exists(body_path) else None
+
+    # 캐시된 본문을 조각 단위로 파서에 넘김
+    def parse(self, key, parser, chunk_size=CHUNK_SIZE):
+        body_path, _ = self._paths(key)
+        with open(body_path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                parser.feed(chunk)
+        return parser.close()
+
+    # 본문 기록용 파일 (임시 파일에 쓰고 끝까지 받았을 때만 교체, 중간에 실패하면 기존 캐시 유지)
+    @contextmanager
+    def writer(self, key, etag=None, last_modified=None):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        body_path, _ = self._paths(key)
+        tmp_path = f"{body_path}.{os.getpid()}.{id(self)}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                yield f
+            os.replace(tmp_path, body_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.touch(key, etag, last_modified)
+
+    # 재검증 결과 그대로 쓸 수 있으면 수집 시각만 갱신
+    def touch(self, key, etag=None, last_modified=None):
+        _, meta_path = self._paths(key)
+        meta = {"fetched_at": time.time(), "etag": etag, "last_modified": last_modified}
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+
+# 기본 파서: 본문 bytes 그대로 (JSON 응답 등)
+class BodyParser:
+    def __init__(self):
+        self.chunks = []
+
+    def feed(self, chunk):
+        self.chunks.append(chunk)
+
+    def close(self):
+        return b"".join(self.chunks)
+
+
+# 서울 OpenAPI XML 응답을 <row> 단위로 파싱 → close()가 (전체 건수, 결과 코드, 메시지, rows) 반환
+class SeoulXMLParser:
+    def __init__(self, fields):
+        self.fields = fields
+        self.parser = ET.XMLPullParser(events=("end",))
+        self.total, self.code, self.message = 0, None, None
+        self.rows = []
+
+    def feed(self, chunk):
+        self.parser.feed(chunk)
+        self._drain()
+
+    def close(self):
+        self.parser.close()
+        self._drain()
+        return self.total, self.code, self.message, self.rows
+
+    def _drain(self):
+        for _, elem in self.parser.read_events():
+            if elem.tag == "row":
+                self.rows.append({field: elem.findtext(field) for field in self.fields})
+                elem.clear()
+            elif elem.tag == "list_total_count":
+                self.total = int(elem.text or 0)
+            elif elem.tag == "CODE":
+                self.code = elem.text
+            elif elem.tag == "MESSAGE":
+                self.message = elem.text
+
+
+def parse_seoul_xml(body, fields):
+    parser = SeoulXMLParser(fields)
+    parser.feed(body)
+    return parser.close()
+
+
+# GET 1건: 캐시가 신선하면 그대로, 아니면 조건부 요청 (304면 캐시 재사용)
+# - parser: 시도마다 새로 만드는 파서 (feed(chunk) / close() → 결과), 기본은 본문 bytes
+# - 429/5xx/연결 오류는 지수 백오프로 재시도 (본문을 받던 중 끊겨도 새 파서로 처음부터 다시 받음)
+async def fetch(client, cache, url, params=None, max_age=None, retries=3, backoff=1.0, parser=BodyParser):
+    max_age = cache.max_age if max_age is None else max_age
+    key = url + "?" + urlencode(sorted((params or {}).items()))
+    meta = cache.load_meta(key)
+    if meta is not None and time.time() - meta["fetched_at"] < max_age:
+        return cache.parse(key, parser())
+
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    for attempt in range(retries + 1):
+        try:
+            async with client.stream("GET", url, params=params, headers=headers) as resp:
+                if resp.status_code == 304 and meta is not None:
+                    cache.touch(key, meta.get("etag"), meta.get("last_modified"))
+                    return cache.parse(key, parser())
+                retry = (resp.status_code == 429 or resp.status_code >= 500) and attempt < retries
+                if not retry:
+                    resp.raise_for_status()
+                    result = parser()
+                    with cache.writer(key, resp.headers.get("ETag"), resp.headers.get("Last-Modified")) as f:
+                        async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                            f.write(chunk)
+                            result.feed(chunk)
+                    return result.close()
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        await asyncio.sleep(backoff * (2 ** attempt))
+
+
+# 서울 OpenAPI 서비스 전체 페이지 수집 (첫 페이지 이후 나머지 페이지는 동시에 요청)
+async def fetch_seoul_rows(client, cache, service, fields, key=None, page_size=PAGE_SIZE, max_age=None):
+    key = key or api_key("SEOUL_OPENAPI_KEY")
+    if not key:
+        raise RuntimeError("SEOUL_OPENAPI_KEY가 설정되지 않았습니다.")
+
+    async def page(start):
+        url = f"{SEOUL_URL}/{key}/xml/{service}/{start}/{start + page_size - 1}/"
+        total, code, message, rows = await fetch(client, cache, url, max_age=max_age,
+                                                 parser=partial(SeoulXMLParser, fields))
+        # INFO-200: 해당하는 데이터 없음
+        if code not in ("INFO-000", "INFO-200"):
+            raise RuntimeError(f"{service} 요청 실패 ({code}): {message}")
+        return total, rows
+
+    total, rows = await page(1)
+    starts = range(1 + page_size, total + 1, page_size)
+    for _, page_rows in await asyncio.gather(*(page(start) for start in starts)):
+        rows.extend(page_rows)
+    if len(rows) != total:
+        print(f"⚠️ {service}: 전체 {total}건 중 {len(rows)}건만 수신")
+    return rows
+
+
+# UTIC 보호구역 (시도 단위 요청, 페이지 구분 없음) — 시도 목록을 동시에 요청
+async def fetch_utic_safe_zones(client, cache, key=None, sido_codes=(CONST.SEOUL,), max_age=None):
+    key = key or api_key("UTIC_API_KEY")
+    if not key:
+        raise RuntimeError("UTIC_API_KEY가 설정되지 않았습니다.")
+
+    async def sido(code):
+        params = {"key": key, "type": "json", "sidoCd": code}
+        body = await fetch(client, cache, f"{UTIC_URL}/guide/getSafeOpenJson.do", params, max_age=max_age)
+        data = json.loads(body)
+        if data.get("resultCode") != "00":
+            raise RuntimeError(f"UTIC 보호구역 요청 실패 (sidoCd={code}): {data.get('resultMsg')}")
+        return data.get("items", [])
+
+    items = []
+    for sido_items in await asyncio.gather(*(sido(code) for code in sido_codes)):
+        items.extend(sido_items)
+    return items
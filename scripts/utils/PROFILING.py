@@ -0,0 +1,309 @@
+# 파이프라인 단계별 계측 (소요시간 / CPU 시간 / 최대 메모리 / 행 수) + 실행 보고서
+# - measure(): 단계 블록을 감싸 기록을 남김, 기록은 프로세스별로 모아 두었다가 drain()으로 가져감
+#   (워커 프로세스는 작업 결과와 함께 기록을 돌려주고, 부모가 보고서에 합침)
+# - 최대 메모리: 단계 시작 시 최대치(VmHWM)를 초기화해 단계 구간의 최대값을 기록 (Linux)
+#   초기화가 안 되는 환경(macOS 등)에서는 프로세스 시작 이후 최대값
+# - PIPELINE_PROFILE=cprofile | sample: 프로세스의 가장 바깥 단계마다 프로파일 파일 저장
+#   cprofile → .prof (snakeviz / pstats), sample → 주기적 스택 샘플의 .folded (flamegraph.pl / speedscope)
+# - RunReport.save(): data/reports/pipeline/{run_id}.json / .csv + history.csv (실행 간 비교용 누적 기록)
+# - compare_reports(): 두 실행의 단계별 소요시간 비교 (기준 대비 threshold 이상 느려진 단계 표시)
+import os
+import sys
+import json
+import time
+import platform
+import threading
+import subprocess
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+REPORT_DIR = os.getenv("PIPELINE_REPORT_DIR", "./data/reports/pipeline")
+
+# off / cprofile / sample
+PROFILE_MODE = os.getenv("PIPELINE_PROFILE", "off").lower()
+SAMPLE_INTERVAL_S = float(os.getenv("PIPELINE_PROFILE_INTERVAL_MS", "10")) / 1000
+
+# 워커 프로세스가 같은 실행의 프로파일 디렉토리에 저장하도록 환경변수로 전달
+RUN_ID_ENV = "PIPELINE_RUN_ID"
+
+RECORD_COLUMNS = ["stage", "year", "part", "wall_s", "cpu_s", "peak_rss_mb", "rows", "pid"]
+
+# 이 프로세스에서 끝난 단계 기록 / 진행 중인 단계
+_RECORDS = []
+_ACTIVE = []
+
+
+# fork된 워커는 부모의 기록 / 진행 중인 단계를 물려받지 않음 (부모 기록이 중복 집계되지 않도록)
+def _reset_after_fork():
+    _RECORDS.clear()
+    _ACTIVE.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# /proc/self/status 메모리 항목 (MB, Linux가 아니면 None)
+def _proc_status_mb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+# 현재 메모리 사용량 (MB)
+def rss_mb():
+    rss = _proc_status_mb("VmRSS")
+    return float("nan") if rss is None else rss
+
+
+# 현재까지의 최대 메모리 (MB)
+def peak_rss_mb():
+    hwm = _proc_status_mb("VmHWM")
+    if hwm is not None:
+        return hwm
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+# 최대 메모리 기록을 현재 사용량으로 초기화 (Linux만 가능)
+def _reset_peak():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+# 주기적으로 대상 스레드의 호출 스택을 모으는 샘플링 프로파일러
+class StackSampler:
+    def __init__(self, interval_s=SAMPLE_INTERVAL_S, thread_id=None):
+        self.interval_s = interval_s
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    # flamegraph 입력 형식: "호출;스택;순서 샘플수"
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _profile_path(record, ext):
+    run_dir = os.path.join(REPORT_DIR, os.getenv(RUN_ID_ENV, "adhoc"), "profiles")
+    os.makedirs(run_dir, exist_ok=True)
+    name = "_".join(str(v) for v in (record["stage"], record["year"], record["part"]) if v is not None)
+    return os.path.join(run_dir, f"{name}_{record['pid']}{ext}")
+
+
+@contextmanager
+def _profiled(record):
+    if PROFILE_MODE == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(_profile_path(record, ".prof"))
+    elif PROFILE_MODE == "sample":
+        sampler = StackSampler().start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            sampler.write(_profile_path(record, ".folded"))
+    else:
+        yield
+
+
+# 단계 계측: with measure("proximity", year=2023) as record: ...; record["rows"] = len(df)
+# 예외가 나면 기록하지 않음 (실패한 단계의 소요시간은 비교 대상이 아님)
+@contextmanager
+def measure(stage, year=None, part=None, rows=None):
+    record = {"stage": stage, "year": year, "part": part, "rows": rows, "pid": os.getpid()}
+    if _ACTIVE:
+        parent = _ACTIVE[-1]
+        parent["_peak"] = max(parent["_peak"], peak_rss_mb())
+    _reset_peak()
+    record["_peak"] = peak_rss_mb()
+    outermost = not _ACTIVE
+    _ACTIVE.append(record)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        if outermost:
+            with _profiled(record):
+                yield record
+        else:
+            yield record
+    finally:
+        _ACTIVE.pop()
+    record["wall_s"] = time.perf_counter() - wall
+    record["cpu_s"] = time.process_time() - cpu
+    record["peak_rss_mb"] = max(record.pop("_peak"), peak_rss_mb())
+    if _ACTIVE:
+        _ACTIVE[-1]["_peak"] = max(_ACTIVE[-1]["_peak"], record["peak_rss_mb"])
+    _RECORDS.append(record)
+
+
+# 이 프로세스에서 끝난 기록을 꺼냄 (워커 → 부모 전달용)
+def drain():
+    records = list(_RECORDS)
+    _RECORDS.clear()
+    return records
+
+
+# 워커에서 돌려받은 기록을 이 프로세스 기록에 합침
+def extend(records):
+    _RECORDS.extend(records)
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+# 단계 × 연도별 합계 (워커가 나눠 처리한 파티션은 합산, 최대 메모리는 최대값)
+def summarize(records):
+    df = pd.DataFrame(records, columns=RECORD_COLUMNS)
+    if df.empty:
+        return pd.DataFrame(columns=["stage", "year", "calls", "wall_s", "cpu_s", "peak_rss_mb", "rows", "rows_per_s"])
+    df["year"] = df["year"].astype("Int64")
+    df["rows"] = pd.to_numeric(df["rows"], errors="coerce")
+    summary = df.groupby(["stage", "year"], dropna=False, sort=False).agg(
+        calls=("wall_s", "size"), wall_s=("wall_s", "sum"), cpu_s=("cpu_s", "sum"),
+        peak_rss_mb=("peak_rss_mb", "max"), rows=("rows", lambda s: s.sum(min_count=1)),
+    ).reset_index()
+    summary["rows_per_s"] = summary["rows"] / summary["wall_s"]
+    return summary
+
+
+class RunReport:
+    def __init__(self, name, params=None, report_dir=REPORT_DIR):
+        self.name = name
+        self.params = params or {}
+        self.report_dir = report_dir
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.records = []
+        os.environ[RUN_ID_ENV] = self.run_id
+
+    @contextmanager
+    def stage(self, stage, year=None, part=None, rows=None):
+        try:
+            with measure(stage, year, part, rows) as record:
+                yield record
+        finally:
+            self.collect()
+
+    # 이 프로세스의 기록 (워커에서 돌려받아 extend()로 합친 기록 포함)
+    def collect(self):
+        self.records.extend(drain())
+
+    def summary(self):
+        return summarize(self.records)
+
+    def save(self):
+        self.collect()
+        os.makedirs(self.report_dir, exist_ok=True)
+        summary = self.summary()
+        report = {
+            "run_id": self.run_id,
+            "name": self.name,
+            "argv": sys.argv,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "wall_s": time.perf_counter() - self._start,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "profile": PROFILE_MODE,
+            "params": self.params,
+            "stages": json.loads(summary.to_json(orient="records")),
+            "records": json.loads(pd.DataFrame(self.records, columns=RECORD_COLUMNS).to_json(orient="records")),
+        }
+        json_path = os.path.join(self.report_dir, f"{self.run_id}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        summary.to_csv(os.path.join(self.report_dir, f"{self.run_id}.csv"), index=False, encoding="utf-8-sig")
+
+        history_path = os.path.join(self.report_dir, "history.csv")
+        history = summary.assign(run_id=self.run_id, name=self.name, git_commit=report["git_commit"])
+        history.to_csv(history_path, mode="a", header=not os.path.exists(history_path), index=False,
+                       encoding="utf-8-sig")
+        return json_path
+
+    def print_summary(self):
+        self.collect()
+        summary = self.summary()
+        if summary.empty:
+            return
+        print("\n==> 단계별 계측 (초 / MB, 워커 단계는 합계)")
+        print(summary.round(2).to_string(index=False))
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 보고서 목록 (오래된 순)
+def list_reports(report_dir=REPORT_DIR, name=None):
+    if not os.path.isdir(report_dir):
+        return []
+    paths = sorted(os.path.join(report_dir, f) for f in os.listdir(report_dir) if f.endswith(".json"))
+    return [p for p in paths if name is None or load_report(p).get("name") == name]
+
+
+# 두 실행의 단계별 비교: ratio = 현재 / 기준, 기준 대비 threshold 이상 느려지고 min_s 이상 차이 나면 regression
+def compare_reports(current, baseline, threshold=0.2, min_s=0.5):
+    keys = ["stage", "year"]
+    cur = pd.DataFrame(current["stages"])
+    base = pd.DataFrame(baseline["stages"])
+    for df in (cur, base):
+        df["year"] = df["year"].astype("Int64")
+    merged = base[keys + ["wall_s", "cpu_s", "peak_rss_mb", "rows"]].merge(
+        cur[keys + ["wall_s", "cpu_s", "peak_rss_mb", "rows"]], on=keys, how="outer", suffixes=("_base", ""))
+    merged["ratio"] = merged["wall_s"] / merged["wall_s_base"]
+    merged["regression"] = (merged["ratio"] > 1 + threshold) & (merged["wall_s"] - merged["wall_s_base"] > min_s)
+    return merged
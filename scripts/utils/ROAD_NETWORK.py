@@ -0,0 +1,173 @@
+# 도로망(shp) 구간 인덱스: 사고 / 경로 좌표를 가장 가까운 도로 구간(링크)에 스냅
+# - 구간 geometry는 EPSG:5179(단위 m)로 변환, MultiLineString은 LineString 단위로 풀어서 각각 하나의 구간으로 사용
+# - STRtree 최근접 질의 1회로 전체 좌표를 스냅 (좌표 n개, 구간 m개 → O(n log m))
+# - 읽은 구간은 shp/dbf 내용 해시를 키로 디스크 캐시 (data/cache/road_network)
+#   워커 프로세스는 geopandas 없이 좌표 배열만 읽어 구간 / STRtree를 만듦
+# - 타일 모드: within_box()로 타일 + halo에 걸치는 구간만 골라 ragged()로 워커에 넘김 (워커는 전체 도로망을 읽지 않음)
+# - shp/dbf 파일이 없으면 None (도로 구간 매칭 없이 도로명 기준으로 처리)
+import os
+import json
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from . import GEO_UTILS as GU
+from . import INDEX_CACHE as IC
+
+ROAD_PATH = "./data/shp/서울시_도로망.shp"
+ROAD_ENCODING = os.getenv("ROAD_ENCODING", "cp949")
+ROAD_ID_COL = "LINK_ID"
+ROAD_NAME_COL = "ROAD_NAME"
+ROAD_EPSG = 5179
+CACHE_DIR = "./data/cache/road_network"
+
+# 사고 지점 → 구간 스냅 허용 거리 (m)
+SNAP_M = 30
+
+# 캐시 저장 형식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 1
+
+
+def source_files(path=ROAD_PATH):
+    stem = os.path.splitext(path)[0]
+    return [stem + ".shp", stem + ".dbf"]
+
+
+# 도로망 shp → (구간 geometry 배열, 구간 id, 도로명)
+def load_road_segments(path=ROAD_PATH, encoding=ROAD_ENCODING):
+    import geopandas as gpd
+
+    roads = gpd.read_file(path, encoding=encoding)
+    if roads.crs is not None and roads.crs.to_epsg() != ROAD_EPSG:
+        roads = roads.to_crs(epsg=ROAD_EPSG)
+    roads = roads[roads.geometry.notna() & ~roads.geometry.is_empty].explode(index_parts=False)
+    roads = roads[roads.geom_type == "LineString"]
+
+    ids = roads[ROAD_ID_COL].astype("string") if ROAD_ID_COL in roads else pd.Series(
+        np.arange(len(roads)).astype(str), dtype="string")
+    names = roads[ROAD_NAME_COL].astype("string") if ROAD_NAME_COL in roads else pd.Series(
+        pd.NA, index=roads.index, dtype="string")
+    return roads.geometry.to_numpy(), ids.to_numpy(), names.to_numpy()
+
+
+class RoadNetwork:
+    def __init__(self, geoms, ids, names):
+        self.geoms = geoms
+        self.ids = ids
+        self.names = names
+        self.tree = shapely.STRtree(geoms)
+        self.length_m = shapely.length(geoms).astype("float32")
+        # 속도 테이블(도로명 공백 제거)과 같은 형식의 도로명
+        self.road_keys = pd.Series(names, dtype="string").str.replace(" ", "").str.strip().to_numpy()
+        self._box_trees = {}
+
+    # 좌표 배열(ragged) → 구간 (디스크 캐시 / 워커에 넘긴 타일 구간)
+    @classmethod
+    def from_ragged(cls, coords, offsets, ids, names):
+        geoms = shapely.from_ragged_array(shapely.GeometryType.LINESTRING, coords, (offsets,))
+        return cls(geoms, ids, names)
+
+    # 구간 전체 또는 일부(positions) → (좌표, offsets, id, 도로명), STRtree 없이 pickle 가능한 배열
+    def ragged(self, positions=None):
+        geoms, ids, names = self.geoms, self.ids, self.names
+        if positions is not None:
+            geoms, ids, names = geoms[positions], ids[positions], names[positions]
+        if not len(geoms):
+            return np.empty((0, 2)), np.zeros(1, dtype="int64"), ids, names
+        _, coords, (offsets,) = shapely.to_ragged_array(geoms)
+        return coords, offsets, ids, names
+
+    # 평면 좌표계 epsg의 사각 영역 (min_x, min_y, max_x, max_y)에 걸치는 구간 위치 (오름차순)
+    # 구간 bbox 네 모서리를 epsg로 변환한 사각형으로 STRtree를 만들어 두고 조회 (좌표계별 1회)
+    def within_box(self, bounds, epsg):
+        tree = self._box_trees.get(epsg)
+        if tree is None:
+            x0, y0, x1, y1 = shapely.bounds(self.geoms).T
+            xs, ys = GU.get_transformer(ROAD_EPSG, epsg).transform(np.concatenate((x0, x0, x1, x1)),
+                                                                    np.concatenate((y0, y1, y0, y1)))
+            xs, ys = np.asarray(xs).reshape(4, -1), np.asarray(ys).reshape(4, -1)
+            tree = self._box_trees[epsg] = shapely.STRtree(
+                shapely.box(xs.min(axis=0), ys.min(axis=0), xs.max(axis=0), ys.max(axis=0)))
+        return np.sort(tree.query(shapely.box(*bounds)))
+
+    def __len__(self):
+        return len(self.geoms)
+
+    # 위경도 → 최근접 구간 위치 (max_distance_m 안에 구간이 없거나 좌표가 없으면 -1) / 거리(m)
+    def snap(self, lat, lng, max_distance_m=SNAP_M):
+        lat = np.asarray(lat, dtype="float64")
+        lng = np.asarray(lng, dtype="float64")
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lng))
+        positions = np.full(len(lat), -1, dtype="int64")
+        distances = np.full(len(lat), np.nan)
+        if not len(valid):
+            return positions, distances
+
+        x, y = GU.get_transformer(4326, ROAD_EPSG).transform(lng[valid], lat[valid])
+        (point_idx, seg_idx), dist = self.tree.query_nearest(
+            shapely.points(x, y), max_distance=max_distance_m, return_distance=True, all_matches=False)
+        positions[valid[point_idx]] = seg_idx
+        distances[valid[point_idx]] = dist
+        return positions, distances
+
+    # 구간 위치 → 구간 id / 도로명 (-1은 결측)
+    def link_ids(self, positions):
+        return pd.array(np.where(positions >= 0, self.ids[np.maximum(positions, 0)], None), dtype="string")
+
+    def link_roads(self, positions):
+        return pd.array(np.where(positions >= 0, self.road_keys[np.maximum(positions, 0)], None), dtype="string")
+
+
+# 캐시 키: shp/dbf 내용 + 컬럼 / 인코딩 설정
+def _cache_key(path, encoding):
+    h = hashlib.sha256()
+    for part in (CACHE_VERSION, *(IC.file_hash(p) for p in source_files(path)), encoding, ROAD_ID_COL, ROAD_NAME_COL):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _load(cache_path):
+    coords = np.load(os.path.join(cache_path, "coords.npy"))
+    offsets = np.load(os.path.join(cache_path, "offsets.npy"))
+    with open(os.path.join(cache_path, "links.json"), encoding="utf-8") as f:
+        links = json.load(f)
+    return RoadNetwork.from_ragged(coords, offsets, np.asarray(links["ids"], dtype=object),
+                                   np.asarray(links["names"], dtype=object))
+
+
+def _save(network, cache_path):
+    def write(tmp_path):
+        coords, offsets, _, _ = network.ragged()
+        np.save(os.path.join(tmp_path, "coords.npy"), coords)
+        np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+        links = {
+            "ids": [None if pd.isna(v) else str(v) for v in network.ids],
+            "names": [None if pd.isna(v) else str(v) for v in network.names],
+        }
+        with open(os.path.join(tmp_path, "links.json"), "w", encoding="utf-8") as f:
+            json.dump(links, f, ensure_ascii=False)
+
+    IC.write_cache_dir(cache_path, write)
+
+
+# 도로망 로드 (프로세스당 1회, 캐시가 없거나 원본이 바뀌었으면 shp에서 새로 읽어 저장)
+@lru_cache(maxsize=None)
+def load_road_network(path=ROAD_PATH, encoding=ROAD_ENCODING, cache_dir=CACHE_DIR):
+    missing = [p for p in source_files(path) if not os.path.exists(p)]
+    if missing:
+        print(f"⚠️ 도로망 파일이 없어 도로 구간 매칭을 건너뜁니다: {', '.join(missing)}")
+        return None
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    cache_path = os.path.join(cache_dir, f"{name}_{_cache_key(path, encoding)}")
+    if os.path.isdir(cache_path):
+        return _load(cache_path)
+
+    print(f"↘︎ [{name}] 도로망 구간 캐시 생성 중...")
+    network = RoadNetwork(*load_road_segments(path, encoding))
+    _save(network, cache_path)
+    return network
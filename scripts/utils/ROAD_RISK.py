@@ -0,0 +1,279 @@
+# 도로 구간(링크)별 사고 위험도 인덱스 + 경로(폴리라인) 위험도 점수
+# - 시작 시 1회: 사고 지점을 가장 가까운 도로 구간(ACCIDENT_SNAP_M 이내)에 붙여 구간별 위험도 표 생성
+#   위험도 = 연평균 가중 사고 건수 / 구간 길이(km)
+#   가중치 = 사고 심각도(SEVERITY_WEIGHTS) × 고령 운전자(65세 이상) × 고령 hotspot 여부
+# - 질의: 경로를 SAMPLE_M 간격으로 샘플링 → STRtree 최근접 구간에 스냅 → 구간 위험도를 길이 가중 합산
+#   여러 경로는 샘플 점을 모아 한 번에 질의
+# - 도로망/구간 스냅은 ROAD_NETWORK 사용, 도로망 좌표계(EPSG:5179, 단위 m) 그대로 계산
+# - 캐시 (TTL_CACHE, LRU + TTL)
+#   snap_cache: 경로 좌표를 QUANT_DEG 단위로 양자화한 해시 → 스냅된 구간 순서 (도로망에만 의존)
+#   segment_cache: 구간 → 위험도/사고 건수 정보 (사고 데이터에 의존)
+#   accident_data_all / 사고 데이터 파일이 다시 생성되면 백그라운드 스레드에서 위험도 표를 다시 만들어 교체하고
+#   segment_cache를 비움 (다시 만드는 동안 요청은 기존 표로 처리)
+import os
+import time
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from . import GEO_UTILS as GU
+from . import ROAD_NETWORK as RN
+from . import STORAGE as ST
+from . import TTL_CACHE as TC
+
+ROAD_PATH = RN.ROAD_PATH
+ACCIDENT_PATH = "./data/processed/accident_data_filtered"
+ALL_PATH = "./data/processed/accident_data_all"
+
+RISK_EPSG = RN.ROAD_EPSG
+ACCIDENT_SNAP_M = RN.SNAP_M
+ROUTE_SNAP_M = 30
+SAMPLE_M = 20
+MIN_LENGTH_KM = 0.05
+
+SEVERITY_WEIGHTS = {"사망사고": 10.0, "중상사고": 3.0, "경상사고": 1.0, "부상신고사고": 1.0}
+ELDERLY_WEIGHT = 2.0
+HOTSPOT_WEIGHT = 1.5
+
+# 경로 좌표 양자화 단위 (1e-5도 ≈ 1m) / 캐시 크기 / 만료 시간 / 사고 데이터 변경 확인 주기
+QUANT_DEG = 1e-5
+SNAP_CACHE_SIZE = 50_000
+SEGMENT_CACHE_SIZE = 100_000
+CACHE_TTL_S = 6 * 3600
+REFRESH_CHECK_S = 5.0
+
+
+# 사고별 위험 가중치 (컬럼이 없으면 해당 가중치는 1)
+def accident_weights(accident_df):
+    weights = np.ones(len(accident_df))
+    if "acdnt_hdc" in accident_df:
+        weights *= accident_df["acdnt_hdc"].astype(object).map(SEVERITY_WEIGHTS).fillna(1.0).to_numpy(dtype="float64")
+    if "acdnt_age_1_code" in accident_df:
+        age = pd.to_numeric(accident_df["acdnt_age_1_code"], errors="coerce").to_numpy(dtype="float64")
+        weights *= np.where(age >= 65, ELDERLY_WEIGHT, 1.0)
+    if "elderly_hotspot" in accident_df:
+        hotspot = pd.to_numeric(accident_df["elderly_hotspot"], errors="coerce").to_numpy(dtype="float64")
+        weights *= np.where(hotspot == 1, HOTSPOT_WEIGHT, 1.0)
+    return weights
+
+
+# 데이터 파일 변경 감지용 (수정 시각, 크기), 파일이 없으면 None
+def file_signature(*paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(ST.resolve(path))
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+
+# 경로 캐시 키: QUANT_DEG 단위로 양자화한 좌표 + 샘플링 옵션의 해시
+def route_key(coords, sample_m, snap_m):
+    quantized = np.round(coords / QUANT_DEG).astype("int64")
+    digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+    digest.update(f"{sample_m}|{snap_m}".encode())
+    return digest.digest()
+
+
+def read_accidents(path=ACCIDENT_PATH):
+    columns = ["acdnt_year", "acdnt_hdc", "acdnt_age_1_code", "elderly_hotspot", "lat", "lng"]
+    available = set(ST.available_columns(path))
+    return ST.read_table(path, columns=[c for c in columns if c in available])
+
+
+def _route_coords(path):
+    coords = np.asarray(path, dtype="float64")
+    if coords.ndim != 2 or coords.shape[1] != 2 or len(coords) < 2 or not np.isfinite(coords).all():
+        raise ValueError("path는 [위도, 경도] 좌표 2개 이상의 목록이어야 합니다.")
+    return coords
+
+
+class RoadRiskIndex:
+    # watch_paths: 바뀌면 accident_path에서 사고 데이터를 다시 읽어 위험도 표를 새로 만드는 파일들
+    def __init__(self, network, accident_df, snap_m=ACCIDENT_SNAP_M, accident_path=None, watch_paths=()):
+        self.network = network
+        self.ids = network.ids
+        self.names = network.names
+        self.tree = network.tree
+        self.length_m = network.length_m
+        self.snap_m = snap_m
+
+        self.snap_cache = TC.TTLCache(SNAP_CACHE_SIZE, CACHE_TTL_S)
+        self.segment_cache = TC.TTLCache(SEGMENT_CACHE_SIZE, CACHE_TTL_S)
+        self.accident_path = accident_path
+        self.watch_paths = tuple(watch_paths) if accident_path else ()
+        self.signature = file_signature(*self.watch_paths)
+        self.checked_at = time.monotonic()
+        self.refresh_lock = threading.Lock()
+        self.rebuild_thread = None
+        self.reloads = 0
+        self.table = self._risk_table(accident_df, version=0)
+
+    @classmethod
+    def build(cls, road_path=ROAD_PATH, accident_path=ACCIDENT_PATH, all_path=ALL_PATH):
+        network = RN.load_road_network(road_path)
+        if network is None:
+            raise FileNotFoundError(f"도로망 파일이 없습니다: {road_path}")
+        return cls(network, read_accidents(accident_path), accident_path=accident_path,
+                   watch_paths=(all_path, accident_path))
+
+    def __len__(self):
+        return len(self.network)
+
+    # 사고 지점을 구간에 스냅해 구간별 위험도 표 생성
+    # 요청 처리 중에는 self.table을 한 번만 읽어 쓰므로, 다시 만들 때는 표 전체를 통째로 교체
+    def _risk_table(self, accident_df, version):
+        lat = pd.to_numeric(accident_df["lat"], errors="coerce").to_numpy(dtype="float64")
+        lng = pd.to_numeric(accident_df["lng"], errors="coerce").to_numpy(dtype="float64")
+        positions, _ = self.network.snap(lat, lng, self.snap_m)
+        snapped = positions >= 0
+        seg_idx = positions[snapped]
+
+        weights = accident_weights(accident_df)[snapped]
+        elderly = np.zeros(len(seg_idx))
+        if "acdnt_age_1_code" in accident_df:
+            age = pd.to_numeric(accident_df["acdnt_age_1_code"], errors="coerce").to_numpy(dtype="float64")
+            elderly = (age >= 65)[snapped].astype("float64")
+        years = accident_df["acdnt_year"].nunique() if "acdnt_year" in accident_df else 1
+
+        n = len(self.network)
+        weight_sum = np.bincount(seg_idx, weights=weights, minlength=n)
+        length_km = np.maximum(self.length_m / 1000, MIN_LENGTH_KM)
+        risk = (weight_sum / max(years, 1) / length_km).astype("float32")
+        return {
+            "version": version,
+            "risk": risk,
+            "sorted_risk": np.sort(risk),
+            "accidents": np.bincount(seg_idx, minlength=n).astype("int32"),
+            "elderly": np.bincount(seg_idx, weights=elderly, minlength=n).astype("int32"),
+            "snapped": int(snapped.sum()),
+            "total": int((np.isfinite(lat) & np.isfinite(lng)).sum()),
+        }
+
+    # REFRESH_CHECK_S마다 사고 데이터 파일을 확인해 바뀌었으면 백그라운드 스레드에서 위험도 표를 다시 만듦
+    # 요청 스레드는 파일 상태만 확인하고 바로 돌아감 (다시 만드는 중이면 확인도 하지 않음)
+    # wait=True: 다시 만들기가 끝날 때까지 기다림 (테스트 / 벤치마크용), 반환값: 다시 만들기를 시작했는지
+    def refresh(self, force=False, wait=False):
+        if not self.watch_paths or (not force and time.monotonic() - self.checked_at < REFRESH_CHECK_S):
+            return False
+        with self.refresh_lock:
+            if self.rebuild_thread is not None and self.rebuild_thread.is_alive():
+                return False
+            if not force and time.monotonic() - self.checked_at < REFRESH_CHECK_S:
+                return False
+            self.checked_at = time.monotonic()
+            signature = file_signature(*self.watch_paths)
+            if signature == self.signature and not force:
+                return False
+            thread = self.rebuild_thread = threading.Thread(target=self._rebuild, args=(signature,), daemon=True)
+            thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    # 새 위험도 표를 만든 뒤 self.table을 통째로 교체 (요청은 표를 한 번만 읽으므로 교체 중에도 일관됨)
+    # 스냅 결과는 도로망에만 의존하므로 snap_cache는 유지
+    def _rebuild(self, signature):
+        try:
+            table = self._risk_table(read_accidents(self.accident_path), version=self.reloads + 1)
+        except (OSError, ValueError, KeyError) as e:
+            # 파일을 쓰는 중이면 다음 확인 때 다시 시도
+            print(f"⚠️ 사고 데이터 다시 읽기 실패, 기존 위험도 표 유지: {e}")
+            return
+        self.table = table
+        self.segment_cache.clear()
+        self.signature = signature
+        self.reloads += 1
+        print(f"==> 사고 데이터 변경 감지: 위험도 표 다시 생성 (사고 {table['snapped']}/{table['total']}건 스냅)")
+
+    def cache_stats(self):
+        return {"snap": self.snap_cache.stats(), "segment": self.segment_cache.stats(), "reloads": self.reloads}
+
+    # 경로별 점수 (paths: [[(lat, lng), ...], ...])
+    #   risk_per_km: 스냅된 구간 길이 가중 평균 위험도
+    #   exposure: 경로 전체의 연평균 가중 사고 노출량 (위험도 × 통과 길이)
+    #   score: 전체 구간 중 위험도가 risk_per_km보다 낮은 구간의 비율 (0~100)
+    #          위험도 0인 경로는 0, 도로에 스냅된 샘플이 하나도 없으면 None (점수를 매길 수 없음)
+    # 캐시에 없는 경로만 모아서 한 번에 스냅
+    def score_many(self, paths, sample_m=SAMPLE_M, snap_m=ROUTE_SNAP_M, top=5):
+        self.refresh()
+        table = self.table
+        coords = [_route_coords(path) for path in paths]
+        keys = [route_key(c, sample_m, snap_m) for c in coords]
+        snaps = [self.snap_cache.get(key) for key in keys]
+        missing = [r for r, snap in enumerate(snaps) if snap is None]
+        if missing:
+            for r, snap in zip(missing, self._snap_routes([coords[r] for r in missing], sample_m, snap_m)):
+                snaps[r] = snap
+                self.snap_cache.put(keys[r], snap)
+        return [self._route_result(table, *snap, top=top) for snap in snaps]
+
+    def score(self, path, **kwargs):
+        return self.score_many([path], **kwargs)[0]
+
+    # 경로를 sample_m 간격으로 샘플링해 최근접 구간에 스냅 → 경로별 (구간 순서, 샘플 간격, 샘플 수, 길이)
+    def _snap_routes(self, coords, sample_m, snap_m):
+        transformer = GU.get_transformer(4326, RISK_EPSG)
+        lines, lengths, counts = [], [], []
+        for c in coords:
+            x, y = transformer.transform(c[:, 1], c[:, 0])
+            line = shapely.linestrings(x, y)
+            lines.append(line)
+            lengths.append(line.length)
+            counts.append(max(1, int(np.ceil(line.length / sample_m))))
+
+        counts = np.asarray(counts)
+        lengths = np.asarray(lengths)
+        route_of = np.repeat(np.arange(len(coords)), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        step_m = lengths / counts
+        points = shapely.line_interpolate_point(np.asarray(lines)[route_of], (offset + 0.5) * step_m[route_of])
+        sample_idx, seg_idx = self.tree.query_nearest(points, max_distance=snap_m, all_matches=False)
+
+        bounds = np.searchsorted(route_of[sample_idx], np.arange(len(coords) + 1))
+        return [
+            (seg_idx[bounds[r]:bounds[r + 1]].astype("int32"), float(step_m[r]), int(counts[r]), float(lengths[r]))
+            for r in range(len(coords))
+        ]
+
+    def _route_result(self, table, segs, step_m, count, length_m, top=5):
+        risk = table["risk"]
+        matched_km = len(segs) * step_m / 1000
+        exposure = float(risk[segs].sum() * step_m / 1000)
+        risk_per_km = exposure / matched_km if matched_km else 0.0
+        unique, hits = np.unique(segs, return_counts=True)
+        order = np.argsort(-risk[unique])[:top]
+        score = None
+        if len(segs):
+            score = round(100 * np.searchsorted(table["sorted_risk"], risk_per_km, side="left") / len(self), 1)
+        return {
+            "score": score,
+            "risk_per_km": round(risk_per_km, 4),
+            "exposure": round(exposure, 4),
+            "length_m": round(length_m, 1),
+            "matched_ratio": round(len(segs) / count, 3),
+            "segments": [
+                {**self._segment(table, s), "covered_m": round(float(h * step_m), 1)}
+                for s, h in zip(unique[order], hits[order])
+            ],
+        }
+
+    # 구간 정보 (위험도 표 버전별로 캐시)
+    def _segment(self, table, s):
+        key = (table["version"], int(s))
+        detail = self.segment_cache.get(key)
+        if detail is None:
+            detail = {
+                "id": str(self.ids[s]),
+                "name": None if pd.isna(self.names[s]) else str(self.names[s]),
+                "risk_per_km": round(float(table["risk"][s]), 4),
+                "accidents": int(table["accidents"][s]),
+                "elderly_accidents": int(table["elderly"][s]),
+            }
+            self.segment_cache.put(key, detail)
+        return detail
@@ -0,0 +1,84 @@
+# 파이프라인 단계 의존성 그래프 (증분 재실행용)
+# - 단계 지문(fingerprint) = 입력 파일 내용 해시 + 단계 파라미터 + 선행 단계 지문
+# - 지문이 마지막 성공 실행과 같고 출력 파일이 남아 있으면 해당 단계는 건너뜀
+# - 선행 단계가 다시 실행되면 후속 단계도 다시 실행
+import os
+import json
+import hashlib
+
+from . import STORAGE as ST
+from . import INDEX_CACHE as IC
+
+MANIFEST_PATH = "./data/cache/build_manifest.json"
+
+# 처리 로직이 바뀌어 입력/파라미터가 같아도 다시 만들어야 할 때 올림
+STAGE_VERSION = 1
+
+
+class StageGraph:
+    def __init__(self, manifest_path=MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self.stages = {}
+        self._file_hashes = {}
+        self._fingerprints = {}
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.manifest = {}
+
+    # 단계 등록 (선행 단계는 먼저 등록되어 있어야 함)
+    # inputs / outputs: 파일 경로 (STORAGE 경로는 확장자 생략 가능)
+    # params: JSON으로 표현 가능한 단계 파라미터 (반경, eps_m, min_samples 등)
+    def add(self, name, inputs=(), outputs=(), params=None, deps=()):
+        missing = [d for d in deps if d not in self.stages]
+        if missing:
+            raise ValueError(f"{name}: 등록되지 않은 선행 단계 {missing}")
+        self.stages[name] = {
+            "inputs": list(inputs), "outputs": list(outputs),
+            "params": params or {}, "deps": list(deps),
+        }
+
+    def _file_hash(self, path):
+        if path not in self._file_hashes:
+            try:
+                self._file_hashes[path] = IC.file_hash(ST.resolve(path))
+            except FileNotFoundError:
+                self._file_hashes[path] = IC.file_hash(path) if os.path.exists(path) else "missing"
+        return self._file_hashes[path]
+
+    def fingerprint(self, name):
+        if name not in self._fingerprints:
+            stage = self.stages[name]
+            payload = {
+                "version": STAGE_VERSION,
+                "inputs": {path: self._file_hash(path) for path in stage["inputs"]},
+                "params": stage["params"],
+                "deps": {dep: self.fingerprint(dep) for dep in stage["deps"]},
+            }
+            encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+            self._fingerprints[name] = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        return self._fingerprints[name]
+
+    def _outputs_exist(self, name):
+        return all(ST.exists(path) or os.path.exists(path) for path in self.stages[name]["outputs"])
+
+    # 다시 실행해야 하는 단계 목록 (등록 순서)
+    def plan(self, force=False):
+        stale = []
+        for name, stage in self.stages.items():
+            if (force
+                    or self.manifest.get(name) != self.fingerprint(name)
+                    or not self._outputs_exist(name)
+                    or any(dep in stale for dep in stage["deps"])):
+                stale.append(name)
+        return stale
+
+    # 단계 성공 기록 (매번 저장해 중간에 실패해도 완료된 단계는 유지)
+    def mark_done(self, name):
+        self.manifest[name] = self.fingerprint(name)
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,157 @@
+# 중간/최종 데이터 저장소
+# - 기본은 타입이 보존되는 압축 Parquet, pyarrow가 없거나 DATA_FORMAT=csv 이면 CSV(utf-8-sig)
+# - 경로는 확장자 없이 넘겨도 되고(.csv/.parquet 모두 허용), 읽을 때는 Parquet을 우선 사용
+# - columns를 넘기면 필요한 컬럼만 읽음 (Parquet은 파일에서 해당 컬럼만 읽어옴)
+# - TableWriter: 청크 단위로 이어 쓰기 (큰 원본을 메모리에 다 올리지 않고 저장)
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PARQUET = ".parquet"
+CSV = ".csv"
+PARQUET_COMPRESSION = "zstd"
+
+# 저장 형식 (parquet / csv)
+DATA_FORMAT = os.getenv("DATA_FORMAT", "parquet" if pq is not None else "csv").lower()
+
+# Parquet 저장 시 CSV도 함께 내보낼지 여부 (대시보드 등 CSV가 필요한 경우)
+EXPORT_CSV = os.getenv("EXPORT_CSV", "0") == "1"
+
+
+def _stem(path):
+    root, ext = os.path.splitext(path)
+    return root if ext in (PARQUET, CSV) else path
+
+
+def _use_parquet():
+    return DATA_FORMAT == "parquet" and pq is not None
+
+
+# 실제로 읽을 파일 경로 (현재 저장 형식을 우선으로 찾고, 없으면 다른 형식)
+def resolve(path):
+    stem = _stem(path)
+    candidates = [PARQUET, CSV] if _use_parquet() else [CSV, PARQUET]
+    for ext in candidates:
+        if os.path.exists(stem + ext) and (ext == CSV or pq is not None):
+            return stem + ext
+    raise FileNotFoundError(f"{stem}{PARQUET} / {stem}{CSV} 파일이 존재하지 않습니다.")
+
+
+def exists(path):
+    try:
+        resolve(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+# 파일에 있는 컬럼 목록 (데이터는 읽지 않음)
+def available_columns(path):
+    path = resolve(path)
+    if path.endswith(PARQUET):
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def read_table(path, columns=None, **csv_kwargs):
+    path = resolve(path)
+    if path.endswith(PARQUET):
+        return pd.read_parquet(path, columns=columns)
+    # ⚠️ DtypeWarning 방지: low_memory=False 기본 적용
+    csv_kwargs.setdefault("low_memory", False)
+    return pd.read_csv(path, usecols=columns, **csv_kwargs)
+
+
+# Parquet은 한 컬럼에 타입이 섞이면 저장이 안 되므로 object 컬럼은 문자열로 통일
+def _typed(df):
+    object_cols = [c for c in df.columns if df[c].dtype == object]
+    if not object_cols:
+        return df
+    return df.astype({c: "string" for c in object_cols})
+
+
+# 저장 후 실제로 쓴 파일 경로 반환
+def write_table(df, path, export_csv=None):
+    stem = _stem(path)
+    os.makedirs(os.path.dirname(stem) or ".", exist_ok=True)
+    export_csv = EXPORT_CSV if export_csv is None else export_csv
+
+    if not _use_parquet():
+        df.to_csv(stem + CSV, index=False, encoding="utf-8-sig")
+        return stem + CSV
+
+    df = _typed(df)
+    df.to_parquet(stem + PARQUET, index=False, compression=PARQUET_COMPRESSION)
+    if export_csv:
+        df.to_csv(stem + CSV, index=False, encoding="utf-8-sig")
+    return stem + PARQUET
+
+
+# 청크를 순서대로 이어 써서 하나의 파일로 저장
+# - Parquet은 첫 청크의 스키마로 고정하고 청크마다 row group 추가
+# - 임시 파일에 쓰다가 close()에서 교체하므로, 중간에 실패하면 기존 파일은 그대로 남음
+# - close()는 실제로 쓴 파일 경로 반환 (청크가 하나도 없었으면 None)
+class TableWriter:
+    def __init__(self, path, export_csv=None):
+        self.stem = _stem(path)
+        self.parquet = _use_parquet()
+        self.export_csv = (EXPORT_CSV if export_csv is None else export_csv) or not self.parquet
+        self.rows = 0
+        self.path = None
+        self._schema = None
+        self._writer = None
+        self._csv_started = False
+        os.makedirs(os.path.dirname(self.stem) or ".", exist_ok=True)
+
+    def _tmp(self, ext):
+        return f"{self.stem}{ext}.{os.getpid()}.tmp"
+
+    def write(self, df):
+        if df.empty:
+            return
+        if self.parquet:
+            df = _typed(df)
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self._tmp(PARQUET), self._schema, compression=PARQUET_COMPRESSION)
+            self._writer.write_table(table)
+        if self.export_csv:
+            df.to_csv(self._tmp(CSV), index=False, header=not self._csv_started,
+                      mode="a" if self._csv_started else "w",
+                      encoding="utf-8" if self._csv_started else "utf-8-sig")
+            self._csv_started = True
+        self.rows += len(df)
+
+    def close(self):
+        written = None
+        if self._csv_started:
+            os.replace(self._tmp(CSV), self.stem + CSV)
+            written = self.stem + CSV
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp(PARQUET), self.stem + PARQUET)
+            written = self.stem + PARQUET
+        return written
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        for ext in (PARQUET, CSV):
+            if os.path.exists(self._tmp(ext)):
+                os.remove(self._tmp(ext))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.path = self.close()
@@ -0,0 +1,69 @@
+# 큰 원본 파일(xlsx / csv)을 행 청크 단위로 읽기
+# - xlsx: openpyxl read-only 모드로 행을 순서대로 읽어 chunk_size행씩 DataFrame으로 반환
+# - csv: read_csv chunksize + dtype 지정 (청크마다 타입 추론이 달라지지 않도록)
+# - CoordinateDeduper: 청크를 넘어 좌표 중복 제거 (좌표 해시만 정렬 배열로 보관)
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+CHUNK_SIZE = 100_000
+
+
+# header_row: 0부터 센 헤더 행 위치 (pd.read_excel의 header와 같음)
+# 헤더가 빈 칸이면 pandas와 같이 "Unnamed: {i}"로 이름 붙임, 완전히 빈 행은 건너뜀
+def iter_xlsx_chunks(path, header_row=0, chunk_size=CHUNK_SIZE, sheet_name=None):
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = None
+        for i, row in enumerate(rows):
+            if i == header_row:
+                header = [str(v) if v is not None else f"Unnamed: {j}" for j, v in enumerate(row)]
+                break
+        if header is None:
+            return
+
+        buffer = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            buffer.append(row[:len(header)])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=header)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_csv_chunks(path, columns=None, dtype=None, chunk_size=CHUNK_SIZE, **csv_kwargs):
+    with pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunk_size, **csv_kwargs) as reader:
+        yield from reader
+
+
+# 이미 나온 좌표는 버리고 처음 나온 행만 남김 (파일 순서 기준, drop_duplicates(keep="first")와 같음)
+# 메모리는 고유 좌표 수 × 8바이트
+class CoordinateDeduper:
+    def __init__(self, x_col, y_col):
+        self.x_col = x_col
+        self.y_col = y_col
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def __call__(self, df):
+        if df.empty:
+            return df
+        hashes = pd.util.hash_pandas_object(df[[self.x_col, self.y_col]], index=False).to_numpy()
+        _, first = np.unique(hashes, return_index=True)
+        keep = np.zeros(len(df), dtype=bool)
+        keep[first] = True
+
+        pos = np.searchsorted(self.seen, hashes)
+        found = pos < len(self.seen)
+        found[found] = self.seen[pos[found]] == hashes[found]
+        keep &= ~found
+
+        new = np.sort(hashes[keep])
+        self.seen = np.insert(self.seen, np.searchsorted(self.seen, new), new)
+        return df[keep]
@@ -0,0 +1,65 @@
+# 전국 단위 처리를 위한 격자 타일 분할 (평면 좌표계, 단위: m)
+# - 각 점은 좌표가 속한 타일 하나에만 소속(owned), 좌표가 없는 점은 어느 타일에도 속하지 않음
+# - around(): 타일 경계를 halo_m만큼 넓힌 영역의 점 (주변 타일 버킷만 확인)
+# - 근접성/교통량/DBSCAN 결과가 타일 경계에서 달라지지 않도록 halo는 가장 큰 검색 반경 이상으로 잡음
+import numpy as np
+
+TILE_SIZE_M = 20_000
+
+# 평면 좌표(EPSG:5186) 거리와 구면 거리의 차이(전국 범위 약 0.1% 이내) + 여유분
+HALO_SCALE = 1.01
+HALO_PAD_M = 10
+
+
+def halo_for(*radii_m):
+    return max(radii_m) * HALO_SCALE + HALO_PAD_M
+
+
+class TiledPoints:
+    def __init__(self, x, y, tile_m=TILE_SIZE_M):
+        self.x = np.asarray(x, dtype="float64")
+        self.y = np.asarray(y, dtype="float64")
+        self.tile_m = tile_m
+
+        valid = np.flatnonzero(np.isfinite(self.x) & np.isfinite(self.y))
+        tx = np.floor(self.x[valid] / tile_m).astype("int64")
+        ty = np.floor(self.y[valid] / tile_m).astype("int64")
+        order = np.lexsort((ty, tx))
+        tx, ty, valid = tx[order], ty[order], valid[order]
+        starts = np.flatnonzero(np.r_[True, (np.diff(tx) != 0) | (np.diff(ty) != 0)])
+        ends = np.r_[starts[1:], len(valid)]
+        self.buckets = {
+            (int(tx[s]), int(ty[s])): np.sort(valid[s:e]) for s, e in zip(starts, ends)
+        }
+        self.missing = np.setdiff1d(np.arange(len(self.x)), valid)
+
+    def tiles(self):
+        return list(self.buckets)
+
+    def owned(self, key):
+        return self.buckets.get(key, np.empty(0, dtype="int64"))
+
+    def bounds(self, key, margin_m=0.0):
+        tx, ty = key
+        return (tx * self.tile_m - margin_m, ty * self.tile_m - margin_m,
+                (tx + 1) * self.tile_m + margin_m, (ty + 1) * self.tile_m + margin_m)
+
+    # 타일 + halo 영역에 들어오는 점 (행 위치 오름차순)
+    def around(self, key, halo_m):
+        rings = int(np.ceil(halo_m / self.tile_m))
+        tx, ty = key
+        parts = [
+            self.buckets[(tx + dx, ty + dy)]
+            for dx in range(-rings, rings + 1) for dy in range(-rings, rings + 1)
+            if (tx + dx, ty + dy) in self.buckets
+        ]
+        if not parts:
+            return np.empty(0, dtype="int64")
+        idx = np.sort(np.concatenate(parts))
+        return idx[self.inside(key, idx, halo_m)]
+
+    # idx 점들이 타일 경계를 margin_m 넓힌 영역 안에 있는지
+    def inside(self, key, idx, margin_m=0.0):
+        x0, y0, x1, y1 = self.bounds(key, margin_m)
+        x, y = self.x[idx], self.y[idx]
+        return (x >= x0) & (x < x1) & (y >= y0) & (y < y1)
@@ -0,0 +1,62 @@
+# 메모리 캐시: 최대 개수(LRU) + 만료 시간(TTL)
+# - get()은 만료된 항목을 지우고 miss로 셈, put()은 가득 차면 가장 오래 안 쓴 항목부터 제거
+# - 여러 스레드(API 서버 요청 처리)에서 함께 쓰므로 모든 연산은 lock 안에서 처리
+# - stats(): hit / miss / eviction(용량 초과) / expiration(TTL 만료) 카운터
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, maxsize, ttl_s=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.clock = clock
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key, default=None):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires = item
+            if expires is not None and expires <= self.clock():
+                del self.items[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        expires = self.clock() + self.ttl_s if self.ttl_s else None
+        with self.lock:
+            self.items[key] = (value, expires)
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.items),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,64 @@
+# 테스트 공통 설정
+# - 저장소 루트(scripts 패키지)와 scripts/(utils, dev) 경로 추가
+# - stub_server: scripts/dev의 로컬 대체 서버를 빈 포트에 하위 프로세스로 띄우고 주소 반환 (테스트가 끝나면 종료)
+# - chrome_driver: Selenium 크롬 드라이버를 띄울 수 없는 환경이면 해당 테스트 건너뜀
+import os
+import sys
+import time
+import shutil
+import socket
+import subprocess
+
+import pytest
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "scripts")]
+
+STARTUP_TIMEOUT_S = 30
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def stub_server():
+    processes = []
+
+    def start(script, *args, ready_path="/"):
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "scripts", "dev", script), "--port", str(port), *map(str, args)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        processes.append(process)
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + STARTUP_TIMEOUT_S
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"{script} 실행 실패: {process.stderr.read().decode('utf-8', 'replace')}")
+            try:
+                requests.get(base_url + ready_path, timeout=1)
+                return base_url
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        raise TimeoutError(f"{script} 응답 대기 시간 초과")
+
+    yield start
+    for process in processes:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+@pytest.fixture(scope="session")
+def chrome_driver():
+    if not any(shutil.which(name) for name in ("google-chrome", "chromium", "chromium-browser", "chrome")):
+        pytest.skip("크롬 브라우저가 없어 Selenium 테스트를 건너뜀")
+    FT = pytest.importorskip("scripts.fetch_taas_accident_data")
+    try:
+        FT._quit_driver(FT._setup_driver())
+    except Exception as e:
+        pytest.skip(f"크롬 드라이버를 띄울 수 없음: {e}")
@@ -0,0 +1,131 @@
+# utils/OPENAPI: 로컬 OpenAPI 대체 서버로 페이지 수집 / ETag 재검증(304) / 캐시 재사용 확인
+import os
+import json
+import asyncio
+
+import pytest
+
+import utils.OPENAPI as OA
+import dev.openapi_stub_server as STUB
+
+SPOT_FIELDS = ["spot_num", "spot_nm", "grs80tm_x", "grs80tm_y"]
+SPOTS = 2500
+
+
+@pytest.fixture
+def seoul_url(stub_server, monkeypatch):
+    base_url = stub_server("openapi_stub_server.py", "--spots", SPOTS)
+    monkeypatch.setattr(OA, "SEOUL_URL", base_url)
+    return base_url
+
+
+# 같은 캐시로 fetch_seoul_rows 실행 → (rows, 응답 상태 코드 목록)
+def fetch_rows(cache, page_size=1000, max_age=None):
+    statuses = []
+
+    async def record(response):
+        statuses.append(response.status_code)
+
+    async def run():
+        async with OA.open_client() as client:
+            client.event_hooks["response"].append(record)
+            return await OA.fetch_seoul_rows(client, cache, "SpotInfo", SPOT_FIELDS, key="test",
+                                             page_size=page_size, max_age=max_age)
+
+    return asyncio.run(run()), statuses
+
+
+def cache_metas(cache_dir):
+    metas = []
+    for name in sorted(os.listdir(cache_dir)):
+        if name.endswith(".json"):
+            with open(os.path.join(cache_dir, name), encoding="utf-8") as f:
+                metas.append(json.load(f))
+    return metas
+
+
+@pytest.mark.parametrize("page_size", [1000, 700, 2500, 5000])
+def test_fetch_seoul_rows_collects_every_page(seoul_url, tmp_path, page_size):
+    cache = OA.ResponseCache(str(tmp_path))
+    rows, statuses = fetch_rows(cache, page_size=page_size)
+
+    pages = -(-SPOTS // page_size)
+    assert statuses == [200] * pages
+    assert rows == STUB.make_spots(SPOTS)
+    assert len(cache_metas(tmp_path)) == pages
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_fetch_seoul_rows_no_data(stub_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(OA, "SEOUL_URL", stub_server("openapi_stub_server.py", "--spots", 0))
+    rows, statuses = fetch_rows(OA.ResponseCache(str(tmp_path)))
+    assert rows == []
+    assert statuses == [200]
+
+
+def test_fresh_cache_is_reused_without_requests(seoul_url, tmp_path):
+    cache = OA.ResponseCache(str(tmp_path))
+    first, _ = fetch_rows(cache)
+    rows, statuses = fetch_rows(cache)
+    assert statuses == []
+    assert rows == first
+
+
+def test_stale_cache_is_revalidated_with_etag(seoul_url, tmp_path):
+    cache = OA.ResponseCache(str(tmp_path))
+    first, _ = fetch_rows(cache)
+    before = cache_metas(tmp_path)
+    assert all(meta["etag"] for meta in before)
+
+    rows, statuses = fetch_rows(cache, max_age=0)
+    assert statuses == [304, 304, 304]
+    assert rows == first
+    after = cache_metas(tmp_path)
+    assert [meta["etag"] for meta in after] == [meta["etag"] for meta in before]
+    assert all(new["fetched_at"] > old["fetched_at"] for old, new in zip(before, after))
+
+
+def test_changed_etag_downloads_again(seoul_url, tmp_path):
+    cache = OA.ResponseCache(str(tmp_path))
+    first, _ = fetch_rows(cache)
+    for name in os.listdir(tmp_path):
+        if name.endswith(".json"):
+            path = os.path.join(tmp_path, name)
+            with open(path, encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["etag"] = '"stale"'
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+    rows, statuses = fetch_rows(cache, max_age=0)
+    assert statuses == [200, 200, 200]
+    assert rows == first
+    assert all(meta["etag"] != '"stale"' for meta in cache_metas(tmp_path))
+
+
+# 조각 경계가 태그 / 한글 중간에 걸려도 한 번에 파싱한 것과 같아야 함
+def test_seoul_xml_parser_handles_split_chunks():
+    body = STUB.spot_page(STUB.make_spots(30), 1, 30).encode("utf-8")
+    expected = OA.parse_seoul_xml(body, SPOT_FIELDS)
+    assert expected[:3] == (30, "INFO-000", "정상 처리되었습니다")
+    assert len(expected[3]) == 30
+
+    parser = OA.SeoulXMLParser(SPOT_FIELDS)
+    for i in range(0, len(body), 7):
+        parser.feed(body[i:i + 7])
+    assert parser.close() == expected
+
+
+# 기본 파서(본문 bytes)를 쓰는 JSON 응답도 같은 캐시 경로로 재검증
+def test_utic_safe_zones_revalidated(stub_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(OA, "UTIC_URL", stub_server("openapi_stub_server.py", "--spots", 0))
+    cache = OA.ResponseCache(str(tmp_path))
+
+    async def run(max_age=None):
+        async with OA.open_client() as client:
+            return await OA.fetch_utic_safe_zones(client, cache, key="test", sido_codes=("11", "26"),
+                                                  max_age=max_age)
+
+    first = asyncio.run(run())
+    assert first == STUB.make_zones("11") + STUB.make_zones("26")
+    assert asyncio.run(run(max_age=0)) == first
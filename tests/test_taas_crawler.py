@@ -0,0 +1,79 @@
+# crawl_accident_df: 로컬 TAAS 대체 서버 화면으로 Selenium 수집 / 체크포인트 재사용 확인
+# 실제 수집 테스트는 크롬 드라이버가 있을 때만 (없으면 건너뜀)
+import os
+
+import pytest
+
+import scripts.fetch_taas_accident_data as FT
+import dev.taas_stub_server as STUB
+
+MAP_READY = "/gis/mcm/mcl/initMap.do"
+YEARS = ["2021", "2022"]
+DISTRICTS = ["강남구", "종로구", "중구"]
+TASKS = len(YEARS) * len(DISTRICTS)
+
+
+def crawl(base_url, checkpoint_dir, **kwargs):
+    kwargs = {"workers": 2, "max_retries": 2, "timeout": 30, "backoff": 0.1, **kwargs}
+    return FT.crawl_accident_df(YEARS, DISTRICTS, base_url=base_url, checkpoint_dir=str(checkpoint_dir), **kwargs)
+
+
+def checkpoint_mtimes(checkpoint_dir):
+    return {name: os.stat(os.path.join(checkpoint_dir, name)).st_mtime_ns for name in os.listdir(checkpoint_dir)}
+
+
+# 모든 작업의 체크포인트가 있으면 드라이버를 띄우지 않고 체크포인트만으로 결과 생성
+def test_crawl_uses_checkpoints_without_driver(tmp_path, monkeypatch, capsys):
+    checkpoint_dir = tmp_path / "checkpoints"
+    for year in YEARS:
+        for sigungu in DISTRICTS:
+            FT._write_checkpoint(str(checkpoint_dir), year, sigungu, STUB.make_accidents(year, sigungu, 200))
+
+    def no_driver(*args, **kwargs):
+        raise AssertionError("체크포인트가 모두 있는데 드라이버를 띄움")
+
+    monkeypatch.setattr(FT, "_setup_driver", no_driver)
+    df = crawl("http://127.0.0.1:9", checkpoint_dir)
+
+    expected = sum(len(STUB.make_accidents(year, sigungu, 200)) for year in YEARS for sigungu in DISTRICTS)
+    assert len(df) == expected
+    assert set(zip(df["year"], df["sigungu"])) == {(y, s) for y in YEARS for s in DISTRICTS}
+    assert f"수집 대상 {TASKS}건 중 {TASKS}건은 체크포인트 사용, 0건 수집" in capsys.readouterr().out
+
+
+def test_crawl_retries_and_writes_checkpoints(chrome_driver, stub_server, tmp_path, capsys):
+    base_url = stub_server("taas_stub_server.py", "--fail-first", 1, ready_path=MAP_READY)
+    df = crawl(base_url, tmp_path / "checkpoints")
+
+    out = capsys.readouterr().out
+    assert out.count("재시도") == TASKS
+    assert "수집 실패" not in out
+    assert len(os.listdir(tmp_path / "checkpoints")) == TASKS
+    assert set(zip(df["year"], df["sigungu"])) == {(y, s) for y in YEARS for s in DISTRICTS}
+    assert df["lat"].between(37.0, 38.0).all() and df["lng"].between(126.5, 127.5).all()
+
+
+def test_crawl_resumes_only_missing_tasks(chrome_driver, stub_server, tmp_path, capsys):
+    checkpoint_dir = tmp_path / "checkpoints"
+    base_url = stub_server("taas_stub_server.py", ready_path=MAP_READY)
+    first = crawl(base_url, checkpoint_dir)
+
+    # 한 건만 지우고 다시 실행 → 그 한 건만 수집, 나머지 체크포인트는 그대로
+    missing = os.path.basename(FT._checkpoint_path(str(checkpoint_dir), "2022", "종로구"))
+    os.remove(checkpoint_dir / missing)
+    before = checkpoint_mtimes(checkpoint_dir)
+    capsys.readouterr()
+
+    second = crawl(base_url, checkpoint_dir)
+    assert f"수집 대상 {TASKS}건 중 {TASKS - 1}건은 체크포인트 사용, 1건 수집" in capsys.readouterr().out
+    after = checkpoint_mtimes(checkpoint_dir)
+    assert {name: after[name] for name in before} == before
+    assert missing in after
+    assert second.equals(first)
+
+    # force=True면 체크포인트가 있어도 전부 다시 수집
+    third = crawl(base_url, checkpoint_dir, force=True)
+    assert f"수집 대상 {TASKS}건 중 0건은 체크포인트 사용, {TASKS}건 수집" in capsys.readouterr().out
+    forced = checkpoint_mtimes(checkpoint_dir)
+    assert all(forced[name] > after[name] for name in after)
+    assert third.equals(first)
@@ -0,0 +1,95 @@
+# fetch_accident_df_http: 로컬 TAAS 대체 서버로 수집 / 재시도 / 체크포인트 재사용 확인
+# capture_search_form은 크롬 드라이버가 있을 때만 (대체 서버 화면에서 캡처한 폼 = 아래 STUB_FORM)
+import os
+import json
+
+import pytest
+
+import scripts.fetch_taas_accident_data as FT
+import dev.taas_stub_server as STUB
+
+MAP_READY = "/gis/mcm/mcl/initMap.do"
+YEARS = ["2021", "2022"]
+DISTRICTS = ["강남구", "종로구", "중구"]
+
+# 대체 서버 화면에서 2021년 / 강남구로 검색했을 때 캡처되는 폼
+STUB_FORM = {
+    "path": "/gis/mcm/mcl/selectAccidentInfo.do",
+    "json": False,
+    "fields": [["year", "2021"], ["sigungu", STUB.SIGUNGU_CODES["강남구"]],
+               ["grade", "01"], ["grade", "02"], ["grade", "03"], ["grade", "04"]],
+    "year_fields": ["year"],
+    "sigungu_fields": ["sigungu"],
+    "year_values": {year: year for year in STUB.CONST.TAAS_YEARS},
+    "sigungu_values": STUB.SIGUNGU_CODES,
+}
+
+
+@pytest.fixture
+def form_path(tmp_path):
+    path = tmp_path / "taas_search_form.json"
+    path.write_text(json.dumps(STUB_FORM, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def fetch(base_url, checkpoint_dir, form_path, **kwargs):
+    kwargs = {"workers": 4, "rate": 0, "max_retries": 3, "backoff": 0.01, "timeout": 10, **kwargs}
+    return FT.fetch_accident_df_http(YEARS, DISTRICTS, base_url=base_url, checkpoint_dir=str(checkpoint_dir),
+                                     form_path=form_path, **kwargs)
+
+
+def expected_rows():
+    return sum(len(STUB.make_accidents(year, sigungu, 200)) for year in YEARS for sigungu in DISTRICTS)
+
+
+def test_search_form_replaces_only_year_and_district():
+    fields = FT._search_form(STUB_FORM, "2022", "중구")
+    assert fields == [("year", "2022"), ("sigungu", STUB.SIGUNGU_CODES["중구"]),
+                      ("grade", "01"), ("grade", "02"), ("grade", "03"), ("grade", "04")]
+
+
+def test_fetch_retries_failed_requests(stub_server, tmp_path, form_path, capsys):
+    base_url = stub_server("taas_stub_server.py", "--fail-first", 2, ready_path=MAP_READY)
+    df = fetch(base_url, tmp_path / "checkpoints", form_path)
+
+    assert len(df) == expected_rows()
+    assert set(zip(df["year"], df["sigungu"])) == {(y, s) for y in YEARS for s in DISTRICTS}
+    assert df["lat"].between(37.0, 38.0).all() and df["lng"].between(126.5, 127.5).all()
+    # (연도, 자치구)마다 처음 두 번 실패 → 재시도 두 번 후 성공
+    assert capsys.readouterr().out.count("재시도") == 2 * len(YEARS) * len(DISTRICTS)
+    assert len(os.listdir(tmp_path / "checkpoints")) == len(YEARS) * len(DISTRICTS)
+
+
+def test_fetch_gives_up_after_max_retries(stub_server, tmp_path, form_path, capsys):
+    base_url = stub_server("taas_stub_server.py", "--fail-first", 100, ready_path=MAP_READY)
+    df = fetch(base_url, tmp_path / "checkpoints", form_path, max_retries=2)
+
+    assert df.empty
+    assert f"수집 실패 {len(YEARS) * len(DISTRICTS)}건" in capsys.readouterr().out
+    assert not os.path.exists(tmp_path / "checkpoints")
+
+
+def test_fetch_resumes_from_checkpoints(stub_server, tmp_path, form_path):
+    checkpoint_dir = tmp_path / "checkpoints"
+    first = fetch(stub_server("taas_stub_server.py", ready_path=MAP_READY), checkpoint_dir, form_path)
+
+    # 한 건만 체크포인트를 지우고, 모든 요청이 한 번씩 실패하는 서버로 다시 실행 → 그 한 건만 재시도해 수집
+    os.remove(FT._checkpoint_path(str(checkpoint_dir), "2022", "종로구"))
+    base_url = stub_server("taas_stub_server.py", "--fail-first", 1, ready_path=MAP_READY)
+    second = fetch(base_url, checkpoint_dir, form_path)
+    assert second.equals(first)
+
+
+def test_fetch_rejects_conditions_missing_from_form(tmp_path, form_path):
+    with pytest.raises(ValueError, match="세종시"):
+        FT.fetch_accident_df_http(["2021"], ["세종시"], checkpoint_dir=str(tmp_path), form_path=form_path)
+    with pytest.raises(FileNotFoundError):
+        FT.fetch_accident_df_http(["2021"], ["강남구"], form_path=str(tmp_path / "missing.json"))
+
+
+def test_capture_search_form_from_stub_page(chrome_driver, stub_server, tmp_path):
+    base_url = stub_server("taas_stub_server.py", ready_path=MAP_READY)
+    form = FT.capture_search_form("2021", "강남구", base_url=base_url, form_path=str(tmp_path / "form.json"))
+    assert form["fields"] == [tuple(field) for field in STUB_FORM["fields"]]
+    assert {k: form[k] for k in ("path", "json", "year_fields", "sigungu_fields", "sigungu_values")} == \
+        {k: STUB_FORM[k] for k in ("path", "json", "year_fields", "sigungu_fields", "sigungu_values")}
@@ -0,0 +1,100 @@
+# 경로 위험도 점수 API 서버 (로컬)
+# - 시작 시 도로망 + 사고 데이터로 구간별 위험도 표 / STRtree를 한 번 만들어 메모리에 유지
+# - POST /score        {"path": [[위도, 경도], ...], "sample_m": 20}
+# - POST /score/batch  {"routes": [{"path": [...]}, ...]}  (최대 MAX_BATCH개)
+# - GET  /health        (캐시 hit/miss/eviction 카운터 포함)
+#
+# 실행: python webapi/main.py --port 8000
+#       합성 데이터: python scripts/benchmarks/synthetic_data.py --out /tmp/seoul --rows 100000 --years 2023
+#                    python webapi/main.py --roads /tmp/seoul/data/shp/서울시_도로망.shp \
+#                                          --accidents /tmp/seoul/data/raw/all_accident_info_2023
+# 부하 테스트: python scripts/benchmarks/load_test_route_api.py --url http://127.0.0.1:8000
+import sys
+import os
+import json
+import time
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
+
+import utils.ROAD_RISK as RR
+
+MAX_BATCH = 1000
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+class ScoreHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더/본문을 나눠 보낼 때 Nagle + delayed ACK로 수십 ms씩 지연되지 않도록
+    disable_nagle_algorithm = True
+    index = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0 or length > MAX_BODY_BYTES:
+            raise ValueError(f"요청 본문 크기가 올바르지 않습니다 ({length} bytes)")
+        return json.loads(self.rfile.read(length))
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": "not found"})
+        table = self.index.table
+        self._send(200, {"status": "ok", "segments": len(self.index),
+                         "accidents_snapped": table["snapped"], "accidents_total": table["total"],
+                         "cache": self.index.cache_stats()})
+
+    def do_POST(self):
+        try:
+            request = self._read_json()
+            if not isinstance(request, dict):
+                raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+            options = {"sample_m": float(request.get("sample_m", RR.SAMPLE_M))}
+            if options["sample_m"] <= 0:
+                raise ValueError("sample_m은 0보다 커야 합니다.")
+            if self.path == "/score":
+                return self._send(200, self.index.score(request["path"], **options))
+            if self.path == "/score/batch":
+                routes = request["routes"]
+                if not isinstance(routes, list) or not 0 < len(routes) <= MAX_BATCH:
+                    raise ValueError(f"routes는 1~{MAX_BATCH}개 경로 목록이어야 합니다.")
+                for i, route in enumerate(routes):
+                    if not isinstance(route, dict):
+                        raise ValueError(f"routes[{i}]는 path를 가진 JSON 객체여야 합니다.")
+                results = self.index.score_many([route["path"] for route in routes], **options)
+                return self._send(200, {"results": results})
+            self._send(404, {"error": "not found"})
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="경로 위험도 점수 API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--roads", default=RR.ROAD_PATH)
+    parser.add_argument("--accidents", default=RR.ACCIDENT_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ScoreHandler.index = RR.RoadRiskIndex.build(args.roads, args.accidents)
+    index = ScoreHandler.index
+    print(f"==> 구간 위험도 표 생성 완료: 구간 {len(index)}개, 사고 {index.table['snapped']}/{index.table['total']}건 스냅 "
+          f"({time.perf_counter() - start:.2f}s)")
+
+    server = ThreadingHTTPServer((args.host, args.port), ScoreHandler)
+    print(f"==> 경로 위험도 API 실행 중: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()